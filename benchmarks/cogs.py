@@ -0,0 +1,450 @@
+"""
+Offline benchmarks for the cog handlers.
+
+Drives PilotAI, StatWrangler, RoleCopCog and GuildTracker through fake
+contexts/messages/guilds (benchmarks/fakes.py) with stand-in OpenAI and
+scraper backends, and reports throughput and p50/p99 latency per command.
+Files the cogs write (conversation state, stats cache, usernames, guild
+registry) go to a temp dir, so the disk cost is measured but the repo's
+storage is never touched.
+
+    python -m benchmarks.cogs                      # run + compare to baseline
+    python -m benchmarks.cogs -c 1,32 -n 500       # other concurrency/size
+    python -m benchmarks.cogs -k pilotai           # only matching cases
+    python -m benchmarks.cogs --save-baseline      # record a new baseline
+
+Exits non-zero when a case regresses past --tolerance. Baselines are
+machine-specific: record them on the box that runs the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import sys
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from benchmarks.fakes import (
+    FakeAutocompleteContext,
+    FakeBot,
+    FakeChannel,
+    FakeCompletions,
+    FakeContext,
+    FakeGuild,
+    FakeMember,
+    FakeMessage,
+    FakeSiegeScraper,
+    fake_openai_client,
+    make_guild,
+)
+from benchmarks.harness import (
+    BASELINE_DIR,
+    BenchResult,
+    compare,
+    format_results,
+    load_baseline,
+    run_case,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = BASELINE_DIR / "cogs.json"
+
+Call = Callable[[int], Awaitable[object]]
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    llm_first_token_ms: float = 20.0
+    llm_chunks: int = 20
+    scrape_ms: float = 50.0
+    guilds: int = 500
+    members: int = 1000
+    usernames: int = 5000
+    conversations: int = 500  # PilotAI conversations active before the run
+
+
+def _bench_guild(cfg: BenchConfig) -> tuple[FakeGuild, FakeChannel, FakeMember]:
+    guild, _roles = make_guild("Bench Guild", members=cfg.members)
+    admin = FakeMember("bench-admin", administrator=True)
+    guild.members.append(admin)
+    return guild, guild.text_channels[0], admin
+
+
+# ---------------- PilotAI ----------------
+def _conversations(n: int) -> tuple[dict[int, dict], dict[int, int]]:
+    """n live conversations of 4 turns each, as PilotAI keeps them."""
+    now = datetime.now(UTC)
+    convos: dict[int, dict] = {}
+    msg_to_root: dict[int, int] = {}
+    for i in range(n):
+        root = 10**17 + i
+        history = [{"role": "system", "content": "You are guildPilot."}]
+        for turn in range(4):
+            history.append({"role": "user", "content": f"question {turn} " * 10})
+            history.append({"role": "assistant", "content": f"answer {turn} " * 30})
+        convos[root] = {"history": history, "last_active": now, "channel_id": 1}
+        msg_to_root[root] = root
+    return convos, msg_to_root
+
+
+@contextlib.asynccontextmanager
+async def _pilotai(cfg: BenchConfig, tmp: Path) -> AsyncIterator[SimpleNamespace]:
+    from modules.pilotai import commands as pilot_commands, storage
+
+    state_path = tmp / "convos.json"
+    storage.save_state(*_conversations(cfg.conversations), state_path)
+    with (
+        mock.patch.object(
+            pilot_commands,
+            "load_state",
+            functools.partial(storage.load_state, state_path),
+        ),
+        mock.patch.object(
+            pilot_commands,
+            "ConversationJournal",
+            functools.partial(storage.ConversationJournal, state_path),
+        ),
+    ):
+        bot = FakeBot()
+        cog = pilot_commands.PilotAI(bot)
+        cog.client = fake_openai_client(
+            FakeCompletions(
+                first_token=cfg.llm_first_token_ms / 1000, chunks=cfg.llm_chunks
+            )
+        )
+        yield SimpleNamespace(cog=cog, bot=bot)
+
+
+@contextlib.asynccontextmanager
+async def bench_ask_the_pilot(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    from modules.pilotai.commands import PilotAI
+
+    async with _pilotai(cfg, tmp) as env:
+        guild, channel, admin = _bench_guild(cfg)
+        channel.author = env.bot.user
+
+        async def call(i: int) -> None:
+            ctx = FakeContext(guild, channel, admin)
+            await PilotAI.ask_the_pilot.callback(env.cog, ctx, f"question {i}")
+
+        yield call
+
+
+@contextlib.asynccontextmanager
+async def bench_reply_continue(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    from modules.pilotai.commands import PilotAI
+
+    async with _pilotai(cfg, tmp) as env:
+        guild, channel, admin = _bench_guild(cfg)
+        channel.author = env.bot.user
+
+        # One live conversation everyone keeps replying to
+        ctx = FakeContext(guild, channel, admin)
+        await PilotAI.ask_the_pilot.callback(env.cog, ctx, "opening question")
+        root = next(iter(env.cog.convos))
+        root_msg = FakeMessage(channel, "opening answer", author=env.bot.user)
+        root_msg.id = root
+
+        async def call(i: int) -> None:
+            ref = SimpleNamespace(resolved=root_msg, message_id=root)
+            msg = FakeMessage(channel, f"follow-up {i}", author=admin, reference=ref)
+            await env.cog.on_message(msg)
+
+        yield call
+
+
+# ---------------- StatWrangler ----------------
+@contextlib.asynccontextmanager
+async def _statwrangler(cfg: BenchConfig, tmp: Path) -> AsyncIterator[SimpleNamespace]:
+    from modules.statwrangler import commands as sw_commands
+    from modules.statwrangler.events import StatsCache, UsernameStore
+
+    scraper = FakeSiegeScraper(latency=cfg.scrape_ms / 1000)
+    with (
+        mock.patch.object(
+            sw_commands,
+            "StatsCache",
+            functools.partial(StatsCache, tmp / "stats_cache.sqlite3"),
+        ),
+        mock.patch.object(
+            sw_commands,
+            "UsernameStore",
+            functools.partial(UsernameStore, tmp / "usernames.json"),
+        ),
+        mock.patch.object(sw_commands, "get_r6siege_player_data", scraper),
+    ):
+        cog = sw_commands.StatWrangler(FakeBot())
+        try:
+            yield SimpleNamespace(cog=cog, scraper=scraper)
+        finally:
+            await cog.usernames.flush()
+            await cog.stats_cache.close()
+
+
+@contextlib.asynccontextmanager
+async def bench_game_stats_cached(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    from modules.statwrangler.commands import StatWrangler
+
+    async with _statwrangler(cfg, tmp) as env:
+        guild, channel, admin = _bench_guild(cfg)
+
+        async def call(i: int) -> None:
+            ctx = FakeContext(guild, channel, admin)
+            await StatWrangler.pull_stats.callback(
+                env.cog, ctx, "siege", "CachedPlayer", "pc"
+            )
+
+        await call(-1)  # fill the cache
+        yield call
+
+
+@contextlib.asynccontextmanager
+async def bench_game_stats_miss(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    from modules.statwrangler.commands import StatWrangler
+
+    async with _statwrangler(cfg, tmp) as env:
+        guild, channel, admin = _bench_guild(cfg)
+
+        async def call(i: int) -> None:
+            ctx = FakeContext(guild, channel, admin)
+            await StatWrangler.pull_stats.callback(
+                env.cog, ctx, "siege", f"Player{i}", "pc"
+            )
+
+        yield call
+
+
+@contextlib.asynccontextmanager
+async def bench_autocomplete(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    from modules.statwrangler.events import UsernameIndex
+
+    async with _statwrangler(cfg, tmp) as env:
+        names = [f"player_{i:05d}" for i in range(cfg.usernames)]
+        env.cog.username_index = UsernameIndex.from_usernames({"siege": names})
+        queries = ["p", "player_0", "player_012", "_04", "99", "zzz"]
+
+        async def call(i: int) -> None:
+            ctx = FakeAutocompleteContext(queries[i % len(queries)], {"game": "siege"})
+            await env.cog.username_autocomplete(ctx)
+
+        yield call
+
+
+# ---------------- RoleCop ----------------
+@contextlib.asynccontextmanager
+async def _rolecop(cfg: BenchConfig) -> AsyncIterator[SimpleNamespace]:
+    from modules.rolecop.cog import RoleCopCog
+
+    guild, roles = make_guild("Bench Guild", members=cfg.members)
+    admin = FakeMember("bench-admin", administrator=True)
+    guild.members.append(admin)
+    yield SimpleNamespace(
+        cog=RoleCopCog(FakeBot(guilds=[guild])),
+        guild=guild,
+        roles=roles,
+        admin=admin,
+    )
+
+
+@contextlib.asynccontextmanager
+async def bench_who_has_role(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    from modules.rolecop.cog import RoleCopCog
+
+    async with _rolecop(cfg) as env:
+        channel = env.guild.text_channels[0]
+
+        async def call(i: int) -> None:
+            ctx = FakeContext(env.guild, channel, env.admin)
+            await RoleCopCog.who_has_role.callback(env.cog, ctx, env.roles["Moderator"])
+
+        yield call
+
+
+@contextlib.asynccontextmanager
+async def bench_user_roles(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    from modules.rolecop.cog import RoleCopCog
+
+    async with _rolecop(cfg) as env:
+        channel = env.guild.text_channels[0]
+        members = env.guild.members
+
+        async def call(i: int) -> None:
+            ctx = FakeContext(env.guild, channel, env.admin)
+            await RoleCopCog.user_roles.callback(
+                env.cog, ctx, members[i % len(members)]
+            )
+
+        yield call
+
+
+# ---------------- GuildTracker ----------------
+@contextlib.asynccontextmanager
+async def _tracker(cfg: BenchConfig, tmp: Path) -> AsyncIterator[SimpleNamespace]:
+    from modules.core.guilds.guilds_tracker import GuildTracker
+    from modules.core.guilds.store import GuildStore
+
+    bot = FakeBot(guilds=[FakeGuild(f"guild {i}") for i in range(cfg.guilds)])
+    bot.guild_registry_path = tmp / "guilds.json"
+    bot.guild_store = GuildStore(tmp / "guilds.sqlite3")
+    try:
+        cog = GuildTracker(bot)
+        yield SimpleNamespace(cog=cog, lifecycle=cog.lifecycle, bot=bot)
+    finally:
+        bot.guild_store.close()
+
+
+@contextlib.asynccontextmanager
+async def bench_reconcile(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    async with _tracker(cfg, tmp) as env:
+        await env.lifecycle.on_ready()
+
+        async def call(i: int) -> None:
+            # What the 5-minute reconcile loop does each pass
+            await env.lifecycle.reconcile()
+
+        yield call
+
+
+@contextlib.asynccontextmanager
+async def bench_guild_join(cfg: BenchConfig, tmp: Path) -> AsyncIterator[Call]:
+    async with _tracker(cfg, tmp) as env:
+        await env.lifecycle.on_ready()
+
+        async def call(i: int) -> None:
+            guild = FakeGuild(f"new guild {i}")
+            env.bot.guilds.append(guild)
+            # One registry update, then every subscriber (GuildTracker here)
+            await env.lifecycle.on_guild_join(guild)
+
+        yield call
+
+
+CASES: dict[
+    str, Callable[[BenchConfig, Path], contextlib.AbstractAsyncContextManager[Call]]
+] = {
+    "pilotai.ask_the_pilot": bench_ask_the_pilot,
+    "pilotai.reply_continue": bench_reply_continue,
+    "statwrangler.game_stats.cached": bench_game_stats_cached,
+    "statwrangler.game_stats.miss": bench_game_stats_miss,
+    "statwrangler.autocomplete": bench_autocomplete,
+    "rolecop.who_has_role": bench_who_has_role,
+    "rolecop.user_roles": bench_user_roles,
+    "guilds.reconcile": bench_reconcile,
+    "guilds.on_guild_join": bench_guild_join,
+}
+
+
+async def run_benchmarks(
+    *,
+    cases: list[str],
+    concurrency: list[int],
+    iterations: int,
+    config: BenchConfig | None = None,
+) -> list[BenchResult]:
+    """Each (case, concurrency) pair runs against a fresh cog and temp dir."""
+    config = config or BenchConfig()
+    results: list[BenchResult] = []
+    for name in cases:
+        for c in concurrency:
+            with tempfile.TemporaryDirectory(prefix="guildpilot-bench-") as tmp:
+                async with CASES[name](config, Path(tmp)) as call:
+                    results.append(
+                        await run_case(name, call, iterations=iterations, concurrency=c)
+                    )
+    return results
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="python -m benchmarks.cogs", description="Offline cog benchmarks."
+    )
+    p.add_argument(
+        "-c",
+        "--concurrency",
+        default="1,16",
+        help="Comma-separated in-flight call limits (default: 1,16).",
+    )
+    p.add_argument("-n", "--iterations", type=int, default=200, help="Calls per case.")
+    p.add_argument(
+        "-k", "--case", default="", help="Only run cases containing this text."
+    )
+    p.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    p.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the new baseline instead of comparing.",
+    )
+    p.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed p99/throughput drift before a case fails (default: 0.25).",
+    )
+    p.add_argument("--llm-ms", type=float, default=BenchConfig.llm_first_token_ms)
+    p.add_argument("--scrape-ms", type=float, default=BenchConfig.scrape_ms)
+    p.add_argument("--guilds", type=int, default=BenchConfig.guilds)
+    p.add_argument("--members", type=int, default=BenchConfig.members)
+    p.add_argument(
+        "--conversations",
+        type=int,
+        default=BenchConfig.conversations,
+        help="PilotAI conversations active before each PilotAI case.",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    cases = [name for name in CASES if args.case in name]
+    if not cases:
+        print(f"No cases match {args.case!r}. Available: {', '.join(CASES)}")
+        return 2
+
+    config = BenchConfig(
+        llm_first_token_ms=args.llm_ms,
+        scrape_ms=args.scrape_ms,
+        guilds=args.guilds,
+        members=args.members,
+        conversations=args.conversations,
+    )
+    concurrency = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    results = asyncio.run(
+        run_benchmarks(
+            cases=cases,
+            concurrency=concurrency,
+            iterations=args.iterations,
+            config=config,
+        )
+    )
+    print(format_results(results))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline saved -> {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline.")
+        return 0
+
+    regressions = compare(results, baseline, tolerance=args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\nNo regressions against {args.baseline} (±{args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
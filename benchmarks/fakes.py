@@ -0,0 +1,296 @@
+"""
+Lightweight stand-ins for the Discord objects and external backends the cogs
+touch, so handlers can be driven offline at high rates.
+
+These are plain classes rather than MagicMocks: mock attribute lookups cost
+more than most handlers do, and would dominate every measurement.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import discord
+
+from modules.core.guilds.store import GuildStore
+
+_ids = itertools.count(1_000_000_000_000_000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+@dataclass(eq=False)
+class FakeRole:
+    name: str
+    position: int = 1
+    id: int = field(default_factory=next_id)
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+
+class FakeMember(discord.Member):
+    """
+    Passes isinstance(x, discord.Member) (RoleCop checks it) without a
+    connection state. Class attributes shadow discord.Member's properties.
+    """
+
+    id = 0
+    name = ""
+    display_name = ""
+    bot = False
+    roles: list[FakeRole] = []
+    guild_permissions = discord.Permissions.none()
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        roles: list[FakeRole] | None = None,
+        administrator: bool = False,
+        bot: bool = False,
+    ) -> None:
+        self.id = next_id()
+        self.name = self.display_name = name
+        self.bot = bot
+        self.roles = list(roles or [])
+        self.guild_permissions = discord.Permissions(administrator=administrator)
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f"<FakeMember {self.name}>"
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        channel: FakeChannel,
+        content: str = "",
+        *,
+        author: FakeMember | None = None,
+        reference: Any = None,
+    ) -> None:
+        self.id = next_id()
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.author = author
+        self.reference = reference
+        self.embeds: list[discord.Embed] = []
+
+    async def edit(self, *, content: str | None = None, **kwargs: Any) -> FakeMessage:
+        if content is not None:
+            self.content = content
+        return self
+
+    async def reply(self, content: str = "", **kwargs: Any) -> FakeMessage:
+        return await self.channel.send(content, **kwargs)
+
+
+class FakeChannel:
+    def __init__(self, guild: FakeGuild | None, name: str = "general") -> None:
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.author: FakeMember | None = None  # who send() posts as
+        self.sent = 0
+
+    async def send(self, content: str = "", **kwargs: Any) -> FakeMessage:
+        self.sent += 1
+        return FakeMessage(self, content, author=self.author)
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        raise discord.NotFound(SimpleNamespace(status=404, reason="x"), "unknown")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeGuild:
+    def __init__(self, name: str, *, members: list[FakeMember] | None = None) -> None:
+        self.id = next_id()
+        self.name = name
+        self.members = list(members or [])
+        self.chunked = True
+        self.text_channels = [FakeChannel(self)]
+
+    async def chunk(self, *, cache: bool = True) -> list[FakeMember]:
+        self.chunked = True
+        return self.members
+
+    def get_member(self, member_id: int) -> FakeMember | None:
+        return next((m for m in self.members if m.id == member_id), None)
+
+
+class FakeResponse:
+    def __init__(self) -> None:
+        self.done = False
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def defer(self, **kwargs: Any) -> None:
+        self.done = True
+
+    async def send_message(self, *args: Any, **kwargs: Any) -> None:
+        self.done = True
+
+
+class FakeContext:
+    """The parts of discord.ApplicationContext the cogs use."""
+
+    def __init__(
+        self, guild: FakeGuild | None, channel: FakeChannel, author: FakeMember
+    ) -> None:
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.user = author
+        self.response = FakeResponse()
+        self.responses = 0
+
+    async def defer(self, **kwargs: Any) -> None:
+        await self.response.defer()
+
+    async def respond(self, *args: Any, **kwargs: Any) -> None:
+        self.responses += 1
+        self.response.done = True
+
+
+class FakeAutocompleteContext:
+    def __init__(self, value: str, options: dict[str, Any]) -> None:
+        self.value = value
+        self.options = options
+
+
+class FakeBot:
+    """The bot surface the cogs read: user, guilds, intents, readiness."""
+
+    def __init__(self, *, guilds: list[FakeGuild] | None = None) -> None:
+        self.user = FakeMember("GuildPilot", bot=True)
+        self.guilds = list(guilds or [])
+        self.intents = discord.Intents.default()
+        self.cache_policy = None
+        self.flavor = "bench"
+        # Guild registry for GuildLifecycle subscribers; never touches disk
+        self.guild_store = GuildStore(Path(":memory:"))
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def wait_until_ready(self) -> None:
+        return None
+
+    def get_guild(self, guild_id: int) -> FakeGuild | None:
+        return next((g for g in self.guilds if g.id == guild_id), None)
+
+    def add_view(self, view: Any, *, message_id: int | None = None) -> None:
+        pass
+
+
+class FakeCompletions:
+    """
+    Stand-in for AsyncOpenAI().chat.completions: a fixed time-to-first-token,
+    then `chunks` deltas `chunk_delay` apart (or one full message).
+    """
+
+    def __init__(
+        self,
+        *,
+        first_token: float = 0.02,
+        chunks: int = 20,
+        chunk_delay: float = 0.001,
+        text: str = "Cleared for takeoff. ",
+    ) -> None:
+        self.first_token = first_token
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.text = text
+        self.calls = 0
+
+    async def create(self, *, stream: bool = False, **kwargs: Any) -> Any:
+        self.calls += 1
+        await asyncio.sleep(self.first_token)
+        usage = SimpleNamespace(prompt_tokens=40, completion_tokens=self.chunks)
+        if stream:
+            return self._stream(usage)
+        await asyncio.sleep(self.chunk_delay * self.chunks)
+        message = SimpleNamespace(content=self.text * self.chunks)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    async def _stream(self, usage: Any) -> AsyncIterator[Any]:
+        for _ in range(self.chunks):
+            await asyncio.sleep(self.chunk_delay)
+            delta = SimpleNamespace(content=self.text)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+def fake_openai_client(completions: FakeCompletions) -> Any:
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=completions), close=_async_noop
+    )
+
+
+async def _async_noop() -> None:
+    return None
+
+
+class FakeSiegeScraper:
+    """
+    Stand-in for get_r6siege_player_data(username, platform). Keeps the
+    two-argument signature: StatWrangler dispatches on parameter count.
+    """
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    async def __call__(self, username, platform):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return (
+            "1.12",
+            "212",
+            "Emerald II",
+            "1.05",
+            "https://example.com/avatar.png",
+            "https://example.com/rank.png",
+        )
+
+
+def make_guild(
+    name: str,
+    *,
+    members: int = 100,
+    role_names: tuple[str, ...] = ("Member", "Moderator", "Admin"),
+) -> tuple[FakeGuild, dict[str, FakeRole]]:
+    """Guild with `members` members; every 10th is a Moderator."""
+    roles = {n: FakeRole(n, position=i + 1) for i, n in enumerate(role_names)}
+    everyone = FakeRole("@everyone", position=0)
+    people = []
+    for i in range(members):
+        held = [everyone, roles["Member"]]
+        if i % 10 == 0:
+            held.append(roles["Moderator"])
+        people.append(FakeMember(f"user{i}", roles=held))
+    return FakeGuild(name, members=people), roles
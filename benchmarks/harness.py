@@ -0,0 +1,150 @@
+"""
+Timing and baseline bookkeeping shared by the benchmark suites.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from modules.core.diagnostics.loop_monitor import percentile
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+@dataclass
+class BenchResult:
+    name: str
+    concurrency: int
+    iterations: int
+    seconds: float
+    throughput: float  # calls/s
+    p50_ms: float
+    p99_ms: float
+    errors: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@c{self.concurrency}"
+
+
+async def run_case(
+    name: str,
+    call: Callable[[int], Awaitable[object]],
+    *,
+    iterations: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> BenchResult:
+    """
+    Await call(i) `iterations` times with at most `concurrency` in flight,
+    timing each call. Exceptions are counted, not raised, so one bad call
+    doesn't hide the rest of the run.
+    """
+    for i in range(warmup):
+        await call(-1 - i)
+
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    seconds = time.perf_counter() - t0
+
+    latencies.sort()
+    return BenchResult(
+        name=name,
+        concurrency=concurrency,
+        iterations=iterations,
+        seconds=round(seconds, 4),
+        throughput=round(iterations / seconds, 1) if seconds else 0.0,
+        p50_ms=round(percentile(latencies, 50) * 1000, 3),
+        p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        errors=errors,
+    )
+
+
+def format_results(results: list[BenchResult]) -> str:
+    width = max([len(r.key) for r in results] + [4])
+    lines = [
+        f"{'case':<{width}}  {'calls/s':>10}  {'p50 ms':>9}  {'p99 ms':>9}  errors",
+    ]
+    for r in results:
+        lines.append(
+            f"{r.key:<{width}}  {r.throughput:>10.1f}  {r.p50_ms:>9.2f}  "
+            f"{r.p99_ms:>9.2f}  {r.errors}"
+        )
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    cases = data.get("cases") if isinstance(data, dict) else None
+    return cases if isinstance(cases, dict) else {}
+
+
+def save_baseline(path: Path, results: list[BenchResult]) -> None:
+    """Merge results into the baseline file (other cases are kept)."""
+    cases = load_baseline(path)
+    for r in results:
+        cases[r.key] = asdict(r)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"cases": dict(sorted(cases.items()))}
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def compare(
+    results: list[BenchResult],
+    baseline: dict[str, dict],
+    *,
+    tolerance: float,
+    min_delta_ms: float = 0.5,
+) -> list[str]:
+    """
+    One line per regression: p99 latency up, or throughput down, by more
+    than `tolerance` (0.25 = 25%) against the stored baseline. New errors
+    always count. Cases without a baseline are skipped.
+
+    p99 moves smaller than min_delta_ms are ignored: sub-millisecond cases
+    jitter by more than 25% from run to run.
+    """
+    regressions: list[str] = []
+    for r in results:
+        base = baseline.get(r.key)
+        if not base:
+            continue
+        if r.errors > base.get("errors", 0):
+            regressions.append(f"{r.key}: {r.errors} error(s)")
+        if (
+            r.p99_ms > base["p99_ms"] * (1 + tolerance)
+            and r.p99_ms - base["p99_ms"] > min_delta_ms
+        ):
+            regressions.append(
+                f"{r.key}: p99 {r.p99_ms:.2f}ms vs baseline {base['p99_ms']:.2f}ms"
+            )
+        if base["throughput"] and r.throughput < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{r.key}: {r.throughput:.1f} calls/s vs baseline "
+                f"{base['throughput']:.1f}"
+            )
+    return regressions
@@ -0,0 +1,155 @@
+"""
+asyncio vs uvloop on the offline workloads.
+
+Runs the cog benchmarks (benchmarks/cogs.py) once per event loop, each on a
+fresh loop built the same way main.py builds it (--loop), and reports the
+throughput and p99 difference per case. With --replay, a gateway recording
+is also replayed at max speed under each loop (benchmarks/replay.py).
+
+    python -m benchmarks.loops                     # all cases, c=1,16
+    python -m benchmarks.loops -k statwrangler -r 3
+    python -m benchmarks.loops --replay recordings/synthetic.jsonl.gz
+
+Positive Δ calls/s and negative Δ p99 favour uvloop. Rounds alternate
+which loop goes first, and the best round per case is kept, so import and
+cache warm-up don't land on one side only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.cogs import CASES, BenchConfig, run_benchmarks
+from benchmarks.harness import BenchResult
+from modules.bot import loops
+
+LOOPS = ("asyncio", "uvloop")
+
+
+def _best(a: BenchResult | None, b: BenchResult) -> BenchResult:
+    return b if a is None or b.throughput > a.throughput else a
+
+
+def run_under_loops(
+    *,
+    cases: list[str],
+    concurrency: list[int],
+    iterations: int,
+    config: BenchConfig | None = None,
+    loop_names: tuple[str, ...] = LOOPS,
+    rounds: int = 1,
+) -> dict[str, dict[str, BenchResult]]:
+    """{loop name: {case key: best result over `rounds`}}."""
+    best: dict[str, dict[str, BenchResult]] = {name: {} for name in loop_names}
+    for r in range(rounds):
+        order = loop_names if r % 2 == 0 else tuple(reversed(loop_names))
+        for name in order:
+            results = loops.run(
+                run_benchmarks(
+                    cases=cases,
+                    concurrency=concurrency,
+                    iterations=iterations,
+                    config=config,
+                ),
+                loop=name,
+            )
+            for res in results:
+                best[name][res.key] = _best(best[name].get(res.key), res)
+    return best
+
+
+def _delta(new: float, old: float) -> str:
+    return f"{(new / old - 1):+.1%}" if old else "n/a"
+
+
+def format_comparison(
+    base: dict[str, BenchResult],
+    other: dict[str, BenchResult],
+    *,
+    names: tuple[str, str] = LOOPS,
+) -> str:
+    keys = [k for k in base if k in other]
+    width = max([len(k) for k in keys] + [4])
+    a, b = names
+    lines = [
+        f"{'case':<{width}}  {a + ' /s':>12}  {b + ' /s':>12}  {'Δ /s':>8}  "
+        f"{a + ' p99':>12}  {b + ' p99':>12}  {'Δ p99':>8}"
+    ]
+    for k in keys:
+        x, y = base[k], other[k]
+        lines.append(
+            f"{k:<{width}}  {x.throughput:>12.1f}  {y.throughput:>12.1f}  "
+            f"{_delta(y.throughput, x.throughput):>8}  {x.p99_ms:>12.2f}  "
+            f"{y.p99_ms:>12.2f}  {_delta(y.p99_ms, x.p99_ms):>8}"
+        )
+    return "\n".join(lines)
+
+
+def replay_under_loops(
+    recording: Path, *, loop_names: tuple[str, ...] = LOOPS
+) -> dict[str, BenchResult]:
+    """
+    Replay `recording` at max speed under each loop. Reported as a
+    BenchResult: events/s, and the slowest listener's p50/p99.
+    """
+    from benchmarks.replay import replay_file
+
+    out: dict[str, BenchResult] = {}
+    for name in loop_names:
+        report = loops.run(replay_file(recording, speed=None), loop=name)
+        listeners = report.listeners or []
+        out[name] = BenchResult(
+            name="replay",
+            concurrency=0,
+            iterations=report.events,
+            seconds=report.seconds,
+            throughput=report.throughput,
+            p50_ms=max((s.p50_ms for s in listeners), default=0.0),
+            p99_ms=max((s.p99_ms for s in listeners), default=0.0),
+            errors=sum(s.errors for s in listeners),
+        )
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="python -m benchmarks.loops",
+        description="Compare asyncio and uvloop on the offline benchmarks.",
+    )
+    p.add_argument("-c", "--concurrency", default="1,16")
+    p.add_argument("-n", "--iterations", type=int, default=200, help="Calls per case.")
+    p.add_argument("-k", "--case", default="", help="Only cases containing this.")
+    p.add_argument("-r", "--rounds", type=int, default=1, help="Keep the best of N.")
+    p.add_argument("--llm-ms", type=float, default=BenchConfig.llm_first_token_ms)
+    p.add_argument("--scrape-ms", type=float, default=BenchConfig.scrape_ms)
+    p.add_argument("--replay", type=Path, help="Also replay this recording.")
+    args = p.parse_args(argv)
+
+    if loops.loop_factory("uvloop")[0] != "uvloop":
+        print("uvloop is not installed (pip install uvloop); nothing to compare.")
+        return 2
+    cases = [name for name in CASES if args.case in name]
+    if not cases:
+        print(f"No cases match {args.case!r}. Available: {', '.join(CASES)}")
+        return 2
+
+    config = BenchConfig(llm_first_token_ms=args.llm_ms, scrape_ms=args.scrape_ms)
+    best = run_under_loops(
+        cases=cases,
+        concurrency=[int(x) for x in args.concurrency.split(",") if x.strip()],
+        iterations=args.iterations,
+        config=config,
+        rounds=max(1, args.rounds),
+    )
+    if args.replay:
+        for name, result in replay_under_loops(args.replay).items():
+            best[name][result.key] = result
+
+    print(format_comparison(best["asyncio"], best["uvloop"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Offline stand-in for Discord's REST API.
+
+py-cord sends bot REST calls through bot.http.request() and interaction
+responses/followups through the webhook adapter held in a ContextVar.
+StubNetwork replaces both with canned, optionally delayed, responses so a
+bot built by build_bot can process replayed events without a connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Any
+
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+
+_ids = itertools.count(1_300_000_000_000_000_000)
+
+
+class _StubWebhookAdapter(AsyncWebhookAdapter):
+    def __init__(self, network: StubNetwork) -> None:
+        super().__init__()
+        self._network = network
+
+    async def request(self, route, session, *, payload=None, **kwargs: Any) -> Any:
+        return await self._network.respond(route, payload)
+
+
+class StubNetwork:
+    """
+    Answers every REST call locally. Message-creating/editing routes return
+    a minimal message payload authored by the bot; everything else returns
+    None. latency (seconds) is added to each call to model Discord's RTT.
+    """
+
+    def __init__(self, *, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+        self.bot_user: dict = {
+            "id": "1",
+            "username": "GuildPilot",
+            "discriminator": "0",
+            "avatar": None,
+            "bot": True,
+        }
+        self._token = None
+
+    def install(self, bot) -> None:
+        """Stub bot.http and the interaction webhook adapter (current context)."""
+
+        async def http_request(route, *, files=None, form=None, **kwargs: Any) -> Any:
+            return await self.respond(route, kwargs.get("json"))
+
+        bot.http.request = http_request
+        self._token = async_context.set(_StubWebhookAdapter(self))
+
+    def uninstall(self) -> None:
+        if self._token is not None:
+            async_context.reset(self._token)
+            self._token = None
+
+    async def respond(self, route, payload: dict | None) -> Any:
+        self.calls[f"{route.method} {route.path}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        path = route.path
+        if route.method in ("POST", "PATCH") and (
+            path.endswith("/messages")
+            or "/messages/" in path
+            or path == "/webhooks/{webhook_id}/{webhook_token}"
+        ):
+            return self._message(route, payload or {})
+        return None
+
+    def _message(self, route, payload: dict) -> dict:
+        channel_id = route.channel_id or 0
+        return {
+            "id": str(next(_ids)),
+            "channel_id": str(channel_id),
+            "author": self.bot_user,
+            "content": payload.get("content") or "",
+            "timestamp": datetime.now(UTC).isoformat(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": payload.get("embeds") or [],
+            "pinned": False,
+            "type": 0,
+            "flags": 0,
+            "components": [],
+        }
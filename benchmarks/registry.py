@@ -0,0 +1,207 @@
+"""
+Guild registry loading at 10k/100k entries.
+
+Writes synthetic registry files (every shape extract_guild_ids reads, in
+the indented layout the tracker used to write) and times each way of
+getting the ids out of one:
+
+- json.loads       the old path: read_text + json.loads + extract_guild_ids
+- stream           iter_guild_ids_from_json, ids consumed and dropped
+- sorted list      load_guild_ids_from_json (streamed into a sorted set)
+- GuildIdArray     load_guild_id_array (streamed into a sorted array('q'))
+
+Reports the best time over --rounds, peak traced memory while loading,
+what the result keeps alive, and the cost of a membership check against
+it (as sync planning does).
+
+    python -m benchmarks.registry                  # 10k and 100k, servers shape
+    python -m benchmarks.registry -n 100000 --shape all -r 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from utils.guild_sync import (
+    GuildIdArray,
+    extract_guild_ids,
+    iter_guild_ids_from_json,
+    load_guild_id_array,
+    load_guild_ids_from_json,
+)
+
+SHAPES = ("servers", "guilds", "list", "keyed")
+_LOOKUPS = 10_000
+_NOW = "2026-01-01T00:00:00+00:00"
+
+
+def _snowflakes(n: int, seed: int = 0) -> list[int]:
+    rng = random.Random(seed)
+    return rng.sample(range(10**17, 10**18), n)
+
+
+def write_registry(path: Path, ids: list[int], shape: str = "servers") -> Path:
+    def rec(gid: int) -> dict:
+        return {
+            "id": gid,
+            "name": f"Guild {gid % 100_000}",
+            "joined_at_utc": _NOW,
+            "last_seen_utc": _NOW,
+        }
+
+    if shape in ("servers", "guilds"):
+        data: object = {shape: [rec(gid) for gid in ids]}
+    elif shape == "list":
+        data = [rec(gid) for gid in ids]
+    elif shape == "keyed":
+        data = {str(gid): rec(gid) for gid in ids}
+    else:
+        raise ValueError(f"unknown shape {shape!r}; expected one of {SHAPES}")
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+def _legacy(path: Path) -> list[int]:
+    return extract_guild_ids(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _stream(path: Path) -> int:
+    return sum(1 for _ in iter_guild_ids_from_json(path))
+
+
+METHODS: dict[str, Callable[[Path], object]] = {
+    "json.loads": _legacy,
+    "stream": _stream,
+    "sorted list": load_guild_ids_from_json,
+    "GuildIdArray": load_guild_id_array,
+}
+
+
+def _kept_bytes(result: object) -> int:
+    if isinstance(result, GuildIdArray):
+        return sys.getsizeof(result.ids)
+    if isinstance(result, list):
+        return sys.getsizeof(result) + sum(sys.getsizeof(x) for x in result)
+    return 0
+
+
+def _lookup_ns(result: object, probes: list[int]) -> float | None:
+    if isinstance(result, list):
+        result = set(result)  # what a caller would build to check membership
+    elif not isinstance(result, GuildIdArray):
+        return None
+    t0 = time.perf_counter()
+    for gid in probes:
+        _ = gid in result
+    return (time.perf_counter() - t0) / len(probes) * 1e9
+
+
+@dataclass
+class LoadResult:
+    entries: int
+    shape: str
+    method: str
+    file_mb: float
+    ms: float
+    peak_mb: float
+    kept_kb: float
+    lookup_ns: float | None
+
+
+def bench_load(
+    path: Path, method: str, *, entries: int, shape: str, rounds: int = 3
+) -> LoadResult:
+    load = METHODS[method]
+    best = float("inf")
+    result: object = None
+    for _ in range(max(1, rounds)):
+        t0 = time.perf_counter()
+        result = load(path)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        load(path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ids = list(result) if isinstance(result, (list, GuildIdArray)) else []
+    rng = random.Random(1)
+    probes = [rng.choice(ids) for _ in range(_LOOKUPS // 2)] if ids else []
+    probes += _snowflakes(_LOOKUPS - len(probes), seed=2)
+    return LoadResult(
+        entries=entries,
+        shape=shape,
+        method=method,
+        file_mb=round(path.stat().st_size / 1e6, 1),
+        ms=round(best * 1000, 1),
+        peak_mb=round(peak / 1e6, 2),
+        kept_kb=round(_kept_bytes(result) / 1e3, 1),
+        lookup_ns=None if not ids else round(_lookup_ns(result, probes), 1),
+    )
+
+
+def run(*, sizes: list[int], shapes: list[str], rounds: int = 3) -> list[LoadResult]:
+    results: list[LoadResult] = []
+    with tempfile.TemporaryDirectory(prefix="registry-bench-") as d:
+        root = Path(d)
+        for n in sizes:
+            ids = _snowflakes(n)
+            for shape in shapes:
+                path = write_registry(root / f"{shape}-{n}.json", ids, shape)
+                for method in METHODS:
+                    results.append(
+                        bench_load(path, method, entries=n, shape=shape, rounds=rounds)
+                    )
+    return results
+
+
+def format_load_results(results: list[LoadResult]) -> str:
+    lines = [
+        f"{'entries':>8}  {'shape':<8}  {'method':<13}  {'file MB':>7}  "
+        f"{'ms':>8}  {'peak MB':>8}  {'kept KB':>8}  {'in ns':>6}"
+    ]
+    for r in results:
+        lookup = "-" if r.lookup_ns is None else f"{r.lookup_ns:.0f}"
+        lines.append(
+            f"{r.entries:>8}  {r.shape:<8}  {r.method:<13}  {r.file_mb:>7.1f}  "
+            f"{r.ms:>8.1f}  {r.peak_mb:>8.2f}  {r.kept_kb:>8.1f}  {lookup:>6}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="python -m benchmarks.registry",
+        description="Time and memory of loading large guild registry files.",
+    )
+    p.add_argument("-n", "--entries", default="10000,100000")
+    p.add_argument("--shape", default="servers", help=f"{', '.join(SHAPES)} or all")
+    p.add_argument("-r", "--rounds", type=int, default=3, help="Keep the best of N.")
+    args = p.parse_args(argv)
+
+    shapes = list(SHAPES) if args.shape == "all" else [args.shape]
+    if not set(shapes) <= set(SHAPES):
+        print(f"Unknown shape {args.shape!r}. Available: {', '.join(SHAPES)}, all")
+        return 2
+    results = run(
+        sizes=[int(x) for x in args.entries.split(",") if x.strip()],
+        shapes=shapes,
+        rounds=args.rounds,
+    )
+    print(format_load_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
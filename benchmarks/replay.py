@@ -0,0 +1,385 @@
+"""
+Replay a gateway recording into a bot built by build_bot.
+
+Recordings come from a live bot run with GATEWAY_RECORD=path (see
+modules/bot/recorder.py) or from --synthesize. Events are fed straight into
+the connection state's parsers (what the gateway does after decoding), at
+the recorded pace, N times faster, or as fast as the bot keeps up; REST
+calls are answered locally (benchmarks/netstub.py), and OpenAI, the Siege
+scraper and every file the cogs write are redirected to stand-ins / a temp
+dir.
+
+    python -m benchmarks.replay --synthesize /tmp/traffic.jsonl.gz
+    python -m benchmarks.replay /tmp/traffic.jsonl.gz --speed max
+    python -m benchmarks.replay recordings/public.jsonl.gz --speed 10 --http-ms 40
+
+Reports event throughput, parse cost per event type, and per-listener
+calls / p50 / p99 / errors (e.g. PilotAI.on_message, GuildLifecycle.on_guild_join).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest import mock
+
+import discord
+
+from benchmarks.fakes import FakeCompletions, FakeSiegeScraper, fake_openai_client
+from benchmarks.netstub import StubNetwork
+from modules.bot.recorder import RecordedEvent, iter_recording
+from modules.core.diagnostics.loop_monitor import percentile
+
+
+@dataclass
+class ListenerStats:
+    name: str
+    calls: int
+    errors: int
+    total_ms: float
+    p50_ms: float
+    p99_ms: float
+    first_error: str | None = None
+
+
+@dataclass
+class ReplayReport:
+    speed: str
+    events: int
+    seconds: float
+    throughput: float  # events/s, feed start until every listener finished
+    max_behind_ms: float  # worst slip behind the recorded schedule
+    parse: dict[str, tuple[int, float]] = field(default_factory=dict)
+    listeners: list[ListenerStats] = field(default_factory=list)
+    rest_calls: dict[str, int] = field(default_factory=dict)
+
+
+class _ListenerTimer:
+    """Replaces bot._run_event: times each listener call, counts failures."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.first_error: dict[str, str] = {}
+
+    def install(self, bot: discord.Bot) -> None:
+        async def run_event(coro, event_name: str, *args, **kwargs) -> None:
+            name = getattr(coro, "__qualname__", event_name)
+            t0 = time.perf_counter()
+            try:
+                await coro(*args, **kwargs)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self.errors[name] += 1
+                self.first_error.setdefault(name, f"{type(e).__name__}: {e}")
+            finally:
+                self.latencies[name].append(time.perf_counter() - t0)
+
+        bot._run_event = run_event
+
+    def stats(self) -> list[ListenerStats]:
+        out = []
+        for name, values in self.latencies.items():
+            values.sort()
+            out.append(
+                ListenerStats(
+                    name=name,
+                    calls=len(values),
+                    errors=self.errors[name],
+                    total_ms=round(sum(values) * 1000, 2),
+                    p50_ms=round(percentile(values, 50) * 1000, 3),
+                    p99_ms=round(percentile(values, 99) * 1000, 3),
+                    first_error=self.first_error.get(name),
+                )
+            )
+        return sorted(out, key=lambda s: -s.total_ms)
+
+
+def sandbox_bot(
+    bot: discord.Bot,
+    tmp: Path,
+    *,
+    llm_ms: float = 20.0,
+    scrape_ms: float = 50.0,
+) -> contextlib.ExitStack:
+    """
+    Point every cog's external dependency at a stand-in and every file it
+    writes into tmp. Returns an ExitStack undoing the module-level patches.
+    """
+    from modules.core.guilds.registry import GuildRegistry
+    from modules.core.guilds.store import GuildStore
+    from modules.pilotai import storage as pilot_storage
+    from modules.statwrangler.events import StatsCache, UsernameIndex, UsernameStore
+
+    stack = contextlib.ExitStack()
+    bot.auto_sync_commands = False
+    bot._connection._chunk_guilds = False
+
+    for cog in list(bot.cogs.values()):
+        # load_extension re-executes each extension module, so match on the
+        # class name and patch the module the cog actually came from
+        kind = type(cog).__name__
+        module = sys.modules[type(cog).__module__]
+
+        if kind == "PilotAI":
+            cog.journal = pilot_storage.ConversationJournal(tmp / "convos.json")
+            cog.convos, cog.msg_to_root = {}, {}
+            cog.client = fake_openai_client(FakeCompletions(first_token=llm_ms / 1000))
+
+        elif kind == "StatWrangler":
+            if cog._pool_task is not None:
+                cog._pool_task.cancel()  # no Chromium launch
+                cog._pool_task = None
+            stack.enter_context(
+                mock.patch.object(
+                    module,
+                    "get_r6siege_player_data",
+                    FakeSiegeScraper(latency=scrape_ms / 1000),
+                )
+            )
+            # The originals were opened on the repo's storage dir
+            if cog.stats_cache._disk is not None:
+                cog.stats_cache._disk.close()
+            cog.stats_cache = StatsCache(tmp / "stats_cache.sqlite3")
+            cog.usernames = UsernameStore(tmp / "usernames.json")
+            cog.username_index = UsernameIndex.from_usernames({})
+
+        elif kind == "GuildLifecycle":
+            store = GuildStore(tmp / "guilds.sqlite3")
+            stack.callback(store.close)
+            cog.registry = GuildRegistry(store, cog.registry.flavor)
+
+        elif kind == "RoleCopCog":
+            cog.pending_path = tmp / "pending_approvals.json"
+            cog.cfg = dataclasses.replace(
+                cog.cfg, guild_settings_path=tmp / "guild_settings.json"
+            )
+
+    return stack
+
+
+def _apply_ready(bot: discord.Bot, data: dict) -> None:
+    # READY's own parser waits for every guild and dispatches on_ready
+    # (command deployment); replay only needs the bot's identity
+    state = bot._connection
+    state.user = discord.ClientUser(state=state, data=data["user"])
+    application = data.get("application") or {}
+    if application.get("id"):
+        state.application_id = int(application["id"])
+
+
+def _bind_command(bot: discord.Bot, data: dict) -> None:
+    # Recorded command ids belong to the recording bot; map them to the
+    # local command by name, as a sync would have
+    command = data.get("data") or {}
+    key, name = command.get("id"), command.get("name")
+    if key is None or key in bot._application_commands:
+        return
+    for cmd in bot.pending_application_commands:
+        if cmd.name == name:
+            bot._application_commands[key] = cmd
+            return
+
+
+async def replay_events(
+    bot: discord.Bot,
+    events: Iterable[RecordedEvent],
+    *,
+    speed: float | None,
+    drain_timeout: float = 120.0,
+) -> ReplayReport:
+    """
+    Feed events into bot's parsers. speed=None means as fast as possible;
+    otherwise recorded gaps are divided by speed.
+    """
+    parsers = bot._connection.parsers
+    timer = _ListenerTimer()
+    timer.install(bot)
+
+    parse_count: Counter[str] = Counter()
+    parse_seconds: dict[str, float] = defaultdict(float)
+    max_behind = 0.0
+    n = 0
+
+    t0 = time.perf_counter()
+    for ev in events:
+        if speed is not None:
+            due = t0 + ev.t / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_behind = max(max_behind, -delay)
+
+        p0 = time.perf_counter()
+        if ev.event == "READY":
+            _apply_ready(bot, ev.data)
+        else:
+            if ev.event == "INTERACTION_CREATE":
+                _bind_command(bot, ev.data)
+            parser = parsers.get(ev.event)
+            if parser is not None:
+                parser(ev.data)
+        parse_seconds[ev.event] += time.perf_counter() - p0
+        parse_count[ev.event] += 1
+        n += 1
+
+        # Let scheduled listeners run, as they would between gateway frames
+        await asyncio.sleep(0)
+
+    deadline = time.perf_counter() + drain_timeout
+    while bot._tasks and time.perf_counter() < deadline:
+        await asyncio.wait(list(bot._tasks), timeout=deadline - time.perf_counter())
+    seconds = time.perf_counter() - t0
+
+    return ReplayReport(
+        speed="max" if speed is None else f"{speed:g}x",
+        events=n,
+        seconds=round(seconds, 3),
+        throughput=round(n / seconds, 1) if seconds else 0.0,
+        max_behind_ms=round(max_behind * 1000, 1),
+        parse={
+            name: (parse_count[name], round(parse_seconds[name] * 1000, 2))
+            for name in sorted(parse_count)
+        },
+        listeners=timer.stats(),
+    )
+
+
+async def replay_file(
+    path: Path,
+    *,
+    speed: float | None,
+    flavor: str = "dev",
+    http_ms: float = 0.0,
+    llm_ms: float = 20.0,
+    scrape_ms: float = 50.0,
+) -> ReplayReport:
+    from modules.bot.main import build_bot
+
+    bot = build_bot(flavor=flavor)
+    network = StubNetwork(latency=http_ms / 1000)
+    network.install(bot)
+    try:
+        with (
+            tempfile.TemporaryDirectory(prefix="guildpilot-replay-") as tmp,
+            sandbox_bot(bot, Path(tmp), llm_ms=llm_ms, scrape_ms=scrape_ms),
+        ):
+            report = await replay_events(bot, iter_recording(path), speed=speed)
+            for cog in bot.cogs.values():
+                usernames = getattr(cog, "usernames", None)
+                if usernames is not None:
+                    await usernames.flush()
+    finally:
+        network.uninstall()
+    report.rest_calls = dict(network.calls.most_common())
+    return report
+
+
+def format_report(report: ReplayReport) -> str:
+    lines = [
+        f"Replayed {report.events} event(s) at {report.speed} in "
+        f"{report.seconds:.2f}s -> {report.throughput:.1f} events/s"
+        + (
+            f" (max {report.max_behind_ms:.0f}ms behind schedule)"
+            if report.speed != "max"
+            else ""
+        ),
+        "",
+        f"{'event':<22} {'count':>7} {'parse ms':>10} {'µs/event':>9}",
+    ]
+    for name, (count, ms) in report.parse.items():
+        lines.append(f"{name:<22} {count:>7} {ms:>10.1f} {ms * 1000 / count:>9.1f}")
+
+    width = max([len(s.name) for s in report.listeners] + [8])
+    lines += [
+        "",
+        f"{'listener':<{width}} {'calls':>7} {'total ms':>10} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>6}",
+    ]
+    for s in report.listeners:
+        lines.append(
+            f"{s.name:<{width}} {s.calls:>7} {s.total_ms:>10.1f} {s.p50_ms:>8.2f} "
+            f"{s.p99_ms:>8.2f} {s.errors:>6}"
+        )
+    for s in report.listeners:
+        if s.first_error:
+            lines.append(f"  ! {s.name}: {s.first_error}")
+
+    if report.rest_calls:
+        lines += ["", "REST calls (stubbed):"]
+        lines += [f"  {n:>6}  {route}" for route, n in report.rest_calls.items()]
+    return "\n".join(lines)
+
+
+def _parse_speed(text: str) -> float | None:
+    text = text.lower()
+    if text == "max":
+        return None
+    speed = float(text.removesuffix("x"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be > 0 or 'max'")
+    return speed
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="python -m benchmarks.replay",
+        description="Replay a gateway recording into an offline bot.",
+    )
+    p.add_argument("recording", type=Path)
+    p.add_argument(
+        "--speed",
+        type=_parse_speed,
+        default=1.0,
+        help="1, 10 (times recorded pace) or max (default: 1).",
+    )
+    p.add_argument("--flavor", choices=["dev", "public"], default="dev")
+    p.add_argument(
+        "--http-ms", type=float, default=0.0, help="Added latency per REST call."
+    )
+    p.add_argument("--llm-ms", type=float, default=20.0)
+    p.add_argument("--scrape-ms", type=float, default=50.0)
+    p.add_argument(
+        "--synthesize",
+        action="store_true",
+        help="Write a synthetic recording to RECORDING instead of replaying.",
+    )
+    p.add_argument("--events", type=int, default=2000, help="With --synthesize.")
+    p.add_argument("--guilds", type=int, default=10, help="With --synthesize.")
+    args = p.parse_args(argv)
+
+    if args.synthesize:
+        from benchmarks.synthetic import synthesize_recording
+
+        n = synthesize_recording(args.recording, guilds=args.guilds, events=args.events)
+        print(f"Wrote {n} event(s) -> {args.recording}")
+        return 0
+
+    report = asyncio.run(
+        replay_file(
+            args.recording,
+            speed=args.speed,
+            flavor=args.flavor,
+            http_ms=args.http_ms,
+            llm_ms=args.llm_ms,
+            scrape_ms=args.scrape_ms,
+        )
+    )
+    print()
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
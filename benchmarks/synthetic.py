@@ -0,0 +1,248 @@
+"""
+Synthetic gateway recordings, for replaying without production traffic.
+
+The mix mirrors what the cogs see: guilds coming online, plain chat,
+replies to the bot (PilotAI continues those), member joins/updates and
+/game_stats interactions.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from datetime import UTC, datetime
+from pathlib import Path
+
+from modules.bot.recorder import GatewayRecorder
+
+BOT_USER_ID = "1"
+APPLICATION_ID = "2"
+GAME_STATS_COMMAND_ID = "9001"
+
+_NOW = datetime(2026, 1, 1, tzinfo=UTC).isoformat()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _user(uid: int | str, name: str, *, bot: bool = False) -> dict:
+    return {
+        "id": str(uid),
+        "username": name,
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+BOT_USER = _user(BOT_USER_ID, "GuildPilot", bot=True)
+
+
+def _member(user: dict, roles: list[str]) -> dict:
+    return {
+        "user": user,
+        "roles": roles,
+        "joined_at": _NOW,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def _role(rid: int, name: str, position: int) -> dict:
+    return {
+        "id": str(rid),
+        "name": name,
+        "color": 0,
+        "hoist": False,
+        "position": position,
+        "permissions": "0",
+        "managed": False,
+        "mentionable": False,
+        "flags": 0,
+    }
+
+
+def _message(
+    mid: int, guild_id: str, channel_id: str, author: dict, content: str
+) -> dict:
+    return {
+        "id": str(mid),
+        "channel_id": channel_id,
+        "guild_id": guild_id,
+        "author": author,
+        "content": content,
+        "timestamp": _NOW,
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+        "flags": 0,
+        "components": [],
+    }
+
+
+def synthesize_recording(
+    path: Path,
+    *,
+    guilds: int = 10,
+    members: int = 50,
+    events: int = 2000,
+    rate: float = 50.0,
+    seed: int = 7,
+) -> int:
+    """
+    Write a recording of `events` events (after READY and one GUILD_CREATE
+    per guild) arriving at `rate` events/s. Returns the number written.
+    """
+    rng = random.Random(seed)
+    ids = itertools.count(1_200_000_000_000_000_000)
+    clock = _Clock()
+    recorder = GatewayRecorder(path, redact=False, clock=clock)
+    recorder.open(flavor="synthetic")
+
+    recorder.record(
+        "READY",
+        {
+            "v": 10,
+            "user": BOT_USER,
+            "guilds": [],
+            "session_id": "synthetic",
+            "application": {"id": APPLICATION_ID, "flags": 0},
+        },
+    )
+
+    # Guild id -> (channel id, member users, role ids, bot message ids)
+    world: dict[str, tuple[str, list[dict], list[str], list[str]]] = {}
+    for g in range(guilds):
+        gid, cid = str(next(ids)), str(next(ids))
+        roles = [_role(int(gid), "@everyone", 0), _role(next(ids), "Member", 1)]
+        users = [_user(next(ids), f"user{g}_{i}") for i in range(members)]
+        bot_messages = [str(next(ids)) for _ in range(3)]
+        world[gid] = (cid, users, [r["id"] for r in roles], bot_messages)
+        recorder.record(
+            "GUILD_CREATE",
+            {
+                "id": gid,
+                "name": f"Synthetic Guild {g}",
+                "icon": None,
+                "owner_id": users[0]["id"],
+                "roles": roles,
+                "emojis": [],
+                "stickers": [],
+                "features": [],
+                "member_count": members + 1,
+                "members": [_member(u, [roles[1]["id"]]) for u in users]
+                + [_member(BOT_USER, [])],
+                "channels": [
+                    {
+                        "id": cid,
+                        "type": 0,
+                        "name": "general",
+                        "position": 0,
+                        "permission_overwrites": [],
+                    }
+                ],
+                "threads": [],
+                "presences": [],
+                "voice_states": [],
+                "large": False,
+                "unavailable": False,
+                "verification_level": 0,
+                "default_message_notifications": 0,
+                "explicit_content_filter": 0,
+                "mfa_level": 0,
+                "premium_tier": 0,
+                "preferred_locale": "en-US",
+            },
+        )
+
+    guild_ids = list(world)
+    # Relative weights of each kind of traffic
+    kinds = ["chat", "reply", "interaction", "member_update", "member_add"]
+    weights = [70, 10, 10, 8, 2]
+
+    for _ in range(events):
+        clock.now += rng.expovariate(rate)
+        gid = rng.choice(guild_ids)
+        cid, users, role_ids, bot_messages = world[gid]
+        user = rng.choice(users)
+        kind = rng.choices(kinds, weights)[0]
+
+        if kind in ("chat", "reply"):
+            words = rng.randint(3, 40)
+            msg = _message(next(ids), gid, cid, user, " ".join(["word"] * words))
+            msg["member"] = {k: v for k, v in _member(user, []).items() if k != "user"}
+            if kind == "reply":
+                ref_id = rng.choice(bot_messages)
+                msg["type"] = 19
+                msg["message_reference"] = {
+                    "message_id": ref_id,
+                    "channel_id": cid,
+                    "guild_id": gid,
+                }
+                msg["referenced_message"] = _message(
+                    int(ref_id), gid, cid, BOT_USER, "Earlier answer from the bot."
+                )
+            recorder.record("MESSAGE_CREATE", msg)
+
+        elif kind == "interaction":
+            game = rng.choice(["fortnite", "valorant"])
+            recorder.record(
+                "INTERACTION_CREATE",
+                {
+                    "id": str(next(ids)),
+                    "application_id": APPLICATION_ID,
+                    "type": 2,
+                    "token": "synthetic-token",
+                    "version": 1,
+                    "guild_id": gid,
+                    "channel_id": cid,
+                    "member": {**_member(user, []), "permissions": "0"},
+                    "data": {
+                        "id": GAME_STATS_COMMAND_ID,
+                        "name": "game_stats",
+                        "type": 1,
+                        "options": [
+                            {"name": "game", "type": 3, "value": game},
+                            {
+                                "name": "username",
+                                "type": 3,
+                                "value": f"{user['username']}#0001",
+                            },
+                        ],
+                    },
+                    "locale": "en-US",
+                    "guild_locale": "en-US",
+                    "app_permissions": "0",
+                    "entitlements": [],
+                },
+            )
+
+        elif kind == "member_update":
+            recorder.record(
+                "GUILD_MEMBER_UPDATE",
+                {"guild_id": gid, **_member(user, [role_ids[1]]), "nick": "renamed"},
+            )
+
+        else:
+            newcomer = _user(next(ids), f"newcomer{next(ids) % 100000}")
+            users.append(newcomer)
+            recorder.record(
+                "GUILD_MEMBER_ADD", {"guild_id": gid, **_member(newcomer, [])}
+            )
+
+    written = recorder.count
+    recorder.close()
+    return written
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import discord
+
+from modules.core.guilds.store import GuildStore
+from utils.guild_sync import sync_commands_to_guilds_from_file
+
+logger = logging.getLogger("guildpilot.deploy")
+
+
+@dataclass
+class DeployStatus:
+    state: str = "idle"  # idle | running | done | failed | cancelled
+    started_at_utc: str | None = None
+    finished_at_utc: str | None = None
+    total: int = 0
+    completed: int = 0
+    ok: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    skipped: int = 0
+    error: str | None = None
+
+
+class DeploymentJob:
+    """
+    Registry command deployment as a tracked background task.
+
+    - start() kicks off the sync and returns immediately, so on_ready (and
+      every other cog's on_ready) isn't held up by hundreds of guild syncs.
+    - status() returns a snapshot with progress counters for /deploy_status.
+    - cancel() stops an in-flight deployment (used on shutdown).
+    """
+
+    def __init__(
+        self,
+        bot: discord.Bot,
+        *,
+        registry_path: Path,
+        tag: str,
+        concurrency: int = 3,
+        force: bool = False,
+        store: GuildStore | None = None,
+        registry_flavor: str | None = None,
+    ) -> None:
+        self.bot = bot
+        self.registry_path = registry_path
+        # Targets come from the guild store when given (an indexed query),
+        # otherwise from the registry JSON
+        self.store = store
+        self.registry_flavor = registry_flavor
+        self.tag = tag
+        self.concurrency = concurrency
+        self.force = force
+
+        self._status = DeployStatus()
+        self._task: asyncio.Task | None = None
+        self._report_every = 1
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def status(self) -> dict[str, Any]:
+        return asdict(self._status)
+
+    def start(self) -> asyncio.Task:
+        """Start the deployment once; later calls return the same task."""
+        if self._task is None:
+            self._status = DeployStatus(
+                state="running", started_at_utc=datetime.now(UTC).isoformat()
+            )
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name=f"deploy:{self.tag}"
+            )
+        return self._task
+
+    async def wait(self) -> None:
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def cancel(self) -> None:
+        if self._task is None or self._task.done():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def _on_progress(self, gid: int, outcome: str, total: int) -> None:
+        st = self._status
+        if st.total != total:
+            st.total = total
+            self._report_every = max(1, total // 10)
+
+        st.completed += 1
+        if outcome == "ok":
+            st.ok += 1
+        elif outcome == "unchanged":
+            st.unchanged += 1
+        elif outcome == "not_in_guild":
+            st.skipped += 1
+        else:
+            st.errors += 1
+
+        if st.completed % self._report_every == 0 or st.completed == total:
+            logger.info("progress %d/%d", st.completed, total, extra={"tag": self.tag})
+
+    async def _run(self) -> None:
+        st = self._status
+        try:
+            guild_ids = None
+            if self.store is not None and self.registry_flavor:
+                # Left guilds can't be synced: read only the active ones,
+                # straight off the (flavor, active) index
+                guild_ids = await asyncio.to_thread(
+                    self.store.guild_ids, self.registry_flavor, status="active"
+                )
+            results = await sync_commands_to_guilds_from_file(
+                self.bot,
+                self.registry_path,
+                concurrency=self.concurrency,
+                tag=self.tag,
+                force=self.force,
+                on_progress=self._on_progress,
+                guild_ids=guild_ids,
+                compact=True,  # when it falls back to the JSON file
+            )
+            st.state = "done"
+            if results:
+                logger.info(
+                    "deployed to %d guild(s) | %d unchanged | %d error(s) | %d skipped",
+                    st.ok,
+                    st.unchanged,
+                    st.errors,
+                    st.skipped,
+                    extra={"tag": self.tag},
+                )
+            else:
+                logger.info("no registry targets (0 guilds)", extra={"tag": self.tag})
+        except asyncio.CancelledError:
+            st.state = "cancelled"
+            logger.warning(
+                "cancelled at %d/%d guild(s)",
+                st.completed,
+                st.total,
+                extra={"tag": self.tag},
+            )
+            raise
+        except Exception as e:
+            st.state = "failed"
+            st.error = f"{type(e).__name__}: {e}"
+            logger.error(
+                "error syncing commands: %s", st.error, extra={"tag": self.tag}
+            )
+        finally:
+            st.finished_at_utc = datetime.now(UTC).isoformat()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+logger = logging.getLogger("guildpilot.loops")
+
+LOOPS = ("asyncio", "uvloop")
+
+
+def loop_factory(
+    name: str,
+) -> tuple[str, Callable[[], asyncio.AbstractEventLoop] | None]:
+    """
+    (effective loop name, factory for asyncio.Runner). uvloop is optional:
+    when it isn't installed (or on Windows) this falls back to asyncio.
+    """
+    if name == "asyncio":
+        return "asyncio", None
+    if name == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("uvloop is not installed; falling back to asyncio")
+            return "asyncio", None
+        return "uvloop", uvloop.new_event_loop
+    raise ValueError(f"unknown event loop {name!r}; choose from {', '.join(LOOPS)}")
+
+
+def run(main: Coroutine[Any, Any, Any], *, loop: str = "asyncio") -> Any:
+    """asyncio.run(main) on the requested event loop implementation."""
+    _, factory = loop_factory(loop)
+    with asyncio.Runner(loop_factory=factory) as runner:
+        return runner.run(main)
+
+
+def current_loop_name() -> str:
+    """'uvloop' or 'asyncio', for the running loop (boot logs, benchmarks)."""
+    loop = asyncio.get_running_loop()
+    return "uvloop" if type(loop).__module__.startswith("uvloop") else "asyncio"
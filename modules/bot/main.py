@@ -1,20 +1,34 @@
 import argparse
 import asyncio
+import importlib
 import logging
+import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
 import discord
 
+from modules.bot import loops, shutdown
+from modules.bot.deploy import DeploymentJob
+from modules.bot.recorder import GatewayRecorder
+from modules.bot.shards import (
+    ShardSupervisor,
+    parse_shard_ids,
+    shard_label,
+    shard_registry_path,
+)
+from modules.core.cache import policy_for_flavor
 from modules.core.env_check.env_check import get_dev_env_vars, get_env_vars
-from utils.guild_sync import sync_commands_to_guilds_from_file
+from modules.core.guilds.store import GuildStore, registry_flavor
+from utils.log_pipeline import setup_logging
+
+logger = logging.getLogger("guildpilot.boot")
 
 
 def configure_logging() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-        datefmt="%I:%M:%S %p",
-    )
+    # JSON lines via a background writer thread; LOG_FORMAT=text for local dev
+    setup_logging()
     logging.getLogger("discord").setLevel(logging.WARNING)
     logging.getLogger("discord.http").setLevel(logging.WARNING)
     logging.getLogger("discord.gateway").setLevel(logging.WARNING)
@@ -23,6 +37,7 @@ def configure_logging() -> None:
 
 MODULES_PUBLIC = [
     ("core.guilds", "modules.core.guilds.guilds_tracker"),
+    ("core.diagnostics", "modules.core.diagnostics"),
     ("pilotai", "modules.pilotai.commands"),
     ("statwrangler", "modules.statwrangler.commands"),
     ("rolecop", "modules.rolecop"),
@@ -35,14 +50,77 @@ MODULES_DEV_ONLY: list[tuple[str, str]] = [
 ]
 
 
-def build_bot(*, flavor: str, dev_guild_id: int | None = None) -> discord.Bot:
+@dataclass
+class ExtensionTiming:
+    name: str
+    path: str
+    import_ms: float
+    setup_ms: float
+
+    @property
+    def total_ms(self) -> float:
+        return self.import_ms + self.setup_ms
+
+
+def load_timed_extension(bot: discord.Bot, name: str, path: str) -> ExtensionTiming:
+    """
+    Load one extension, timing the module import separately from its setup()
+    (cog construction, command registration). Importing first means
+    load_extension finds the module in sys.modules and only pays for setup.
+    """
+    t0 = time.perf_counter()
+    importlib.import_module(path)
+    t1 = time.perf_counter()
+    bot.load_extension(path)
+    t2 = time.perf_counter()
+    return ExtensionTiming(name, path, (t1 - t0) * 1000, (t2 - t1) * 1000)
+
+
+def log_boot_timeline(flavor: str, timeline: list[ExtensionTiming]) -> None:
+    total = sum(t.total_ms for t in timeline)
+    logger.info(
+        "extension timeline (%.0fms total)",
+        total,
+        extra={
+            "flavor": flavor,
+            "extensions": {
+                t.name: {
+                    "import_ms": round(t.import_ms, 1),
+                    "setup_ms": round(t.setup_ms, 1),
+                }
+                for t in timeline
+            },
+        },
+    )
+
+
+def build_bot(
+    *,
+    flavor: str,
+    dev_guild_id: int | None = None,
+    force_sync: bool = False,
+    shard_ids: list[int] | None = None,
+    shard_count: int | None = None,
+) -> discord.Bot:
     intents = discord.Intents.default()
     intents.message_content = True
 
-    bot = discord.Bot(intents=intents)
+    # Member/message caching per flavor (PUBLIC_*/DEV_* env overrides)
+    cache_policy = policy_for_flavor(flavor)
+    options = cache_policy.bot_options(intents)
+
+    if shard_count:
+        bot = discord.AutoShardedBot(
+            intents=intents, shard_ids=shard_ids, shard_count=shard_count, **options
+        )
+    else:
+        bot = discord.Bot(intents=intents, **options)
+    bot.cache_policy = cache_policy
 
     # ✅ attach flavor + registry path BEFORE loading extensions
     bot.flavor = flavor
+    # --force-sync: resync every registry guild even if its fingerprint matches
+    bot.force_sync = force_sync
 
     project_root = (
         Path(__file__).resolve().parents[2]
@@ -55,59 +133,76 @@ def build_bot(*, flavor: str, dev_guild_id: int | None = None) -> discord.Bot:
         bot.guild_registry_path = (
             project_root / "modules" / "core" / "guilds" / "public_guilds.json"
         )
+    if shard_ids:
+        # One registry (and sync state) per shard process; see shard_registry_path
+        bot.guild_registry_path = shard_registry_path(
+            bot.guild_registry_path, shard_ids
+        )
+    shards = shard_label(shard_ids)
+
+    # Guild registries (every flavor and shard group) share one sqlite store;
+    # the legacy JSON registry is imported into it on first start
+    bot.guild_store = GuildStore()
+    bot.registry_flavor = registry_flavor(flavor, shard_ids)
+    bot.guild_store.migrate_json(bot.registry_flavor, bot.guild_registry_path)
 
-    print(f"[BOOT:{flavor}] loading modules")
+    logger.info("loading modules", extra={"flavor": flavor})
 
+    # Heavy deps (Playwright, OpenAI) are imported on first use inside the
+    # cogs, so these numbers stay small; a regression shows up here.
+    bot.boot_timeline = []
     loaded: list[str] = []
     for name, path in MODULES_PUBLIC:
-        bot.load_extension(path)
+        bot.boot_timeline.append(load_timed_extension(bot, name, path))
         loaded.append(name)
-    print(f"[BOOT:{flavor}] Loaded modules: {', '.join(loaded)}")
+    logger.info("loaded modules: %s", ", ".join(loaded), extra={"flavor": flavor})
 
     if flavor == "dev":
         dev_loaded: list[str] = []
         for name, path in MODULES_DEV_ONLY:
-            bot.load_extension(path)
+            bot.boot_timeline.append(load_timed_extension(bot, name, path))
             dev_loaded.append(name)
-        print(f"[BOOT:{flavor}] Loaded dev modules: {', '.join(dev_loaded)}")
+        logger.info(
+            "loaded dev modules: %s", ", ".join(dev_loaded), extra={"flavor": flavor}
+        )
 
-    @bot.event
-    async def on_ready():
-        print(f"\n===== STARTUP:{flavor} =====")
-        print(f"[READY:{flavor}] Logged in as {bot.user} (id={bot.user.id})")
+    log_boot_timeline(flavor, bot.boot_timeline)
+
+    # Registry command deployment runs in the background; see /deploy_status
+    bot.deploy_job = DeploymentJob(
+        bot,
+        registry_path=bot.guild_registry_path,
+        tag=f"{flavor}{shards}:guilds",
+        concurrency=3,
+        force=force_sync,
+        store=bot.guild_store,
+        registry_flavor=bot.registry_flavor,
+    )
 
-        if getattr(bot, "_did_sync_once", False):
-            print(f"[READY:{flavor}] Already synced commands once; skipping re-sync.")
-            print(f"===== READY:{flavor} =====\n")
-            return
+    # GATEWAY_RECORD=recordings/{flavor}.jsonl.gz: tee gateway events to a
+    # file for offline replay (benchmarks/replay.py)
+    recorder_flavor = (
+        f"{flavor}-shard-{'-'.join(map(str, shard_ids))}" if shard_ids else flavor
+    )
+    bot.gateway_recorder = GatewayRecorder.from_env(recorder_flavor)
+    if bot.gateway_recorder is not None:
+        bot.gateway_recorder.install(bot, flavor=recorder_flavor)
 
-        bot._did_sync_once = True
-        print(f"[READY:{flavor}] Syncing commands...")
+    # SIGTERM/SIGINT: stop taking commands, drain, flush stores, then close
+    bot.shutdown_coordinator = shutdown.ShutdownCoordinator.from_env(bot)
+    bot.shutdown_coordinator.install()
 
-        guilds_json: Path = bot.guild_registry_path
+    @bot.event
+    async def on_ready():
+        fields = {"flavor": flavor, "shard_ids": shard_ids}
+        logger.info("logged in as %s (id=%s)", bot.user, bot.user.id, extra=fields)
 
-        try:
-            results = await sync_commands_to_guilds_from_file(
-                bot,
-                guilds_json,
-                concurrency=3,
-                tag=f"{flavor}:guilds",
-            )
+        if bot.deploy_job.started:
+            logger.info("already synced commands once; skipping re-sync", extra=fields)
+            return
 
-            if results:
-                ok = sum(
-                    1 for v in results.values() if v == "ok" or str(v).startswith("ok")
-                )
-                err = sum(1 for v in results.values() if str(v).startswith("error:"))
-                skipped = sum(1 for v in results.values() if v == "not_in_guild")
-                print(
-                    f"[DEPLOY:{flavor}] deployed to {ok} guild(s) | {err} error(s) | {skipped} skipped"
-                )
-            else:
-                print(f"[DEPLOY:{flavor}] no registry targets (0 guilds)")
-
-        except Exception as e:
-            print(f"[DEPLOY:{flavor}] ERROR syncing commands: {type(e).__name__}: {e}")
+        # Existing commands keep working while this runs; don't block READY
+        bot.deploy_job.start()
 
         # Commands loaded locally (in-memory)
         cmds = list(bot.walk_application_commands())
@@ -117,34 +212,69 @@ def build_bot(*, flavor: str, dev_guild_id: int | None = None) -> discord.Bot:
             key = getattr(c, "qualified_name", c.name)
             unique[key] = c
 
-        print(
-            f"[CMDS:{flavor}] loaded {len(unique)} commands locally (raw: {len(cmds)})"
+        logger.info(
+            "ready; syncing commands in the background (%d loaded locally, raw: %d)",
+            len(unique),
+            len(cmds),
+            extra={**fields, "commands": sorted(unique)},
         )
-        for name in sorted(unique.keys()):
-            print(f"    • /{name}")
-
-        print(f"\n===== READY:{flavor} =====\n")
 
     return bot
 
 
-async def run_public() -> None:
-    """Run only the public bot. Intended for its own process/service."""
+async def serve(bot: discord.Bot, token: str) -> None:
+    """
+    Run bot until a signal, disconnect or cancellation, then shut down
+    gracefully (see modules/bot/shutdown.py).
+    """
+    coordinator: shutdown.ShutdownCoordinator = bot.shutdown_coordinator
+    shutdown.register(coordinator)
+    logger.info(
+        "event loop: %s", loops.current_loop_name(), extra={"flavor": bot.flavor}
+    )
+    try:
+        await bot.start(token)
+    finally:
+        # No-op if a signal already ran it; otherwise flush before exiting
+        await asyncio.shield(coordinator.shutdown("exit"))
+        shutdown.unregister(coordinator)
+        recorder: GatewayRecorder | None = getattr(bot, "gateway_recorder", None)
+        if recorder is not None:
+            recorder.close()
+        store: GuildStore | None = getattr(bot, "guild_store", None)
+        if store is not None:
+            store.close()
+
+
+async def run_public(
+    *,
+    force_sync: bool = False,
+    shard_ids: list[int] | None = None,
+    shard_count: int | None = None,
+) -> None:
+    """Run only the public bot. Intended for its own process/service.
+    With shard_count set, runs an AutoShardedBot for shard_ids (all shards
+    if None); the shard supervisor calls this once per worker process."""
     configure_logging()
     config = get_env_vars()
-    bot = build_bot(flavor="public")
-    await bot.start(config.discord_token)
+    bot = build_bot(
+        flavor="public",
+        force_sync=force_sync,
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+    )
+    await serve(bot, config.discord_token)
 
 
-async def run_dev() -> None:
+async def run_dev(*, force_sync: bool = False) -> None:
     """Run only the dev bot. Intended for its own process/service."""
     configure_logging()
     dev_config = get_dev_env_vars()
-    bot = build_bot(flavor="dev")
-    await bot.start(dev_config.discord_token)
+    bot = build_bot(flavor="dev", force_sync=force_sync)
+    await serve(bot, dev_config.discord_token)
 
 
-async def run_two_bots() -> None:
+async def run_two_bots(*, force_sync: bool = False) -> None:
     """Run both bots in one process. Convenient for local development only —
     production deploys should run public/dev as separate processes (see
     run_public/run_dev) so restarting one never disrupts the other."""
@@ -153,12 +283,12 @@ async def run_two_bots() -> None:
     config = get_env_vars()
     dev_config = get_dev_env_vars()
 
-    public_bot = build_bot(flavor="public")
-    dev_bot = build_bot(flavor="dev")
+    public_bot = build_bot(flavor="public", force_sync=force_sync)
+    dev_bot = build_bot(flavor="dev", force_sync=force_sync)
 
     await asyncio.gather(
-        public_bot.start(config.discord_token),
-        dev_bot.start(dev_config.discord_token),
+        serve(public_bot, config.discord_token),
+        serve(dev_bot, dev_config.discord_token),
     )
 
 
@@ -171,7 +301,71 @@ def main() -> None:
         help="Which bot(s) to run. 'both' (default) is for local development; "
         "production should run 'public' and 'dev' as separate processes.",
     )
+    parser.add_argument(
+        "--force-sync",
+        action="store_true",
+        help="Sync commands to every registry guild, even ones whose command "
+        "fingerprint hasn't changed since the last successful sync.",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        metavar="N",
+        help="Public flavor only: total shard count. Runs the shards under a "
+        "supervisor in worker processes and restarts any worker that crashes.",
+    )
+    parser.add_argument(
+        "--shard-ids",
+        metavar="IDS",
+        help="Subset of shards to run on this host, e.g. '0-3' or '0,2,4' "
+        "(default: all of 0..N-1).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="K",
+        help="Worker processes to spread the shards over (default: one per "
+        "shard, so a crash only restarts that shard).",
+    )
+    parser.add_argument(
+        "--loop",
+        choices=loops.LOOPS,
+        default=os.getenv("EVENT_LOOP", "asyncio"),
+        help="Event loop implementation (env EVENT_LOOP). 'uvloop' falls back "
+        "to asyncio if uvloop isn't installed.",
+    )
     args = parser.parse_args()
+    # argparse only checks choices for values given on the command line
+    if args.loop not in loops.LOOPS:
+        parser.error(
+            f"EVENT_LOOP: invalid choice {args.loop!r} "
+            f"(choose from {', '.join(loops.LOOPS)})"
+        )
+
+    if args.shards is not None:
+        if args.flavor != "public":
+            parser.error("--shards is only supported with --flavor public")
+        if args.shards < 1:
+            parser.error("--shards must be at least 1")
+        try:
+            shard_ids = (
+                parse_shard_ids(args.shard_ids, args.shards)
+                if args.shard_ids
+                else list(range(args.shards))
+            )
+        except ValueError as e:
+            parser.error(f"--shard-ids: {e}")
+        configure_logging()
+        ShardSupervisor(
+            shard_ids,
+            args.shards,
+            workers=args.workers,
+            force_sync=args.force_sync,
+            loop=args.loop,
+        ).run()
+        return
+    if args.shard_ids or args.workers:
+        parser.error("--shard-ids/--workers require --shards")
 
     runners = {
         "public": run_public,
@@ -180,9 +374,9 @@ def main() -> None:
     }
 
     try:
-        asyncio.run(runners[args.flavor]())
+        loops.run(runners[args.flavor](force_sync=args.force_sync), loop=args.loop)
     except KeyboardInterrupt:
-        print("[SHUTDOWN] received Ctrl+C")
+        logger.info("received Ctrl+C")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import discord
+
+logger = logging.getLogger("guildpilot.recorder")
+
+FORMAT = "guildpilot-gateway"
+VERSION = 1
+
+# What the cogs react to; presence/typing noise is left out by default
+DEFAULT_EVENTS = frozenset(
+    {
+        "READY",
+        "GUILD_CREATE",
+        "GUILD_DELETE",
+        "GUILD_MEMBER_ADD",
+        "GUILD_MEMBER_REMOVE",
+        "GUILD_MEMBER_UPDATE",
+        "MESSAGE_CREATE",
+        "INTERACTION_CREATE",
+    }
+)
+
+
+@dataclass(frozen=True)
+class RecordedEvent:
+    t: float  # seconds since recording started
+    event: str  # gateway dispatch name, e.g. "MESSAGE_CREATE"
+    data: dict
+
+
+# Who someone is: user objects, and members (GUILD_CREATE, member events,
+# interactions, message authors and mentions)
+_IDENTITY_KEYS = frozenset({"username", "global_name", "nick"})
+# Attachment (and embed media) locations
+_URL_KEYS = frozenset({"url", "proxy_url", "filename"})
+_FILLED_KEYS = frozenset({"content"}) | _IDENTITY_KEYS | _URL_KEYS
+_STRING_OPTION = 3
+
+
+def _filler(value: str) -> str:
+    # Keep the length (PilotAI trims/splits on it), drop the words
+    return "x" * len(value)
+
+
+def _redact_strings(obj: Any) -> Any:
+    """Every string in an embed, except its type, becomes filler."""
+    if isinstance(obj, dict):
+        return {k: v if k == "type" else _redact_strings(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_redact_strings(v) for v in obj]
+    return _filler(obj) if isinstance(obj, str) else obj
+
+
+def _redact_options(options: list) -> list:
+    """Slash command options: string values become filler (ids stay)."""
+    out = []
+    for opt in options:
+        if isinstance(opt, dict):
+            opt = _redact(opt)
+            if opt.get("type") == _STRING_OPTION and isinstance(opt.get("value"), str):
+                opt["value"] = _filler(opt["value"])
+        out.append(opt)
+    return out
+
+
+def _redact(obj: Any) -> Any:
+    """
+    A copy of a gateway payload without what people wrote or who they are:
+    message content, embeds, attachment URLs/filenames, string options and
+    usernames/nicknames. Ids, types and lengths are kept, so replays still
+    resolve the same guilds, members and commands.
+    """
+    if isinstance(obj, list):
+        return [_redact(v) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for k, v in obj.items():
+        if isinstance(v, str) and k in _FILLED_KEYS:
+            out[k] = _filler(v)
+        elif k == "embeds" and isinstance(v, list):
+            out[k] = _redact_strings(v)
+        elif k == "options" and isinstance(v, list):
+            out[k] = _redact_options(v)
+        else:
+            out[k] = _redact(v)
+    return out
+
+
+class GatewayRecorder:
+    """
+    Tees gateway dispatches into a compact file for offline replay
+    (benchmarks/replay.py).
+
+    Format: gzip'd JSON lines. The first line is a header; every other line
+    is [t_ms, "EVENT_NAME", payload] with t_ms relative to the first event.
+    Unless redact=False, message content, embeds, attachment URLs, string
+    command options and usernames/nicknames are replaced by same-length
+    filler (see _redact).
+
+    install() wraps the connection state's parser table, which the gateway
+    looks events up in, so recording sees exactly what the bot parses.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        events: Iterable[str] = DEFAULT_EVENTS,
+        redact: bool = True,
+        max_events: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = path
+        self.events = frozenset(e.upper() for e in events)
+        self.redact = redact
+        self.max_events = max_events
+        self._clock = clock
+        self._t0: float | None = None
+        self._file = None
+        self.count = 0
+
+    @classmethod
+    def from_env(cls, flavor: str) -> GatewayRecorder | None:
+        """
+        None unless GATEWAY_RECORD names an output file. "{flavor}" in the
+        name is filled in, so two bots in one process (or several shard
+        workers) don't write to the same file.
+        """
+        target = os.getenv("GATEWAY_RECORD", "").strip()
+        if not target:
+            return None
+        events = os.getenv("GATEWAY_RECORD_EVENTS", "")
+        max_events = os.getenv("GATEWAY_RECORD_MAX", "")
+        return cls(
+            Path(target.replace("{flavor}", flavor)),
+            events=[e.strip() for e in events.split(",") if e.strip()]
+            or DEFAULT_EVENTS,
+            redact=os.getenv("GATEWAY_RECORD_REDACT", "1") != "0",
+            max_events=int(max_events) if max_events else None,
+        )
+
+    def install(self, bot: discord.Bot, *, flavor: str = "?") -> None:
+        self.open(flavor=flavor)
+        parsers: dict[str, Callable[[dict], None]] = bot._connection.parsers
+        for name in self.events:
+            original = parsers.get(name)
+            if original is not None:
+                parsers[name] = self._wrap(name, original)
+        logger.info(
+            "recording %d event type(s) -> %s",
+            len(self.events),
+            self.path,
+            extra={"flavor": flavor},
+        )
+
+    def _wrap(
+        self, name: str, parser: Callable[[dict], None]
+    ) -> Callable[[dict], None]:
+        def recording_parser(data: dict) -> None:
+            try:
+                self.record(name, data)
+            except Exception as e:
+                logger.warning("could not record %s: %r", name, e)
+            parser(data)
+
+        return recording_parser
+
+    def open(self, *, flavor: str = "?") -> None:
+        if self._file is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=6)
+        header = {
+            "format": FORMAT,
+            "version": VERSION,
+            "recorded_at": datetime.now(UTC).isoformat(),
+            "flavor": flavor,
+            "redacted": self.redact,
+        }
+        self._file.write(json.dumps(header) + "\n")
+
+    def record(self, event: str, data: dict) -> None:
+        if self._file is None:
+            return
+        if self.max_events is not None and self.count >= self.max_events:
+            return
+        now = self._clock()
+        if self._t0 is None:
+            self._t0 = now
+        if self.redact:
+            data = _redact(data)
+        line = [round((now - self._t0) * 1000, 1), event, data]
+        # Serialized now: parsers add private keys to the payload afterwards
+        self._file.write(json.dumps(line, separators=(",", ":"), default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info("recorded %d event(s) -> %s", self.count, self.path)
+
+
+def read_header(path: Path) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+    if not isinstance(header, dict) or header.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a gateway recording")
+    return header
+
+
+def iter_recording(path: Path) -> Iterator[RecordedEvent]:
+    """Stream events from a recording without loading the whole file."""
+    read_header(path)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            if not line.strip():
+                continue
+            t_ms, event, data = json.loads(line)
+            yield RecordedEvent(t_ms / 1000, event, data)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import functools
+import logging
+import multiprocessing
+import signal
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger("guildpilot.shards")
+
+
+class ProcessLike(Protocol):
+    exitcode: int | None
+
+    def start(self) -> None: ...
+    def is_alive(self) -> bool: ...
+    def terminate(self) -> None: ...
+    def kill(self) -> None: ...
+    def join(self, timeout: float | None = None) -> None: ...
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Discord's shard routing: (guild_id >> 22) % shard_count."""
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(text: str, shard_count: int) -> list[int]:
+    """'0,2,4-7' -> [0, 2, 4, 5, 6, 7]; every id must be < shard_count."""
+    ids: set[int] = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = (int(x) for x in part.split("-", 1))
+            ids.update(range(lo, hi + 1))
+        else:
+            ids.add(int(part))
+
+    bad = sorted(i for i in ids if not 0 <= i < shard_count)
+    if bad:
+        raise ValueError(f"shard ids {bad} out of range for {shard_count} shard(s)")
+    if not ids:
+        raise ValueError("no shard ids given")
+    return sorted(ids)
+
+
+def plan_workers(shard_ids: Sequence[int], workers: int) -> list[list[int]]:
+    """Split shard_ids into `workers` contiguous, near-equal groups."""
+    workers = max(1, min(workers, len(shard_ids)))
+    base, extra = divmod(len(shard_ids), workers)
+    groups: list[list[int]] = []
+    start = 0
+    for i in range(workers):
+        size = base + (1 if i < extra else 0)
+        groups.append(list(shard_ids[start : start + size]))
+        start += size
+    return groups
+
+
+def shard_registry_path(base: Path, shard_ids: Sequence[int]) -> Path:
+    """
+    public_guilds.json -> public_guilds.shard-0-1.json
+
+    Each shard process owns its own registry (and, via sync_state_path_for,
+    its own sync state), so GuildTracker snapshots and command-sync
+    bookkeeping from different processes never overwrite each other.
+    """
+    suffix = "-".join(str(i) for i in shard_ids)
+    return base.with_name(f"{base.stem}.shard-{suffix}{base.suffix}")
+
+
+def shard_label(shard_ids: Sequence[int] | None) -> str:
+    if not shard_ids:
+        return ""
+    return f"[shard {','.join(str(i) for i in shard_ids)}]"
+
+
+def run_shard_worker(
+    shard_ids: list[int],
+    shard_count: int,
+    force_sync: bool = False,
+    loop: str = "asyncio",
+) -> None:
+    """Process entrypoint: run the public bot for one group of shards."""
+    from modules.bot import loops
+    from modules.bot.main import run_public
+
+    try:
+        loops.run(
+            run_public(
+                force_sync=force_sync, shard_ids=shard_ids, shard_count=shard_count
+            ),
+            loop=loop,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def _spawn_process(
+    index: int,
+    shard_ids: list[int],
+    shard_count: int,
+    force_sync: bool,
+    loop: str = "asyncio",
+) -> ProcessLike:
+    # "spawn" so each worker starts from a clean interpreter (no inherited
+    # event loop, sockets or Playwright driver from the supervisor)
+    ctx = multiprocessing.get_context("spawn")
+    return ctx.Process(
+        target=run_shard_worker,
+        args=(shard_ids, shard_count, force_sync, loop),
+        name=f"shard-worker-{index}",
+    )
+
+
+@dataclass
+class ShardWorker:
+    index: int
+    shard_ids: list[int]
+    process: ProcessLike | None = None
+    started_at: float = 0.0
+    restarts: int = 0
+    backoff: float = 0.0
+    restart_at: float | None = None
+    finished: bool = False
+
+
+class ShardSupervisor:
+    """
+    Runs the public bot's shards across worker processes.
+
+    - Shards are split into `workers` groups; each group is one process
+      running a discord.AutoShardedBot with those shard_ids.
+    - A worker that exits non-zero (crash, OOM kill, ...) is restarted on its
+      own with exponential backoff; the other workers keep running. The
+      backoff resets once a worker has stayed up for stable_after seconds.
+    - A worker that exits cleanly (code 0) is not restarted.
+    - SIGINT/SIGTERM on the supervisor stops every worker.
+    """
+
+    def __init__(
+        self,
+        shard_ids: Sequence[int],
+        shard_count: int,
+        *,
+        workers: int | None = None,
+        force_sync: bool = False,
+        loop: str = "asyncio",
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        stable_after: float = 60.0,
+        poll_interval: float = 1.0,
+        spawn: Callable[[int, list[int], int, bool], ProcessLike] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.shard_count = shard_count
+        self.force_sync = force_sync
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.poll_interval = poll_interval
+        # Each worker runs on the same event loop implementation (--loop)
+        self._spawn = spawn or functools.partial(_spawn_process, loop=loop)
+        self._clock = clock
+        self._stopping = False
+
+        groups = plan_workers(list(shard_ids), workers or len(shard_ids))
+        self.workers = [ShardWorker(index=i, shard_ids=g) for i, g in enumerate(groups)]
+
+    def start(self) -> None:
+        for worker in self.workers:
+            self._start_worker(worker)
+
+    def _start_worker(self, worker: ShardWorker) -> None:
+        worker.process = self._spawn(
+            worker.index, worker.shard_ids, self.shard_count, self.force_sync
+        )
+        worker.process.start()
+        worker.started_at = self._clock()
+        worker.restart_at = None
+        logger.info(
+            "worker %d started %s",
+            worker.index,
+            shard_label(worker.shard_ids),
+            extra={"flavor": "public", "worker": worker.index},
+        )
+
+    def poll(self) -> None:
+        """Check every worker once; schedule/perform restarts for crashed ones."""
+        now = self._clock()
+        for worker in self.workers:
+            proc = worker.process
+            if worker.finished or proc is None or proc.is_alive():
+                continue
+
+            if worker.restart_at is None:
+                code = proc.exitcode
+                if code == 0:
+                    worker.finished = True
+                    logger.info(
+                        "worker %d exited cleanly",
+                        worker.index,
+                        extra={"flavor": "public", "worker": worker.index},
+                    )
+                    continue
+
+                uptime = now - worker.started_at
+                if uptime >= self.stable_after:
+                    worker.backoff = self.min_backoff
+                else:
+                    worker.backoff = min(
+                        self.max_backoff, max(self.min_backoff, worker.backoff * 2)
+                    )
+                worker.restart_at = now + worker.backoff
+                logger.warning(
+                    "worker %d %s crashed (exit %s) after %.0fs; restarting in %.0fs",
+                    worker.index,
+                    shard_label(worker.shard_ids),
+                    code,
+                    uptime,
+                    worker.backoff,
+                    extra={"flavor": "public", "worker": worker.index},
+                )
+
+            if now >= worker.restart_at:
+                worker.restarts += 1
+                self._start_worker(worker)
+
+    @property
+    def done(self) -> bool:
+        return all(w.finished for w in self.workers)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        # SIGTERM lets each worker drain and flush (ShutdownCoordinator)
+        self._stopping = True
+        alive = [w.process for w in self.workers if w.process and w.process.is_alive()]
+        for proc in alive:
+            proc.terminate()
+        deadline = self._clock() + timeout
+        for proc in alive:
+            proc.join(max(0.0, deadline - self._clock()))
+            if proc.is_alive():
+                proc.kill()
+                proc.join(1.0)
+
+    def run(self) -> None:
+        """Start every worker and supervise until signalled or all exit."""
+
+        def _request_stop(signum: int, frame: Any) -> None:
+            self._stopping = True
+
+        previous = {
+            sig: signal.signal(sig, _request_stop)
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.start()
+            while not self._stopping and not self.done:
+                time.sleep(self.poll_interval)
+                self.poll()
+        finally:
+            logger.info("stopping workers", extra={"flavor": "public"})
+            self.stop()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
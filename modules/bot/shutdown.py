@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import time
+
+import discord
+
+logger = logging.getLogger("guildpilot.shutdown")
+
+# Cogs holding state implement `async def graceful_shutdown(self) -> None`;
+# it runs after in-flight commands drain and before the gateway closes.
+HOOK_NAME = "graceful_shutdown"
+
+DRAINING_NOTICE = "🔄 The bot is restarting — please try again in a moment."
+
+
+class ShutdownCoordinator:
+    """
+    Coordinated, bounded shutdown for one bot.
+
+    1. Stop accepting new slash commands/autocomplete (they get a short
+       "restarting" notice instead of timing out).
+    2. Wait up to drain_timeout for in-flight commands to finish.
+    3. Cancel the background command deployment.
+    4. Run every cog's graceful_shutdown() hook (flush stores, close
+       browsers/clients), each bounded by hook_timeout.
+    5. Close the bot: gateway and HTTP session.
+
+    install() makes the bot route interactions through handle_interaction so
+    in-flight commands are counted.
+    """
+
+    def __init__(
+        self,
+        bot: discord.Bot,
+        *,
+        drain_timeout: float = 20.0,
+        hook_timeout: float = 10.0,
+    ) -> None:
+        self.bot = bot
+        self.drain_timeout = drain_timeout
+        self.hook_timeout = hook_timeout
+
+        self.closing = False
+        self.in_flight = 0
+        self.rejected = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._done: asyncio.Future | None = None
+
+    @classmethod
+    def from_env(cls, bot: discord.Bot) -> ShutdownCoordinator:
+        return cls(
+            bot,
+            drain_timeout=float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "20")),
+            hook_timeout=float(os.getenv("SHUTDOWN_HOOK_SECONDS", "10")),
+        )
+
+    def install(self) -> None:
+        """Replace the bot's default on_interaction with the gated one."""
+        self.bot.on_interaction = self.handle_interaction
+
+    async def handle_interaction(self, interaction: discord.Interaction) -> None:
+        if self.closing:
+            self.rejected += 1
+            await self._reject(interaction)
+            return
+
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            await self.bot.process_application_commands(interaction)
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+
+    async def _reject(self, interaction: discord.Interaction) -> None:
+        try:
+            if interaction.type == discord.InteractionType.auto_complete:
+                await interaction.response.send_autocomplete_result(choices=[])
+            elif interaction.type == discord.InteractionType.application_command:
+                await interaction.response.send_message(DRAINING_NOTICE, ephemeral=True)
+        except Exception:
+            pass
+
+    @property
+    def done(self) -> bool:
+        return self._done is not None and self._done.done()
+
+    async def shutdown(self, reason: str = "shutdown") -> None:
+        """Run the shutdown sequence once; concurrent callers wait for it."""
+        if self._done is not None:
+            await asyncio.shield(self._done)
+            return
+        self._done = asyncio.get_running_loop().create_future()
+        try:
+            await self._shutdown(reason)
+        finally:
+            self._done.set_result(None)
+
+    async def _shutdown(self, reason: str) -> None:
+        t0 = time.perf_counter()
+        flavor = getattr(self.bot, "flavor", "?")
+        self.closing = True
+        logger.info(
+            "shutting down (%s): draining %d in-flight command(s)",
+            reason,
+            self.in_flight,
+            extra={"flavor": flavor},
+        )
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.drain_timeout)
+        except TimeoutError:
+            logger.warning(
+                "drain deadline (%.0fs) passed with %d command(s) still running",
+                self.drain_timeout,
+                self.in_flight,
+                extra={"flavor": flavor},
+            )
+
+        deploy_job = getattr(self.bot, "deploy_job", None)
+        if deploy_job is not None:
+            await deploy_job.cancel()
+
+        for name, cog in list(self.bot.cogs.items()):
+            hook = getattr(cog, HOOK_NAME, None)
+            if hook is None:
+                continue
+            try:
+                await asyncio.wait_for(hook(), timeout=self.hook_timeout)
+            except TimeoutError:
+                logger.warning("%s shutdown hook timed out", name)
+            except Exception as e:
+                logger.error("%s shutdown hook failed: %r", name, e)
+
+        if not self.bot.is_closed():
+            await self.bot.close()
+
+        logger.info(
+            "shutdown complete in %.1fs (%d interaction(s) turned away)",
+            time.perf_counter() - t0,
+            self.rejected,
+            extra={"flavor": flavor},
+        )
+
+
+# Every coordinator in this process; one SIGTERM stops them all (run_two_bots)
+_active: list[ShutdownCoordinator] = []
+
+
+def _on_signal(signame: str) -> None:
+    logger.info("received %s", signame)
+    for coordinator in list(_active):
+        asyncio.get_running_loop().create_task(coordinator.shutdown(signame))
+
+
+def register(coordinator: ShutdownCoordinator) -> None:
+    """Track coordinator and make sure SIGTERM/SIGINT trigger shutdown."""
+    _active.append(coordinator)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, _on_signal, sig.name)
+        except (NotImplementedError, RuntimeError):
+            # Windows / not the main thread: fall back to KeyboardInterrupt
+            pass
+
+
+def unregister(coordinator: ShutdownCoordinator) -> None:
+    if coordinator in _active:
+        _active.remove(coordinator)
@@ -0,0 +1,3 @@
+from .policy import CachePolicy, ensure_members, policy_for_flavor
+
+__all__ = ["CachePolicy", "ensure_members", "policy_for_flavor"]
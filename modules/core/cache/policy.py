@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+from typing import Any
+
+import discord
+
+MEMBER_CACHE_KINDS = ("interaction", "voice", "joined")
+CHUNKING_MODES = ("startup", "lazy", "off")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How much of Discord's state a bot flavor keeps in memory.
+
+    member_cache: comma-separated MemberCacheFlags to enable ("interaction",
+        "voice", "joined"), "none", or "all" (everything the intents allow).
+    chunking: "startup" chunks every guild on connect (members intent
+        required); "lazy" chunks a guild the first time a command needs its
+        full member list (see ensure_members); "off" never chunks.
+    max_messages: size of the message cache; 0 disables it.
+    members_intent: request the privileged members intent. Must also be
+        enabled for the application in the developer portal.
+    """
+
+    member_cache: str = "all"
+    chunking: str = "lazy"
+    max_messages: int = 1000
+    members_intent: bool = False
+
+    def __post_init__(self) -> None:
+        if self.chunking not in CHUNKING_MODES:
+            raise ValueError(
+                f"chunking must be one of {CHUNKING_MODES}, got {self.chunking!r}"
+            )
+        if self.chunking == "startup" and not self.members_intent:
+            raise ValueError("chunking='startup' requires members_intent")
+        if "joined" in self._member_kinds() and not self.members_intent:
+            raise ValueError("member_cache 'joined' requires members_intent")
+
+    def _member_kinds(self) -> set[str]:
+        value = self.member_cache.strip().lower()
+        if value in ("all", "none"):
+            return set()
+        kinds = {k.strip() for k in value.split(",") if k.strip()}
+        unknown = kinds - set(MEMBER_CACHE_KINDS)
+        if unknown:
+            raise ValueError(f"unknown member_cache kind(s): {sorted(unknown)}")
+        return kinds
+
+    def member_cache_flags(self, intents: discord.Intents) -> discord.MemberCacheFlags:
+        value = self.member_cache.strip().lower()
+        if value == "all":
+            return discord.MemberCacheFlags.from_intents(intents)
+        flags = discord.MemberCacheFlags.none()
+        for kind in self._member_kinds():
+            setattr(flags, kind, True)
+        return flags
+
+    def bot_options(self, intents: discord.Intents) -> dict[str, Any]:
+        """
+        Apply the policy to intents (members) and return the matching
+        discord.Bot keyword arguments.
+        """
+        intents.members = self.members_intent
+        return {
+            "member_cache_flags": self.member_cache_flags(intents),
+            "chunk_guilds_at_startup": self.chunking == "startup",
+            # py-cord treats <= 0 as "use the default"; None disables the cache
+            "max_messages": self.max_messages if self.max_messages > 0 else None,
+        }
+
+
+# Public serves many guilds and only needs members it sees in interactions;
+# dev is small enough to cache everything the intents allow.
+DEFAULT_POLICIES = {
+    "public": CachePolicy(member_cache="interaction", max_messages=100),
+    "dev": CachePolicy(member_cache="all", max_messages=1000),
+}
+
+
+def policy_for_flavor(flavor: str) -> CachePolicy:
+    """
+    Default policy for the flavor, overridden per field by
+    <FLAVOR>_MEMBER_CACHE, <FLAVOR>_CHUNKING, <FLAVOR>_MAX_MESSAGES and
+    <FLAVOR>_MEMBERS_INTENT (e.g. PUBLIC_MAX_MESSAGES=0).
+    """
+    base = DEFAULT_POLICIES.get(flavor, CachePolicy())
+    prefix = flavor.upper()
+
+    overrides: dict[str, Any] = {}
+    if (v := os.getenv(f"{prefix}_MEMBER_CACHE")) is not None:
+        overrides["member_cache"] = v
+    if (v := os.getenv(f"{prefix}_CHUNKING")) is not None:
+        overrides["chunking"] = v.strip().lower()
+    if (v := os.getenv(f"{prefix}_MAX_MESSAGES")) is not None:
+        overrides["max_messages"] = int(v)
+    if (v := os.getenv(f"{prefix}_MEMBERS_INTENT")) is not None:
+        overrides["members_intent"] = v.strip().lower() in ("1", "true", "yes")
+    return replace(base, **overrides)
+
+
+async def ensure_members(bot: discord.Bot, guild: discord.Guild) -> bool:
+    """
+    Make guild.members complete if the bot's policy allows it, chunking on
+    first use under the "lazy" policy. Returns whether the member list is
+    complete (False means callers are looking at a partial cache).
+    """
+    if guild.chunked:
+        return True
+    policy: CachePolicy | None = getattr(bot, "cache_policy", None)
+    if policy is None or policy.chunking != "lazy" or not bot.intents.members:
+        return False
+    await guild.chunk(cache=True)
+    return guild.chunked
@@ -0,0 +1,7 @@
+from discord.ext import commands
+
+from .cog import DiagnosticsCog
+
+
+def setup(bot: commands.Bot):
+    bot.add_cog(DiagnosticsCog(bot))
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import discord
+from discord.ext import commands
+
+from modules.core.guilds.lifecycle import (
+    GuildEvent,
+    GuildJoined,
+    GuildLeft,
+    GuildLifecycle,
+    GuildsReady,
+)
+from utils.metrics import REGISTRY, MetricsServer
+
+from .loop_monitor import LoopMonitor
+from .memory import build_memory_report, format_memory_report
+
+logger = logging.getLogger("guildpilot.diagnostics")
+command_logger = logging.getLogger("guildpilot.commands")
+
+COMMAND_SECONDS = REGISTRY.histogram(
+    "guildpilot_command_seconds",
+    "Slash command latency from invocation to completion.",
+    ["command", "outcome"],
+)
+GATEWAY_EVENTS = REGISTRY.counter(
+    "guildpilot_gateway_events",
+    "Gateway connection lifecycle events (connect/disconnect/resumed).",
+    ["event"],
+)
+GUILDS = REGISTRY.gauge("guildpilot_guilds", "Guilds this process is connected to.")
+
+# One metrics endpoint per process, even with several bots (run_two_bots)
+_metrics_server: MetricsServer | None = None
+
+
+class DiagnosticsCog(commands.Cog):
+    """Admin-only runtime diagnostics for the bot process."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.loop_monitor = LoopMonitor.from_env()
+        bot.loop_monitor = self.loop_monitor
+        self._command_started: dict[int, float] = {}
+
+        self.lifecycle = GuildLifecycle.for_bot(bot)
+        for event in (GuildsReady, GuildJoined, GuildLeft):
+            self.lifecycle.subscribe(event, self._count_guilds)
+
+    def cog_unload(self) -> None:
+        self.lifecycle.unsubscribe(self)
+        self.bot.loop.create_task(self.loop_monitor.stop())
+
+    async def graceful_shutdown(self) -> None:
+        global _metrics_server
+        await self.loop_monitor.stop()
+        if _metrics_server is not None:
+            server, _metrics_server = _metrics_server, None
+            await server.stop()
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # on_ready fires again after reconnects; start() is idempotent
+        self.loop_monitor.start()
+        await self._start_metrics_server()
+
+    async def _count_guilds(self, event: GuildEvent) -> None:
+        GUILDS.set(len(self.bot.guilds))
+
+    async def _start_metrics_server(self) -> None:
+        global _metrics_server
+        if _metrics_server is not None:
+            return
+        # Shard workers each get their own port: METRICS_PORT + first shard id
+        shard_ids = getattr(self.bot, "shard_ids", None) or [0]
+        server = MetricsServer.from_env(port_offset=min(shard_ids))
+        if server is None:
+            return
+        _metrics_server = server
+        try:
+            await server.start()
+        except OSError as e:
+            logger.warning("metrics endpoint disabled (port %d): %r", server.port, e)
+
+    # ---------------- Metrics ----------------
+    @commands.Cog.listener()
+    async def on_application_command(self, ctx: discord.ApplicationContext) -> None:
+        self._command_started[ctx.interaction.id] = time.perf_counter()
+
+    def _observe_command(self, ctx: discord.ApplicationContext, outcome: str) -> None:
+        t0 = self._command_started.pop(ctx.interaction.id, None)
+        if t0 is None:
+            return
+        elapsed = time.perf_counter() - t0
+        command = ctx.command.qualified_name if ctx.command else "?"
+        COMMAND_SECONDS.observe(elapsed, command=command, outcome=outcome)
+        # One line per command; sample with LOG_SAMPLE=guildpilot.commands=0.1
+        command_logger.info(
+            "command %s",
+            outcome,
+            extra={
+                "command": command,
+                "guild_id": ctx.guild_id,
+                "user_id": ctx.author.id if ctx.author else None,
+                "latency_ms": round(elapsed * 1000, 1),
+                "outcome": outcome,
+            },
+        )
+
+    @commands.Cog.listener()
+    async def on_application_command_completion(
+        self, ctx: discord.ApplicationContext
+    ) -> None:
+        self._observe_command(ctx, "ok")
+
+    @commands.Cog.listener()
+    async def on_application_command_error(
+        self, ctx: discord.ApplicationContext, error: Exception
+    ) -> None:
+        self._observe_command(ctx, "error")
+
+    @commands.Cog.listener()
+    async def on_connect(self) -> None:
+        GATEWAY_EVENTS.inc(event="connect")
+
+    @commands.Cog.listener()
+    async def on_disconnect(self) -> None:
+        GATEWAY_EVENTS.inc(event="disconnect")
+
+    @commands.Cog.listener()
+    async def on_resumed(self) -> None:
+        GATEWAY_EVENTS.inc(event="resumed")
+
+    async def _admin_only(self, ctx: discord.ApplicationContext, what: str) -> bool:
+        if not ctx.guild or not isinstance(ctx.author, discord.Member):
+            await ctx.respond("Run this in a server.", ephemeral=True)
+            return False
+        if not ctx.author.guild_permissions.administrator:
+            await ctx.respond(f"You need Administrator to view {what}.", ephemeral=True)
+            return False
+        return True
+
+    @commands.slash_command(
+        name="memory_report",
+        description="Show process memory by guild/member/message cache (admin only).",
+    )
+    async def memory_report(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._admin_only(ctx, "the memory report"):
+            return
+
+        report = build_memory_report(self.bot)
+        await ctx.respond(format_memory_report(report), ephemeral=True)
+
+    @commands.slash_command(
+        name="loop_stats",
+        description="Show event-loop lag and recent slow callbacks (admin only).",
+    )
+    async def loop_stats(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._admin_only(ctx, "loop stats"):
+            return
+
+        mon = self.loop_monitor
+        lag = mon.lag_percentiles()
+        lines = [
+            f"**Event-loop lag** (last {lag['samples']} samples): "
+            f"p50 {lag['p50']:.1f}ms | p95 {lag['p95']:.1f}ms | "
+            f"p99 {lag['p99']:.1f}ms | max {lag['max']:.1f}ms",
+            f"**Slow callbacks** (> {mon.slow_threshold * 1000:.0f}ms):",
+        ]
+        recent = list(mon.slow_callbacks)[-5:]
+        lines += [f"- {s.summary()}" for s in reversed(recent)] or ["- none"]
+        await ctx.respond("\n".join(lines), ephemeral=True)
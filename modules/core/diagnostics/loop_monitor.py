@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger("guildpilot.loop")
+
+# loop_monitor.py -> diagnostics -> core -> modules -> PROJECT
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_OWN_FILE = str(Path(__file__).resolve())
+
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "guildpilot_loop_lag_seconds",
+    "How late the event loop woke a sleeping ticker task.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+LOOP_STALLS = REGISTRY.counter(
+    "guildpilot_loop_stalls",
+    "Times a callback blocked the event loop past the slow threshold.",
+)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+@dataclass
+class SlowCallback:
+    """One stall of the event loop, as seen by the watchdog thread."""
+
+    detected_at: float
+    task: str
+    location: str
+    stack: str
+    blocked_for: float | None = None  # filled in once the loop resumes
+
+    def summary(self) -> str:
+        took = f"{self.blocked_for * 1000:.0f}ms" if self.blocked_for else "ongoing"
+        return f"{took} in {self.task} at {self.location}"
+
+
+def _project_location(frames: traceback.StackSummary) -> str:
+    """Innermost frame in our own code (a cog, listener or util), if any."""
+    root = str(PROJECT_ROOT)
+    for fs in reversed(frames):
+        if fs.filename.startswith(root) and fs.filename != _OWN_FILE:
+            rel = os.path.relpath(fs.filename, root)
+            return f"{rel}:{fs.lineno} in {fs.name}"
+    if frames:
+        fs = frames[-1]
+        return f"{fs.filename}:{fs.lineno} in {fs.name}"
+    return "unknown"
+
+
+def _describe_task(loop: asyncio.AbstractEventLoop) -> str:
+    # py-cord names event tasks "pycord: on_<event>", which tells us which
+    # listener (or on_interaction -> command) was running.
+    try:
+        task = asyncio.current_task(loop)
+    except RuntimeError:
+        task = None
+    if task is None:
+        return "<callback outside a task>"
+    coro = task.get_coro()
+    qualname = getattr(coro, "__qualname__", type(coro).__name__)
+    return f"{task.get_name()} ({qualname})"
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and catches callbacks that block the loop.
+
+    - A ticker task sleeps `interval` seconds and records how late it woke
+      up; lag_percentiles() summarises the last `window` samples.
+    - A watchdog thread notices when the ticker hasn't run for longer than
+      interval + slow_threshold, samples the loop thread's stack, and logs
+      which task and which line of our code was running.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.5,
+        slow_threshold: float = 0.25,
+        window: int = 600,
+        keep_slow: int = 20,
+        stack_limit: int = 25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.stack_limit = stack_limit
+        self._clock = clock
+
+        self._lags: deque[float] = deque(maxlen=window)
+        self.slow_callbacks: deque[SlowCallback] = deque(maxlen=keep_slow)
+        self._current_stall: SlowCallback | None = None
+        self._last_beat = clock()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_env(cls) -> LoopMonitor:
+        return cls(
+            interval=float(os.getenv("LOOP_MONITOR_INTERVAL", "0.5")),
+            slow_threshold=float(os.getenv("LOOP_SLOW_CALLBACK_MS", "250")) / 1000,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start ticker + watchdog; must be called from the loop's thread."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = self._clock()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._tick(), name="loop-monitor")
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 1.0)
+
+    async def _tick(self) -> None:
+        while True:
+            t0 = self._clock()
+            self._last_beat = t0
+            await asyncio.sleep(self.interval)
+            now = self._clock()
+            lag = max(0.0, now - t0 - self.interval)
+            self._last_beat = now
+            self._lags.append(lag)
+            LOOP_LAG_SECONDS.observe(lag)
+
+            stall = self._current_stall
+            if stall is not None:
+                self._current_stall = None
+                stall.blocked_for = lag
+                logger.warning("event loop resumed after %s", stall.summary())
+
+    def _watch(self) -> None:
+        check_every = max(0.01, self.slow_threshold / 2)
+        while not self._stop.wait(check_every):
+            self.check()
+
+    def check(self) -> SlowCallback | None:
+        """
+        Watchdog step (runs off the loop thread): if the loop has been stuck
+        past the threshold, sample its stack once per stall.
+        """
+        late = self._clock() - self._last_beat - self.interval
+        if late < self.slow_threshold or self._current_stall is not None:
+            return None
+        if self._loop is None or self._loop_thread_id is None:
+            return None
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        frames = traceback.extract_stack(frame, limit=self.stack_limit)
+        stall = SlowCallback(
+            detected_at=time.time(),
+            task=_describe_task(self._loop),
+            location=_project_location(frames),
+            stack="".join(frames.format()),
+        )
+        self._current_stall = stall
+        self.slow_callbacks.append(stall)
+        LOOP_STALLS.inc()
+        logger.warning(
+            "event loop blocked > %.0fms in %s at %s\n%s",
+            self.slow_threshold * 1000,
+            stall.task,
+            stall.location,
+            stall.stack,
+        )
+        return stall
+
+    def lag_percentiles(self) -> dict[str, float]:
+        """Lag over the recent window, in milliseconds."""
+        values = sorted(self._lags)
+        return {
+            "samples": len(values),
+            "p50": percentile(values, 50) * 1000,
+            "p95": percentile(values, 95) * 1000,
+            "p99": percentile(values, 99) * 1000,
+            "max": (values[-1] if values else 0.0) * 1000,
+        }
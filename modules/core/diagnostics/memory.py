@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from types import FunctionType, MethodType, ModuleType
+from typing import Any
+
+import discord
+from discord.state import ConnectionState
+
+# Objects owned by another cache bucket (or shared bot state). deep_sizeof
+# stops at these so e.g. a message's author isn't billed to the message cache.
+_OWNED_ELSEWHERE: tuple[type, ...] = (
+    discord.Guild,
+    discord.Member,
+    discord.User,
+    discord.ClientUser,
+    discord.Role,
+    discord.Emoji,
+    discord.Message,
+    discord.abc.GuildChannel,
+    discord.Thread,
+    discord.Client,
+    ConnectionState,
+    type,
+    ModuleType,
+    FunctionType,
+    MethodType,
+)
+
+
+def process_rss_mb() -> float:
+    """Current resident set size of this process in MB (0.0 if unknown)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # Peak rather than current, but better than nothing off Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except (ImportError, OSError):
+        return 0.0
+
+
+def _children(obj: Any) -> Iterable[Any]:
+    if isinstance(obj, dict):
+        yield from obj.keys()
+        yield from obj.values()
+        return
+    if isinstance(obj, list | tuple | set | frozenset):
+        yield from obj
+        return
+    if hasattr(obj, "__dict__"):
+        yield from vars(obj).values()
+    for klass in type(obj).__mro__:
+        for slot in getattr(klass, "__slots__", ()):
+            if slot in ("__dict__", "__weakref__"):
+                continue
+            try:
+                yield getattr(obj, slot)
+            except AttributeError:
+                continue
+
+
+def deep_sizeof(obj: Any, *, stop: tuple[type, ...] = _OWNED_ELSEWHERE) -> int:
+    """
+    Approximate bytes held by obj: sys.getsizeof over everything reachable
+    through containers, __dict__ and __slots__, not descending into
+    instances of `stop` (other than obj itself) and counting each object
+    once.
+    """
+    seen: set[int] = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if id(cur) in seen:
+            continue
+        if cur is not obj and isinstance(cur, stop):
+            continue
+        seen.add(id(cur))
+        try:
+            total += sys.getsizeof(cur)
+        except TypeError:
+            continue
+        stack.extend(_children(cur))
+    return total
+
+
+def _estimate(objs: Iterable[Any], count: int, sample: int) -> int:
+    """Average deep size over up to `sample` objects, scaled to `count`."""
+    picked = list(itertools.islice(objs, sample))
+    if not picked:
+        return 0
+    avg = sum(deep_sizeof(o) for o in picked) / len(picked)
+    return int(avg * count)
+
+
+@dataclass
+class CacheBucket:
+    name: str
+    count: int
+    bytes: int
+
+    @property
+    def mb(self) -> float:
+        return self.bytes / (1024 * 1024)
+
+
+@dataclass
+class MemoryReport:
+    rss_mb: float
+    buckets: list[CacheBucket] = field(default_factory=list)
+    policy: Any = None
+
+    @property
+    def other_mb(self) -> float:
+        """RSS not explained by the caches (interpreter, libraries, cogs)."""
+        return max(0.0, self.rss_mb - sum(b.mb for b in self.buckets))
+
+
+def build_memory_report(bot: discord.Client, *, sample: int = 50) -> MemoryReport:
+    """
+    Break process RSS down into py-cord's guild, member and message caches.
+
+    Sizes are estimates: a sample of each kind of object is measured with
+    deep_sizeof and scaled by the cache's object count. Whatever the caches
+    don't explain is reported as "other".
+    """
+    guilds = list(bot.guilds)
+    members = itertools.chain.from_iterable(g.members for g in guilds)
+    member_count = sum(len(g.members) for g in guilds)
+    users = list(bot.users)
+    messages = list(bot.cached_messages)
+
+    buckets = [
+        CacheBucket("guilds", len(guilds), _estimate(guilds, len(guilds), sample)),
+        CacheBucket("members", member_count, _estimate(members, member_count, sample)),
+        CacheBucket("users", len(users), _estimate(users, len(users), sample)),
+        CacheBucket(
+            "messages", len(messages), _estimate(messages, len(messages), sample)
+        ),
+    ]
+    return MemoryReport(
+        rss_mb=process_rss_mb(),
+        buckets=buckets,
+        policy=getattr(bot, "cache_policy", None),
+    )
+
+
+def format_memory_report(report: MemoryReport) -> str:
+    lines = [f"**Process RSS:** {report.rss_mb:.1f} MB"]
+    for b in report.buckets:
+        lines.append(f"- {b.name}: {b.count:,} cached ≈ {b.mb:.2f} MB")
+    lines.append(f"- other (interpreter, libraries, cogs): {report.other_mb:.1f} MB")
+    if report.policy is not None:
+        p = report.policy
+        lines.append(
+            f"**Policy:** member cache `{p.member_cache}` | chunking `{p.chunking}` "
+            f"| max messages `{p.max_messages}` | members intent "
+            f"`{'on' if p.members_intent else 'off'}`"
+        )
+    return "\n".join(lines)
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import logging
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from pathlib import Path
 
 import discord
 from discord.ext import commands
 
+from modules.core.guilds.lifecycle import (
+    GuildJoined,
+    GuildLeft,
+    GuildLifecycle,
+    GuildsReady,
+)
+from modules.core.guilds.registry import GuildRegistry
+from utils.guild_sync import (
+    command_fingerprint,
+    record_guild_sync,
+    sync_state_path_for,
+)
+
+logger = logging.getLogger("guildpilot.guilds")
+
 # guild_tracker.py -> guilds -> core -> modules -> PROJECT
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
@@ -28,22 +42,31 @@ class GuildInfo:
 
 class GuildTracker(commands.Cog):
     """
-    Tracks guilds the bot is in and stores them in a registry JSON file.
+    Logs guild joins/leaves and owns the /sync and /deploy_status commands.
 
     Behavior:
       - If bot.guild_registry_path is set (a pathlib.Path), we use that file.
       - Otherwise, we fall back based on bot.flavor ("dev" vs "public").
       - If neither is present, we default to dev registry.
+      - Guild state itself belongs to GuildLifecycle (lifecycle.py), which
+        keeps the registry in the sqlite GuildStore; the JSON file above is
+        migrated into it once and its sync state file still lives next to it.
     """
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._task: asyncio.Task | None = None
-        self.reconcile_every_seconds = 300  # 5 minutes
-
-        # Pick registry file
         self.guild_log_path: Path = self._resolve_registry_path()
 
+        self.lifecycle = GuildLifecycle.for_bot(bot)
+        self.lifecycle.migrate(self.guild_log_path)
+        self.lifecycle.subscribe(GuildsReady, self._on_guilds_ready)
+        self.lifecycle.subscribe(GuildJoined, self._on_guild_joined)
+        self.lifecycle.subscribe(GuildLeft, self._on_guild_left)
+
+    @property
+    def registry(self) -> GuildRegistry:
+        return self.lifecycle.registry
+
     def _resolve_registry_path(self) -> Path:
         # 1) Explicit override: set by build_bot()
         p = getattr(self.bot, "guild_registry_path", None)
@@ -56,104 +79,38 @@ class GuildTracker(commands.Cog):
             return DEFAULT_PUBLIC_REGISTRY
         return DEFAULT_DEV_REGISTRY
 
-    def _utc_now(self) -> str:
-        return datetime.now(UTC).isoformat()
-
-    def _load(self) -> dict:
-        self.guild_log_path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.guild_log_path.exists():
-            return {"servers": []}
-
-        try:
-            with self.guild_log_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            if not isinstance(data, dict) or "servers" not in data:
-                return {"servers": []}
-            if not isinstance(data["servers"], list):
-                return {"servers": []}
-            return data
-
-        except Exception:
-            return {"servers": []}
-
-    def _save(self, data: dict) -> None:
-        self.guild_log_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.guild_log_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-
-    def _upsert_guilds(self, guilds: list[discord.Guild]) -> None:
-        data = self._load()
-        by_id = {
-            str(s.get("id")): s
-            for s in data["servers"]
-            if isinstance(s, dict) and "id" in s
-        }
-
-        now = self._utc_now()
-        for g in guilds:
-            gid = str(g.id)
-            existing = by_id.get(gid)
-
-            if existing:
-                existing["name"] = g.name
-                existing["last_seen_utc"] = now
-                # If it was previously marked left, clear it (optional)
-                if "left_at_utc" in existing:
-                    existing.pop("left_at_utc", None)
-            else:
-                by_id[gid] = {
-                    "id": g.id,
-                    "name": g.name,
-                    "joined_at_utc": now,
-                    "last_seen_utc": now,
-                }
-
-        # Mark guilds we no longer see as "left"
-        current_ids = {str(g.id) for g in guilds}
-        for gid, rec in by_id.items():
-            if gid not in current_ids:
-                rec["left_at_utc"] = rec.get("left_at_utc") or now
-
-        data["servers"] = list(by_id.values())
-        self._save(data)
-
-    async def _reconcile_loop(self) -> None:
-        await self.bot.wait_until_ready()
-        while not self.bot.is_closed():
-            try:
-                self._upsert_guilds(list(self.bot.guilds))
-            except Exception as e:
-                print(f"[guildtracker] reconcile error: {e!r}")
-            await asyncio.sleep(self.reconcile_every_seconds)
-
-    def cog_load(self) -> None:
-        if self._task is None:
-            self._task = self.bot.loop.create_task(self._reconcile_loop())
-
     def cog_unload(self) -> None:
-        if self._task:
-            self._task.cancel()
-
-    @commands.Cog.listener()
-    async def on_ready(self) -> None:
-        self._upsert_guilds(list(self.bot.guilds))
-        flavor = getattr(self.bot, "flavor", "?")
-        print(
-            f"[guildtracker:{flavor}] snapshot saved ({len(self.bot.guilds)} guilds) -> {self.guild_log_path}"
+        self.lifecycle.unsubscribe(self)
+
+    async def _on_guilds_ready(self, event: GuildsReady) -> None:
+        logger.info(
+            "registry reconciled (%d guilds, %d joined, %d left while offline) -> %s",
+            len(event.guilds),
+            len(event.joined),
+            len(event.left),
+            self.registry.store.path,
+            extra={"flavor": self.registry.flavor},
         )
 
-    @commands.Cog.listener()
-    async def on_guild_join(self, guild: discord.Guild) -> None:
-        self._upsert_guilds(list(self.bot.guilds))
-        flavor = getattr(self.bot, "flavor", "?")
-        print(f"[guildtracker:{flavor}] joined: {guild.name} ({guild.id})")
+    async def _on_guild_joined(self, event: GuildJoined) -> None:
+        logger.info(
+            "rejoined guild" if event.rejoined else "joined guild",
+            extra={
+                "flavor": getattr(self.bot, "flavor", "?"),
+                "guild": event.guild.name,
+                "guild_id": event.guild.id,
+            },
+        )
 
-    @commands.Cog.listener()
-    async def on_guild_remove(self, guild: discord.Guild) -> None:
-        self._upsert_guilds(list(self.bot.guilds))
-        flavor = getattr(self.bot, "flavor", "?")
-        print(f"[guildtracker:{flavor}] removed: {guild.name} ({guild.id})")
+    async def _on_guild_left(self, event: GuildLeft) -> None:
+        logger.info(
+            "removed from guild",
+            extra={
+                "flavor": getattr(self.bot, "flavor", "?"),
+                "guild": event.name,
+                "guild_id": event.guild_id,
+            },
+        )
 
     # ---------------- Manual resync ----------------
     @commands.slash_command(
@@ -171,7 +128,12 @@ class GuildTracker(commands.Cog):
 
         await ctx.defer(ephemeral=True)
 
-        flavor = getattr(self.bot, "flavor", "?")
+        fields = {
+            "flavor": getattr(self.bot, "flavor", "?"),
+            "command": "sync",
+            "guild_id": ctx.guild.id,
+            "user": str(ctx.author),
+        }
         try:
             synced = await self.bot.sync_commands(guild_ids=[ctx.guild.id])
             count = (
@@ -179,22 +141,60 @@ class GuildTracker(commands.Cog):
                 if synced is not None
                 else len(list(self.bot.walk_application_commands()))
             )
-            print(
-                f"[guildtracker:{flavor}] manual sync by {ctx.author} "
-                f"in {ctx.guild.name} ({ctx.guild.id}) — {count} command(s)"
-            )
+            logger.info("manual sync: %d command(s)", count, extra=fields)
+            # Let the next startup skip this guild if commands are unchanged
+            try:
+                # Reads and rewrites the sync-state file: off the loop
+                await asyncio.to_thread(
+                    record_guild_sync,
+                    sync_state_path_for(self.guild_log_path),
+                    [ctx.guild.id],
+                    command_fingerprint(self.bot),
+                )
+            except Exception as e:
+                logger.warning("could not record sync state: %r", e, extra=fields)
             await ctx.respond(
                 f"✅ Synced {count} slash command(s) for **{ctx.guild.name}**.",
                 ephemeral=True,
             )
         except Exception as e:
-            print(
-                f"[guildtracker:{flavor}] manual sync failed: {type(e).__name__}: {e}"
+            logger.error(
+                "manual sync failed: %s: %s", type(e).__name__, e, extra=fields
             )
             await ctx.respond(
                 f"❌ Sync failed: {type(e).__name__}: {e}", ephemeral=True
             )
 
+    @commands.slash_command(
+        name="deploy_status",
+        description="Show progress of the startup command deployment (admin only).",
+    )
+    async def deploy_status(self, ctx: discord.ApplicationContext) -> None:
+        if not ctx.guild or not isinstance(ctx.author, discord.Member):
+            return await ctx.respond("Run this in a server.", ephemeral=True)
+
+        if not ctx.author.guild_permissions.administrator:
+            return await ctx.respond(
+                "You need Administrator to view deployment status.", ephemeral=True
+            )
+
+        job = getattr(self.bot, "deploy_job", None)
+        if job is None:
+            return await ctx.respond("No deployment job on this bot.", ephemeral=True)
+
+        st = job.status()
+        msg = (
+            f"**Deployment:** {st['state']}\n"
+            f"- Progress: {st['completed']}/{st['total']} guild(s)\n"
+            f"- OK: {st['ok']} | Unchanged: {st['unchanged']} | "
+            f"Errors: {st['errors']} | Skipped: {st['skipped']}\n"
+            f"- Started: {st['started_at_utc'] or '—'}\n"
+            f"- Finished: {st['finished_at_utc'] or '—'}"
+        )
+        if st["error"]:
+            msg += f"\n- Error: {st['error']}"
+        await ctx.respond(msg, ephemeral=True)
+
 
 def setup(bot: commands.Bot) -> None:
     bot.add_cog(GuildTracker(bot))
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+import discord
+from discord.ext import commands
+
+from modules.core.guilds.registry import GuildRegistry
+from modules.core.guilds.store import DEFAULT_STORE_PATH, GuildStore
+
+logger = logging.getLogger("guildpilot.guilds")
+
+
+# ---------------- Events ----------------
+@dataclass(frozen=True)
+class GuildsReady:
+    """The gateway is ready and the registry has been reconciled with it."""
+
+    guilds: tuple[discord.Guild, ...]
+    first: bool  # False for the on_ready that follows a reconnect
+    # Changes found by the reconcile (joins/leaves missed while offline)
+    joined: tuple[discord.Guild, ...] = ()
+    left: tuple[int, ...] = ()
+
+
+@dataclass(frozen=True)
+class GuildJoined:
+    guild: discord.Guild
+    rejoined: bool  # the registry had it marked as left
+    record: dict = field(compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class GuildLeft:
+    guild_id: int
+    name: str
+    guild: discord.Guild | None = None  # None when found by a reconcile
+
+
+GuildEvent = GuildsReady | GuildJoined | GuildLeft
+E = TypeVar("E", GuildsReady, GuildJoined, GuildLeft)
+
+
+class GuildLifecycle(commands.Cog):
+    """
+    Owns guild state and turns gateway guild events into typed events.
+
+    - Each on_ready / on_guild_join / on_guild_remove is handled here once:
+      the GuildRegistry is updated (one debounced write), then GuildsReady /
+      GuildJoined / GuildLeft is published to every subscriber.
+    - Cogs subscribe in __init__ with
+      GuildLifecycle.for_bot(bot).subscribe(GuildJoined, self._on_joined)
+      and unsubscribe(self) in cog_unload.
+    - Subscribers run in subscription order; one failing is logged and
+      doesn't affect the others. Keep them short (spawn tasks for slow work).
+    - A reconcile every `reconcile_every_seconds` catches missed events and
+      publishes what it found as GuildJoined / GuildLeft.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._task: asyncio.Task | None = None
+        self._ready_count = 0
+        self._shared_lists: list[Path] = []  # migrated at the first on_ready
+        self.reconcile_every_seconds = 300  # 5 minutes
+        self._subscribers: dict[type, list[Callable[[Any], Awaitable[None]]]] = (
+            defaultdict(list)
+        )
+
+        store = getattr(bot, "guild_store", None) or GuildStore(DEFAULT_STORE_PATH)
+        flavor = getattr(bot, "registry_flavor", None) or getattr(bot, "flavor", "dev")
+        self.registry = GuildRegistry(store, flavor)
+
+    @classmethod
+    def for_bot(cls, bot: commands.Bot) -> GuildLifecycle:
+        """The bot's lifecycle service, created (and added as a cog) on first use."""
+        service = getattr(bot, "guild_lifecycle", None)
+        if service is None:
+            service = cls(bot)
+            bot.guild_lifecycle = service
+            # AutoShardedBot isn't a discord.Bot; both are BotBases
+            if isinstance(bot, discord.bot.BotBase):
+                bot.add_cog(service)
+                # py-cord 2.6 has no cog_load hook
+                service.cog_load()
+        return service
+
+    # ---------------- Subscriptions ----------------
+    def subscribe(
+        self, event: type[E], handler: Callable[[E], Awaitable[None]]
+    ) -> None:
+        if handler not in self._subscribers[event]:
+            self._subscribers[event].append(handler)
+
+    def unsubscribe(self, owner: object) -> None:
+        """Drop every handler bound to owner (a cog being unloaded)."""
+        for handlers in self._subscribers.values():
+            handlers[:] = [
+                h for h in handlers if getattr(h, "__self__", None) is not owner
+            ]
+
+    async def publish(self, event: GuildEvent) -> None:
+        for handler in list(self._subscribers.get(type(event), ())):
+            try:
+                await handler(event)
+            except Exception as e:
+                logger.error(
+                    "%s subscriber %s failed: %r",
+                    type(event).__name__,
+                    getattr(handler, "__qualname__", handler),
+                    e,
+                    extra={"flavor": self.registry.flavor},
+                )
+
+    def migrate(self, path: Path | str, *, shared: bool = False) -> int:
+        """
+        Import another legacy JSON guild list into this registry (once).
+
+        shared=True is for a list several bots (dev, public, every shard)
+        appended to: only the guilds this bot is in are imported, so it
+        waits for the first on_ready to know which those are.
+        """
+        if shared:
+            self._shared_lists.append(Path(path))
+            return 0
+        imported = self.registry.store.migrate_json(self.registry.flavor, path)
+        if imported:
+            self.registry.merge_from_store()
+        return imported
+
+    async def _migrate_shared(self, guilds: tuple[discord.Guild, ...]) -> None:
+        present = {g.id for g in guilds}
+        paths, self._shared_lists = self._shared_lists, []
+        imported = 0
+        for path in paths:
+            imported += await asyncio.to_thread(
+                self.registry.store.migrate_json,
+                self.registry.flavor,
+                path,
+                only_ids=present,
+            )
+        if imported:
+            self.registry.merge_from_store()
+
+    # ---------------- Reconcile ----------------
+    def _reconcile_registry(
+        self,
+    ) -> tuple[tuple[discord.Guild, ...], list[GuildJoined], list[GuildLeft]]:
+        """Reconcile the registry with bot.guilds; returns what changed."""
+        guilds = tuple(self.bot.guilds)
+        diff = self.registry.diff(guilds)
+        joined = [
+            GuildJoined(
+                g, rejoined=g.id in diff.rejoined, record=dict(self.registry.get(g.id))
+            )
+            for g in diff.joined
+        ]
+        left = [
+            GuildLeft(gid, str(self.registry.get(gid).get("name") or ""))
+            for gid in sorted(diff.left)
+        ]
+        return guilds, joined, left
+
+    async def reconcile(self) -> tuple[list[GuildJoined], list[GuildLeft]]:
+        """
+        Diff the registry against bot.guilds and publish the difference as
+        GuildJoined / GuildLeft. Returns the published events.
+        """
+        _, joined, left = self._reconcile_registry()
+        for event in [*joined, *left]:
+            await self.publish(event)
+        return joined, left
+
+    async def _reconcile_loop(self) -> None:
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(self.reconcile_every_seconds)
+            try:
+                # Writes only if something actually changed
+                await self.reconcile()
+            except Exception as e:
+                logger.error("reconcile error: %r", e)
+
+    def cog_load(self) -> None:
+        if self._task is None:
+            self._task = self.bot.loop.create_task(self._reconcile_loop())
+
+    def cog_unload(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+    async def graceful_shutdown(self) -> None:
+        """Write any pending registry changes before the process exits."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.registry.flush()
+
+    # ---------------- Gateway events ----------------
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # on_ready fires again after reconnects
+        self._ready_count += 1
+        if self._shared_lists:
+            await self._migrate_shared(tuple(self.bot.guilds))
+        guilds, joined, left = self._reconcile_registry()
+        await self.publish(
+            GuildsReady(
+                guilds=guilds,
+                first=self._ready_count == 1,
+                joined=tuple(e.guild for e in joined),
+                left=tuple(e.guild_id for e in left),
+            )
+        )
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        rejoined = bool((self.registry.get(guild.id) or {}).get("left_at_utc"))
+        self.registry.seen(guild)
+        record = dict(self.registry.get(guild.id) or {})
+        await self.publish(GuildJoined(guild, rejoined=rejoined, record=record))
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.registry.left(guild.id)
+        await self.publish(GuildLeft(guild.id, guild.name, guild))
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+import discord
+
+from modules.core.guilds.store import GuildStore
+
+logger = logging.getLogger("guildpilot.guilds")
+
+
+@dataclass
+class ReconcileDiff:
+    joined: list[discord.Guild] = field(default_factory=list)  # new or rejoined
+    rejoined: set[int] = field(default_factory=set)  # ids that were marked left
+    left: list[int] = field(default_factory=list)
+    changed: int = 0  # records written by the next flush
+
+
+class GuildRegistry:
+    """
+    In-memory view of one flavor's guilds in the GuildStore.
+
+    - Read once at startup; after that memory is the source of truth.
+    - seen()/left() apply one join/leave; reconcile() diffs the full guild
+      list. Neither touches disk: a real change (new guild, rename, left or
+      rejoined) marks that record dirty and schedules a flush after
+      `debounce` seconds, coalescing a burst of events into one write.
+    - last_seen_utc is refreshed in memory only and rides along with the
+      next flush(), so a reconcile that changes nothing does no I/O.
+    - Writes upsert just the dirty rows, in a worker thread, off the loop.
+    - flush() writes anything pending now (call it on shutdown).
+    """
+
+    def __init__(
+        self, store: GuildStore, flavor: str, *, debounce: float = 2.0
+    ) -> None:
+        self.store = store
+        self.flavor = flavor
+        self.debounce = debounce
+
+        self._servers: dict[str, dict] = {
+            str(r["id"]): r for r in store.records(flavor)
+        }
+
+        self._dirty: set[str] = set()  # ids with a change worth a write
+        self._stale = False  # last_seen_utc moved on clean records
+        self._flush_task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+        self.writes = 0
+
+    def __len__(self) -> int:
+        return len(self._servers)
+
+    def __contains__(self, guild_id: int | str) -> bool:
+        return str(guild_id) in self._servers
+
+    def get(self, guild_id: int | str) -> dict | None:
+        return self._servers.get(str(guild_id))
+
+    def active_ids(self) -> list[int]:
+        return sorted(
+            int(gid) for gid, rec in self._servers.items() if not rec.get("left_at_utc")
+        )
+
+    def as_dict(self) -> dict:
+        """The legacy JSON registry shape ({"servers": [...]})."""
+        return {"servers": [dict(r) for r in self._servers.values()]}
+
+    def merge_from_store(self) -> int:
+        """Pick up rows added to the store behind our back (e.g. a migration)."""
+        added = 0
+        for rec in self.store.records(self.flavor):
+            if str(rec["id"]) not in self._servers:
+                self._servers[str(rec["id"])] = rec
+                added += 1
+        return added
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def seen(self, guild: discord.Guild, *, now: str | None = None) -> bool:
+        """Record guild as present. Returns True if that changed the registry."""
+        now = now or datetime.now(UTC).isoformat()
+        gid = str(guild.id)
+        rec = self._servers.get(gid)
+        if rec is None:
+            self._servers[gid] = {
+                "id": guild.id,
+                "name": guild.name,
+                "joined_at_utc": now,
+                "last_seen_utc": now,
+            }
+            changed = True
+        else:
+            changed = rec.get("name") != guild.name or "left_at_utc" in rec
+            rec["name"] = guild.name
+            rec["last_seen_utc"] = now
+            rec.pop("left_at_utc", None)
+            self._stale = True
+        if changed:
+            self._mark_dirty(gid)
+        return changed
+
+    def left(self, guild_id: int | str, *, now: str | None = None) -> bool:
+        """Mark guild as left. Returns True if it wasn't already."""
+        rec = self._servers.get(str(guild_id))
+        if rec is None or rec.get("left_at_utc"):
+            return False
+        rec["left_at_utc"] = now or datetime.now(UTC).isoformat()
+        self._mark_dirty(str(guild_id))
+        return True
+
+    def reconcile(self, guilds: Iterable[discord.Guild]) -> int:
+        """
+        Bring the registry in line with the guilds the bot is in now (on
+        ready and periodically). Returns the number of records that changed.
+        """
+        return self.diff(guilds).changed
+
+    def diff(self, guilds: Iterable[discord.Guild]) -> ReconcileDiff:
+        """reconcile(), also reporting which guilds joined or left (one pass)."""
+        now = datetime.now(UTC).isoformat()
+        out = ReconcileDiff()
+        current: set[str] = set()
+        for g in guilds:
+            gid = str(g.id)
+            current.add(gid)
+            rec = self._servers.get(gid)
+            if rec is None or rec.get("left_at_utc"):
+                out.joined.append(g)
+                if rec is not None:
+                    out.rejoined.add(g.id)
+            out.changed += self.seen(g, now=now)
+        for gid in [gid for gid in self._servers if gid not in current]:
+            if self.left(gid, now=now):
+                out.left.append(int(gid))
+                out.changed += 1
+        return out
+
+    async def flush(self) -> None:
+        # A pending timer is only ever cancelled while sleeping; once it starts
+        # writing it clears _flush_task and we simply queue behind its lock.
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._write(include_stale=True)
+
+    def _mark_dirty(self, gid: str) -> None:
+        self._dirty.add(gid)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop (yet): written by the next flush
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._debounced_flush())
+
+    async def _debounced_flush(self) -> None:
+        await asyncio.sleep(self.debounce)
+        self._flush_task = None
+        await self._write()
+
+    async def _write(self, *, include_stale: bool = False) -> None:
+        async with self._write_lock:
+            stale = include_stale and self._stale
+            if not (self._dirty or stale):
+                return
+            ids = set(self._servers) if stale else self._dirty
+            records = [dict(self._servers[gid]) for gid in ids]
+            dirty = self._dirty
+            self._dirty = set()
+            if stale:
+                self._stale = False
+            try:
+                await asyncio.to_thread(self.store.upsert, self.flavor, records)
+                self.writes += 1
+            except Exception as e:
+                self._dirty |= dirty
+                self._stale |= stale
+                logger.error(
+                    "Failed to save guild registry to %s: %r",
+                    self.store.path,
+                    e,
+                    extra={"flavor": self.flavor},
+                )
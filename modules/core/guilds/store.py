@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import sqlite3
+import threading
+from collections.abc import Container, Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+
+from utils.guild_sync import iter_guild_entries_from_json
+
+logger = logging.getLogger("guildpilot.guilds")
+
+# store.py -> guilds -> core -> modules -> PROJECT
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_STORE_PATH = PROJECT_ROOT / "modules" / "core" / "guilds" / "guilds.sqlite3"
+
+STATUSES = ("active", "left")
+
+_SCHEMA = (
+    # flavor is the registry a row belongs to: "dev", "public", or one shard
+    # group's "public.shard-0-1" (see registry_flavor)
+    "CREATE TABLE IF NOT EXISTS guilds ("
+    " flavor TEXT NOT NULL,"
+    " guild_id INTEGER NOT NULL,"
+    " name TEXT NOT NULL DEFAULT '',"
+    " joined_at_utc TEXT,"
+    " last_seen_utc TEXT,"
+    " left_at_utc TEXT,"
+    " active INTEGER NOT NULL DEFAULT 1,"
+    " PRIMARY KEY (flavor, guild_id)"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS guilds_by_id ON guilds (guild_id)",
+    "CREATE INDEX IF NOT EXISTS guilds_by_status ON guilds (flavor, active, guild_id)",
+    "CREATE TABLE IF NOT EXISTS migrations ("
+    " source TEXT NOT NULL,"
+    " flavor TEXT NOT NULL,"
+    " imported INTEGER NOT NULL,"
+    " migrated_at_utc TEXT NOT NULL,"
+    " PRIMARY KEY (source, flavor))",
+)
+
+_TIMESTAMPS = ("joined_at_utc", "last_seen_utc", "left_at_utc")
+_MIGRATE_BATCH = 1000
+
+
+def registry_flavor(flavor: str, shard_ids: Iterable[int] | None = None) -> str:
+    """'public' -> 'public.shard-0-1' for a shard group's own registry."""
+    ids = list(shard_ids or [])
+    return f"{flavor}.shard-{'-'.join(map(str, ids))}" if ids else flavor
+
+
+def _legacy_record(gid: int, item: dict) -> dict:
+    """A store record from one legacy JSON registry entry (name/timestamps kept)."""
+    rec = {"id": gid, "name": str(item.get("name") or "")}
+    for col in _TIMESTAMPS:
+        if item.get(col):
+            rec[col] = str(item[col])
+    return rec
+
+
+def _row(flavor: str, r: dict) -> tuple:
+    left = r.get("left_at_utc")
+    return (
+        flavor,
+        int(r["id"]),
+        str(r.get("name") or ""),
+        r.get("joined_at_utc"),
+        r.get("last_seen_utc"),
+        left,
+        0 if left else 1,
+    )
+
+
+class GuildStore:
+    """
+    Embedded guild registry (sqlite, WAL) shared by every registry user.
+
+    - One row per (flavor, guild id); indexed by guild id and by
+      (flavor, active) so startup sync and reconcile are index lookups
+      rather than full-file parses.
+    - Records read and written here have the legacy JSON registry keys
+      (id, name, joined_at_utc, last_seen_utc, left_at_utc when left).
+    - migrate_json() imports a legacy JSON registry once per flavor.
+    - All methods are blocking; call them off-loop (asyncio.to_thread).
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            # WAL: readers (other bots/shard processes) never block the writer
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    @staticmethod
+    def _record(row: tuple) -> dict:
+        gid, name, joined, seen, left = row
+        rec = {"id": gid, "name": name, "joined_at_utc": joined, "last_seen_utc": seen}
+        if left:
+            rec["left_at_utc"] = left
+        return rec
+
+    def records(self, flavor: str) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT guild_id, name, joined_at_utc, last_seen_utc, left_at_utc "
+                "FROM guilds WHERE flavor = ? ORDER BY guild_id",
+                (flavor,),
+            ).fetchall()
+        return [self._record(r) for r in rows]
+
+    def get(self, flavor: str, guild_id: int) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT guild_id, name, joined_at_utc, last_seen_utc, left_at_utc "
+                "FROM guilds WHERE flavor = ? AND guild_id = ?",
+                (flavor, int(guild_id)),
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def guild_ids(self, flavor: str, *, status: str | None = None) -> list[int]:
+        """Sorted ids in flavor's registry; status 'active'/'left' filters."""
+        if status is None:
+            sql, args = "SELECT guild_id FROM guilds WHERE flavor = ?", (flavor,)
+        elif status in STATUSES:
+            sql = "SELECT guild_id FROM guilds WHERE flavor = ? AND active = ?"
+            args = (flavor, int(status == "active"))
+        else:
+            raise ValueError(f"status must be one of {STATUSES}, not {status!r}")
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY guild_id", args).fetchall()
+        return [r[0] for r in rows]
+
+    def count(self, flavor: str, *, status: str | None = None) -> int:
+        if status is None:
+            sql, args = "SELECT COUNT(*) FROM guilds WHERE flavor = ?", (flavor,)
+        else:
+            sql = "SELECT COUNT(*) FROM guilds WHERE flavor = ? AND active = ?"
+            args = (flavor, int(status == "active"))
+        with self._lock:
+            return self._conn.execute(sql, args).fetchone()[0]
+
+    def flavors_for(self, guild_id: int) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT flavor FROM guilds WHERE guild_id = ? ORDER BY flavor",
+                (int(guild_id),),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def upsert(self, flavor: str, records: Iterable[dict]) -> int:
+        """Insert or overwrite records (one transaction). Returns rows written."""
+        rows = [_row(flavor, r) for r in records]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO guilds (flavor, guild_id, name, joined_at_utc, "
+                "last_seen_utc, left_at_utc, active) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (flavor, guild_id) DO UPDATE SET name = excluded.name, "
+                "joined_at_utc = COALESCE(guilds.joined_at_utc, excluded.joined_at_utc), "
+                "last_seen_utc = excluded.last_seen_utc, "
+                "left_at_utc = excluded.left_at_utc, active = excluded.active",
+                rows,
+            )
+        return len(rows)
+
+    def add_missing(self, flavor: str, records: Iterable[dict]) -> int:
+        """Insert records whose id isn't in flavor yet. Returns rows added."""
+        rows = [_row(flavor, r) for r in records]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO guilds (flavor, guild_id, name, "
+                "joined_at_utc, last_seen_utc, left_at_utc, active) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def migrate_json(
+        self,
+        flavor: str,
+        path: Path | str,
+        *,
+        only_ids: Container[int] | None = None,
+    ) -> int:
+        """
+        Import a legacy JSON registry (any shape extract_guild_ids reads)
+        into flavor, once. The file is streamed and inserted in batches, so
+        memory doesn't grow with it. Guilds already in the store (or earlier
+        in the file) are left as they are. With only_ids, only those guilds
+        are imported (for a file several bots wrote to). Returns the number
+        of guilds imported.
+        """
+        path = Path(path)
+        source = str(path.resolve())
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT 1 FROM migrations WHERE source = ? AND flavor = ?",
+                (source, flavor),
+            ).fetchone()
+        if done or not path.exists():
+            return 0
+        imported = 0
+        try:
+            with self._lock, self._conn:
+                # One transaction: a file that turns out to be malformed
+                # halfway imports nothing and is retried next start
+                entries = iter_guild_entries_from_json(path)
+                while batch := list(itertools.islice(entries, _MIGRATE_BATCH)):
+                    rows = [
+                        _row(flavor, _legacy_record(gid, item))
+                        for gid, item in batch
+                        if only_ids is None or gid in only_ids
+                    ]
+                    before = self._conn.total_changes
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO guilds (flavor, guild_id, name, "
+                        "joined_at_utc, last_seen_utc, left_at_utc, active) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    imported += self._conn.total_changes - before
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO migrations VALUES (?, ?, ?, ?)",
+                    (source, flavor, imported, datetime.now(UTC).isoformat()),
+                )
+        except (OSError, ValueError) as e:
+            logger.warning("not migrating unreadable registry %s: %r", path, e)
+            return 0
+        logger.info(
+            "migrated %d guild(s) from %s", imported, path, extra={"flavor": flavor}
+        )
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,24 +1,78 @@
 import asyncio
+import logging
 import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 
 import discord
 from discord.ext import commands
-from openai import OpenAI
 
-from .storage import load_state, save_state
+from utils.metrics import REGISTRY
+
+from .storage import ConversationJournal, load_state
+from .streaming import StreamingReply
+
+logger = logging.getLogger("pilotai")
+
+OPENAI_SECONDS = REGISTRY.histogram(
+    "pilotai_openai_request_seconds",
+    "OpenAI chat completion latency (stream: until the last chunk).",
+    ["mode", "outcome"],
+)
+OPENAI_TOKENS = REGISTRY.counter(
+    "pilotai_openai_tokens", "OpenAI tokens used, by kind.", ["kind"]
+)
+
+
+@contextmanager
+def _openai_timer(mode: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except (asyncio.CancelledError, GeneratorExit):
+        outcome = "cancelled"
+        raise
+    finally:
+        OPENAI_SECONDS.observe(time.perf_counter() - t0, mode=mode, outcome=outcome)
+
+
+def _count_tokens(usage) -> None:
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        n = getattr(usage, f"{kind}_tokens", None)
+        if isinstance(n, int):
+            OPENAI_TOKENS.inc(n, kind=kind)
 
 
 class PilotAI(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
-        # OpenAI client reads OPENAI_API_KEY from env
-        self.client = OpenAI()
+        # OpenAI client reads OPENAI_API_KEY from env. Async so a slow
+        # completion never blocks the gateway heartbeat or other cogs.
+        # Built on first use (see .client) to keep the openai import off boot.
+        self._client = None
 
         # Choose your model centrally (env override supported)
         self.model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+        # Cap in-flight completions so a burst of requests queues here instead
+        # of piling onto the OpenAI rate limit (env override supported)
+        self.max_concurrency = max(1, int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")))
+        self._llm_sem = asyncio.Semaphore(self.max_concurrency)
+
+        # Stream tokens into a live-edited message instead of waiting for the
+        # full completion. PILOTAI_STREAM=0 restores post-when-done behavior.
+        self.stream_replies = os.getenv("PILOTAI_STREAM", "1") != "0"
+        self.stream_edit_interval = float(
+            os.getenv("PILOTAI_STREAM_EDIT_INTERVAL", "1.0")
+        )
+
         # ================= Conversation memory with TTL =================
         self.system_prompt = (
             "You are guildPilot, a helpful integrated Discord chat assistant. "
@@ -31,16 +85,45 @@ class PilotAI(commands.Cog):
 
         # convos[root_id] = {"history": [...], "last_active": datetime, "channel_id": int}
         # map any bot message id in a convo back to its root id
-        # both are restored from disk so a restart doesn't drop active threads
+        # both are restored from disk so a restart doesn't drop active threads;
+        # changes are appended to a journal and compacted in the background
         self.convos, self.msg_to_root = load_state()
+        self.journal = ConversationJournal()
 
         self._cleanup_task: asyncio.Task | None = None
+        self._compact_task: asyncio.Task | None = None
 
-    def _save_state(self) -> None:
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI()
+        return self._client
+
+    @client.setter
+    def client(self, value) -> None:
+        self._client = value
+
+    def _record(self, root_id: int, msg_ids: list[int]) -> None:
+        """Journal one conversation's update (O(that conversation), not O(all))."""
+        try:
+            self.journal.put(root_id, self.convos[root_id], msg_ids)
+        except Exception as e:
+            logger.error("failed to save conversation state: %r", e)
+        self._compact_soon()
+
+    def _compact_soon(self) -> None:
+        if not self.journal.needs_compaction:
+            return
+        if self._compact_task is None or self._compact_task.done():
+            self._compact_task = asyncio.get_running_loop().create_task(self._compact())
+
+    async def _compact(self) -> None:
         try:
-            save_state(self.convos, self.msg_to_root)
+            await self.journal.compact(self.convos, self.msg_to_root)
         except Exception as e:
-            print(f"[pilotai.storage] failed to save conversation state: {e!r}")
+            logger.error("failed to compact conversation state: %r", e)
 
     def utcnow(self) -> datetime:
         return datetime.now(UTC)
@@ -57,28 +140,86 @@ class PilotAI(commands.Cog):
             return True
         return self.utcnow() - meta["last_active"] > self.convo_ttl
 
-    async def send_long_message(self, channel: discord.abc.Messageable, content: str):
+    async def send_long_message(
+        self, channel: discord.abc.Messageable, content: str
+    ) -> list[discord.Message]:
         # Discord hard limit ~2000 chars
+        sent: list[discord.Message] = []
         for i in range(0, len(content), 2000):
-            await channel.send(content[i : i + 2000])
+            sent.append(await channel.send(content[i : i + 2000]))
+        return sent
 
-    def llm_reply(self, history: list[dict[str, str]]) -> str:
+    async def llm_reply(self, history: list[dict[str, str]]) -> str:
         """
         history: list of {"role": "system"|"user"|"assistant", "content": "..."}
         returns: string reply
         """
-        resp = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=self.trim_history(history),
-            temperature=0.9,
-            max_tokens=1024,
-        )
+        async with self._llm_sem:
+            with _openai_timer("complete"):
+                resp = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=self.trim_history(history),
+                    temperature=0.9,
+                    max_tokens=1024,
+                )
+        _count_tokens(getattr(resp, "usage", None))
         return (
             resp.choices[0].message.content
             if resp.choices
             else "No response from OpenAI."
         )
 
+    async def llm_stream(self, history: list[dict[str, str]]) -> AsyncIterator[str]:
+        """Same as llm_reply, but yields content deltas as they arrive."""
+        async with self._llm_sem:
+            with _openai_timer("stream"):
+                stream = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=self.trim_history(history),
+                    temperature=0.9,
+                    max_tokens=1024,
+                    stream=True,
+                    # Final chunk carries token usage (and no choices)
+                    stream_options={"include_usage": True},
+                )
+                async for chunk in stream:
+                    _count_tokens(getattr(chunk, "usage", None))
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+
+    async def deliver_reply(
+        self,
+        history: list[dict[str, str]],
+        send_first: Callable[[str], Awaitable[discord.Message]],
+        channel: discord.abc.Messageable,
+    ) -> tuple[str, list[discord.Message]]:
+        """
+        Generate a reply to history and post it: the first message via
+        send_first, overflow past 2000 chars into channel.
+        Returns (reply, every message posted).
+        """
+        if not self.stream_replies:
+            reply = await self.llm_reply(history)
+            first = await send_first(reply[:2000])
+            rest = await self.send_long_message(channel, reply[2000:])
+            return reply, [first, *rest]
+
+        out = StreamingReply(
+            send_first, channel, min_edit_interval=self.stream_edit_interval
+        )
+        await out.start()
+        try:
+            async for delta in self.llm_stream(history):
+                await out.feed(delta)
+        except Exception:
+            try:
+                await out.fail("⚠️ Sorry, I hit an error talking to OpenAI.")
+            except Exception:
+                pass
+            raise
+        reply = await out.finish()
+        return reply, out.messages
+
     async def cleanup_conversations_task(self):
         await self.bot.wait_until_ready()
         while not self.bot.is_closed():
@@ -89,18 +230,22 @@ class PilotAI(commands.Cog):
                     if now - meta["last_active"] > self.convo_ttl:
                         to_delete.append(root_id)
 
+                expired = set(to_delete)
                 for root_id in to_delete:
                     del self.convos[root_id]
-                    # remove any msg_to_root entries that map to this root
-                    for mid in [
-                        k for k, v in list(self.msg_to_root.items()) if v == root_id
-                    ]:
-                        del self.msg_to_root[mid]
+                # remove any msg_to_root entries that map to those roots
+                mids = [k for k, v in self.msg_to_root.items() if v in expired]
+                for mid in mids:
+                    del self.msg_to_root[mid]
 
                 if to_delete:
-                    self._save_state()
+                    try:
+                        self.journal.delete(to_delete, mids)
+                    except Exception as e:
+                        logger.error("failed to save conversation state: %r", e)
+                    self._compact_soon()
             except Exception as e:
-                print(f"[pilotai.cleanup] error: {e!r}")
+                logger.error("cleanup error: %r", e)
 
             await asyncio.sleep(self.cleanup_period)
 
@@ -111,6 +256,19 @@ class PilotAI(commands.Cog):
                 self.cleanup_conversations_task()
             )
 
+    async def graceful_shutdown(self) -> None:
+        """Called by the shutdown coordinator once commands have drained."""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+        if self._compact_task is not None:
+            await asyncio.gather(self._compact_task, return_exceptions=True)
+        # Leave one snapshot and an empty journal for the next start
+        await self._compact()
+        self.journal.close()
+        if self._client is not None:
+            await self._client.close()
+
     # ================== Slash command: start a new conversation ==================
     @commands.slash_command(
         name="ask-the-pilot",
@@ -118,6 +276,7 @@ class PilotAI(commands.Cog):
     )
     @commands.cooldown(1, 20, commands.BucketType.user)
     async def ask_the_pilot(self, ctx: discord.ApplicationContext, message: str):
+        started = time.perf_counter()
         # Start "thinking..."
         try:
             await ctx.defer(ephemeral=True)
@@ -130,8 +289,6 @@ class PilotAI(commands.Cog):
                 {"role": "user", "content": message},
             ]
 
-            reply = self.llm_reply(history)
-
             user_name = ctx.author.display_name
             server_location = ctx.guild.name if ctx.guild else "DM"
             channel_location = (
@@ -145,13 +302,11 @@ class PilotAI(commands.Cog):
                 pass
 
             # Post the real response publicly (reliable Message object)
-            if len(reply) > 2000:
-                sent_msg = await ctx.channel.send(reply[:2000])
-                await self.send_long_message(ctx.channel, reply[2000:])
-            else:
-                sent_msg = await ctx.channel.send(reply)
+            reply, sent = await self.deliver_reply(
+                history, ctx.channel.send, ctx.channel
+            )
 
-            root_id = sent_msg.id
+            root_id = sent[0].id
 
             history.append({"role": "assistant", "content": reply})
             self.convos[root_id] = {
@@ -159,18 +314,32 @@ class PilotAI(commands.Cog):
                 "last_active": self.utcnow(),
                 "channel_id": ctx.channel.id,
             }
-            self.msg_to_root[root_id] = root_id
-            self._save_state()
-
-            print(
-                f"[pilotai] user: {user_name}\n"
-                f"[pilotai] reply: {reply[:120]}...\n"
-                f"[pilotai] Server: {server_location}\n"
-                f"[pilotai] Channel: {channel_location}"
+            for msg in sent:
+                self.msg_to_root[msg.id] = root_id
+            self._record(root_id, [msg.id for msg in sent])
+
+            logger.info(
+                "answered ask-the-pilot",
+                extra={
+                    "command": "ask-the-pilot",
+                    "guild": server_location,
+                    "guild_id": ctx.guild.id if ctx.guild else None,
+                    "channel": channel_location,
+                    "user": user_name,
+                    "reply_chars": len(reply),
+                    "latency_ms": round((time.perf_counter() - started) * 1000),
+                },
             )
 
         except Exception as e:
-            print(f"[pilotai] Error: {e!r}")
+            logger.error(
+                "ask-the-pilot failed: %r",
+                e,
+                extra={
+                    "command": "ask-the-pilot",
+                    "guild_id": ctx.guild.id if ctx.guild else None,
+                },
+            )
             try:
                 await ctx.respond(
                     "There was an error processing your request.", ephemeral=True
@@ -192,7 +361,7 @@ class PilotAI(commands.Cog):
                 pass
             return
 
-        print(f"[pilotai] Unhandled error in ask-the-pilot: {error!r}")
+        logger.error("unhandled error in ask-the-pilot: %r", error)
         try:
             await ctx.respond(
                 "There was an error processing your request.", ephemeral=True
@@ -236,18 +405,20 @@ class PilotAI(commands.Cog):
                     ]
 
                 try:
-                    reply = self.llm_reply(history)
+                    reply, sent = await self.deliver_reply(
+                        history, message.reply, message.channel
+                    )
                 except Exception as e:
-                    print(f"[pilotai] OpenAI error: {e!r}")
-                    await message.reply("Sorry, I hit an error talking to OpenAI.")
+                    logger.error(
+                        "OpenAI error: %r",
+                        e,
+                        extra={"guild_id": message.guild.id if message.guild else None},
+                    )
+                    # Streaming already swapped its placeholder for the notice
+                    if not self.stream_replies:
+                        await message.reply("Sorry, I hit an error talking to OpenAI.")
                     return
 
-                if len(reply) > 2000:
-                    sent = await message.reply(reply[:2000])
-                    await self.send_long_message(message.channel, reply[2000:])
-                else:
-                    sent = await message.reply(reply)
-
                 history.append({"role": "assistant", "content": reply})
                 self.convos[root_id] = {
                     "history": self.trim_history(history),
@@ -255,14 +426,12 @@ class PilotAI(commands.Cog):
                     "channel_id": message.channel.id,
                 }
 
-                self.msg_to_root[sent.id] = root_id
+                for msg in sent:
+                    self.msg_to_root[msg.id] = root_id
                 self.msg_to_root[ref.id] = root_id
-                self._save_state()
-
-                return  # do not fall through
+                self._record(root_id, [msg.id for msg in sent] + [ref.id])
 
-        # Let other commands/cogs work normally
-        await self.bot.process_commands(message)
+                return
 
 
 def setup(bot: commands.Bot):
@@ -1,10 +1,16 @@
+import logging
+
 import discord
 from discord.ext import commands
 
 from modules.pilotai.env_check import get_env_vars  # adjust import if needed
+from utils.log_pipeline import setup_logging
+
+logger = logging.getLogger("pilotai")
 
 
 def main() -> None:
+    setup_logging()
     config = get_env_vars()
 
     intents = discord.Intents.default()
@@ -19,17 +25,18 @@ def main() -> None:
 
     @bot.event
     async def on_ready():
-        print("\n" + "=" * 60)
-        print(f"[READY] Logged in as: {bot.user} (id={bot.user.id})")
-        print(f"[READY] discord version: {getattr(discord, '__version__', 'unknown')}")
-        print(f"[READY] Connected guilds: {len(bot.guilds)}")
-        for g in bot.guilds:
-            print(f"  - {g.name} (id={g.id})")
-
         local_cmds = list(bot.walk_application_commands())
-        print(f"[READY] Local app commands found: {len(local_cmds)}")
-        for c in local_cmds:
-            print(f"  - /{c.name} | guild_ids={getattr(c, 'guild_ids', None)}")
+        logger.info(
+            "ready as %s (id=%s): discord %s, %d guild(s), %d local app command(s)",
+            bot.user,
+            bot.user.id,
+            getattr(discord, "__version__", "unknown"),
+            len(bot.guilds),
+            len(local_cmds),
+            extra={
+                "commands": {c.name: getattr(c, "guild_ids", None) for c in local_cmds}
+            },
+        )
 
         # NOTE: Global slash commands may take time to appear in Discord UI.
         # The correct scope (applications.commands) is required on the invite.
@@ -1,38 +1,125 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
+import re
+import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 logger = logging.getLogger("pilotai.storage")
 
 STORAGE_DIR = Path(__file__).resolve().parent / "storage"
 CONVOS_PATH = STORAGE_DIR / "convos.json"
 
+_SEQ_RE = re.compile(r'\{"journal_seq":(\d+)')
+
+
+def journal_paths(path: Path = CONVOS_PATH) -> dict[int, Path]:
+    """seq -> segment for the journal next to path (convos.<seq>.journal)."""
+    out: dict[int, Path] = {}
+    for p in path.parent.glob(f"{path.stem}.*.journal"):
+        try:
+            out[int(p.name[len(path.stem) + 1 : -len(".journal")])] = p
+        except ValueError:
+            continue
+    return dict(sorted(out.items()))
 
-def load_state(
-    path: Path = CONVOS_PATH,
-) -> tuple[dict[int, dict[str, Any]], dict[int, int]]:
-    """Returns (convos, msg_to_root), matching PilotAI's in-memory shapes."""
-    if not path.exists():
-        return {}, {}
 
+def _journal_path(path: Path, seq: int) -> Path:
+    return path.with_name(f"{path.stem}.{seq}.journal")
+
+
+def _read_snapshot(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
         logger.warning("Could not parse %s; starting with empty state.", path)
-        return {}, {}
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _snapshot_seq(path: Path) -> int:
+    """The snapshot's journal_seq, without parsing the whole file."""
+    try:
+        with path.open(encoding="utf-8") as f:
+            head = f.read(64)
+    except OSError:
+        return 0
+    # save_state writes journal_seq first
+    m = _SEQ_RE.match(head)
+    if m:
+        return int(m.group(1))
+    return int(_read_snapshot(path).get("journal_seq", 0) or 0)
+
+
+def _convo(meta: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "history": meta["history"],
+        "last_active": datetime.fromisoformat(meta["last_active"]),
+        "channel_id": meta["channel_id"],
+    }
+
+
+def _apply(
+    entry: dict[str, Any],
+    convos: dict[int, dict[str, Any]],
+    msg_to_root: dict[int, int],
+) -> None:
+    """Replay one journal entry onto the in-memory state."""
+    if entry["op"] == "put":
+        root_id = int(entry["root"])
+        convos[root_id] = _convo(entry)
+        for mid in entry.get("msgs", ()):
+            msg_to_root[int(mid)] = root_id
+    elif entry["op"] == "del":
+        for root_id in entry.get("roots", ()):
+            convos.pop(int(root_id), None)
+        for mid in entry.get("msgs", ()):
+            msg_to_root.pop(int(mid), None)
+
+
+def _replay(
+    segment: Path,
+    convos: dict[int, dict[str, Any]],
+    msg_to_root: dict[int, int],
+) -> None:
+    bad = 0
+    with segment.open(encoding="utf-8") as f:
+        for line in f:
+            # A line without its newline was cut off by a crash mid-write
+            if not line.endswith("\n"):
+                bad += 1
+                break
+            try:
+                _apply(json.loads(line), convos, msg_to_root)
+            except (KeyError, TypeError, ValueError):
+                bad += 1
+    if bad:
+        logger.warning("Skipped %d damaged entry(ies) in %s.", bad, segment)
+
+
+def load_state(
+    path: Path = CONVOS_PATH,
+) -> tuple[dict[int, dict[str, Any]], dict[int, int]]:
+    """
+    Returns (convos, msg_to_root), matching PilotAI's in-memory shapes.
+
+    Reads the last snapshot (path), then replays the journal segments
+    written after it, in order. A torn or unparsable journal line is skipped,
+    so a crash at any point loses at most the entry being written.
+    """
+    data = _read_snapshot(path)
 
     convos: dict[int, dict[str, Any]] = {}
     for root_id_str, meta in data.get("convos", {}).items():
         try:
-            convos[int(root_id_str)] = {
-                "history": meta["history"],
-                "last_active": datetime.fromisoformat(meta["last_active"]),
-                "channel_id": meta["channel_id"],
-            }
+            convos[int(root_id_str)] = _convo(meta)
         except (KeyError, TypeError, ValueError):
             continue
 
@@ -43,6 +130,14 @@ def load_state(
         except (TypeError, ValueError):
             continue
 
+    first = int(data.get("journal_seq", 0) or 0)
+    for seq, segment in journal_paths(path).items():
+        if seq >= first:
+            try:
+                _replay(segment, convos, msg_to_root)
+            except OSError as e:
+                logger.warning("Could not read %s: %r", segment, e)
+
     return convos, msg_to_root
 
 
@@ -50,9 +145,16 @@ def save_state(
     convos: dict[int, dict[str, Any]],
     msg_to_root: dict[int, int],
     path: Path = CONVOS_PATH,
-) -> None:
+    *,
+    journal_seq: int = 0,
+) -> int:
+    """
+    Write a full snapshot atomically (temp file + rename). Journal segments
+    numbered below journal_seq are covered by it. Returns the bytes written.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = {
+        "journal_seq": journal_seq,
         "convos": {
             str(root_id): {
                 "history": meta["history"],
@@ -63,4 +165,133 @@ def save_state(
         },
         "msg_to_root": {str(k): v for k, v in msg_to_root.items()},
     }
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    data = json.dumps(payload, separators=(",", ":"))
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return len(data)
+
+
+class ConversationJournal:
+    """
+    Append-only persistence for PilotAI's conversation state.
+
+    - put()/delete() append one JSON line describing the change to the
+      current journal segment, so the cost of a reply depends on that
+      conversation's (trimmed) history, not on how many are active.
+    - compact() rolls over to a new segment, writes a full snapshot from a
+      copy of the state in a worker thread and then removes the segments it
+      covers. A crash before the snapshot lands just replays the old
+      segments; after, the snapshot's journal_seq tells load_state to skip
+      them.
+    - needs_compaction turns True once the journal outgrows the snapshot
+      (and `compact_bytes`), which keeps compaction cost amortized per write.
+    - Each process appends to a fresh segment, never after a torn line.
+    """
+
+    def __init__(self, path: Path = CONVOS_PATH, *, compact_bytes: int = 256_000):
+        self.path = path
+        self.compact_bytes = compact_bytes
+
+        segments = journal_paths(path)
+        # Past both the newest segment and the snapshot's journal_seq: after
+        # a compaction removed every segment, load_state would skip a segment
+        # numbered below the snapshot's journal_seq
+        self._seq = max(max(segments, default=0), _snapshot_seq(path)) + 1
+        self._file: IO[str] | None = None
+        self._journal_bytes = sum(_size(p) for p in segments.values())
+        self._snapshot_bytes = _size(path)
+        self._compact_lock = asyncio.Lock()
+        self.compactions = 0
+
+    @property
+    def journal_bytes(self) -> int:
+        return self._journal_bytes
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._journal_bytes >= max(self.compact_bytes, self._snapshot_bytes)
+
+    def put(
+        self, root_id: int, meta: dict[str, Any], msg_ids: list[int] | tuple = ()
+    ) -> None:
+        """Record conversation root_id as it is now, plus new message ids in it."""
+        self._append(
+            {
+                "op": "put",
+                "root": root_id,
+                "history": meta["history"],
+                "last_active": meta["last_active"].isoformat(),
+                "channel_id": meta["channel_id"],
+                "msgs": list(msg_ids),
+            }
+        )
+
+    def delete(self, root_ids: list[int], msg_ids: list[int] | tuple = ()) -> None:
+        """Record expired conversations and the message ids that mapped to them."""
+        if root_ids:
+            self._append({"op": "del", "roots": root_ids, "msgs": list(msg_ids)})
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = _journal_path(self.path, self._seq).open("a", encoding="utf-8")
+        self._file.write(line)
+        self._file.flush()  # in the OS's hands: survives a process crash
+        self._journal_bytes += len(line)
+
+    async def compact(
+        self, convos: dict[int, dict[str, Any]], msg_to_root: dict[int, int]
+    ) -> None:
+        """Fold the journal into a new snapshot of (convos, msg_to_root)."""
+        async with self._compact_lock:
+            # Everything up to here is in the state we copy; later writes go
+            # to the next segment and are replayed on top of the snapshot
+            covered = self._seq
+            self._roll()
+            convos = {rid: dict(meta) for rid, meta in convos.items()}
+            msg_to_root = dict(msg_to_root)
+            journaled = self._journal_bytes
+
+            size = await asyncio.to_thread(
+                save_state, convos, msg_to_root, self.path, journal_seq=covered + 1
+            )
+            self._snapshot_bytes = size
+            self._journal_bytes -= journaled
+            self.compactions += 1
+            await asyncio.to_thread(self._remove_segments, covered)
+
+    def _roll(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._seq += 1
+
+    def _remove_segments(self, upto: int) -> None:
+        for seq, segment in journal_paths(self.path).items():
+            if seq <= upto:
+                try:
+                    segment.unlink()
+                except OSError as e:
+                    logger.warning("Could not remove %s: %r", segment, e)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable
+
+import discord
+
+# Discord hard limit per message
+MESSAGE_LIMIT = 2000
+
+PLACEHOLDER = "✈️ …"
+
+
+class StreamingReply:
+    """
+    Progressively renders a streamed completion into Discord messages.
+
+    - Posts a placeholder immediately (via send_first) so users see activity.
+    - Edits the current message as text arrives: the first text at once,
+      later edits at most once per min_edit_interval seconds, to stay under
+      Discord's edit rate limits.
+    - Rolls over to a new message in `channel` at the 2000-char boundary.
+    """
+
+    def __init__(
+        self,
+        send_first: Callable[[str], Awaitable[discord.Message]],
+        channel: discord.abc.Messageable,
+        *,
+        min_edit_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._send_first = send_first
+        self._channel = channel
+        self.min_edit_interval = min_edit_interval
+        self._clock = clock
+
+        self.messages: list[discord.Message] = []
+        self._parts: list[str] = []
+        self._current = ""  # text belonging to messages[-1]
+        self._rendered = ""  # what messages[-1] currently shows
+        self._last_edit: float | None = None  # None: nothing shown yet
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    async def start(self) -> discord.Message:
+        msg = await self._send_first(PLACEHOLDER)
+        self.messages.append(msg)
+        return msg
+
+    async def feed(self, delta: str) -> None:
+        if not delta:
+            return
+        if not self.messages:
+            await self.start()
+
+        self._parts.append(delta)
+        self._current += delta
+
+        # Roll over: freeze the full message and continue in a new one
+        while len(self._current) > MESSAGE_LIMIT:
+            head = self._current[:MESSAGE_LIMIT]
+            self._current = self._current[MESSAGE_LIMIT:]
+            await self._edit(head)
+            msg = await self._channel.send(self._current[:MESSAGE_LIMIT])
+            self.messages.append(msg)
+            self._rendered = self._current[:MESSAGE_LIMIT]
+            self._last_edit = self._clock()
+
+        if (
+            self._last_edit is None
+            or self._clock() - self._last_edit >= self.min_edit_interval
+        ):
+            await self._edit(self._current)
+
+    async def finish(self, fallback: str = "No response from OpenAI.") -> str:
+        if not self.messages:
+            await self.start()
+        if not self._current and len(self.messages) == 1:
+            self._current = fallback
+            self._parts.append(fallback)
+        await self._edit(self._current)
+        return self.text
+
+    async def fail(self, notice: str) -> None:
+        """Replace the in-progress message with an error notice."""
+        if not self.messages:
+            return
+        body = f"{self._current}\n\n{notice}" if self._current else notice
+        await self._edit(body[-MESSAGE_LIMIT:])
+
+    async def _edit(self, content: str) -> None:
+        if content == self._rendered or not content:
+            return
+        await self.messages[-1].edit(content=content)
+        self._rendered = content
+        self._last_edit = self._clock()
@@ -1,7 +1,10 @@
 # from __future__ import annotations
 
 # ruff: noqa: B008  # py-cord uses discord.discord.option(...) in command signatures
+import asyncio
 import json
+import logging
+import time
 from pathlib import Path
 
 import discord
@@ -9,11 +12,17 @@ import discord
 # from discord import discord.option
 from discord.ext import commands
 
+from modules.core.cache import ensure_members
+from modules.core.guilds.lifecycle import GuildJoined, GuildLifecycle, GuildsReady
+
 from .core.approvals import ApprovalRequest, ApprovalView
 from .core.config_loader import (
+    PENDING_APPROVALS_PATH,
     load_guild_settings,
+    load_pending_approvals,
     load_runtime_config,
     save_guild_settings,
+    save_pending_approvals,
 )
 from .core.permissions import is_approver
 
@@ -25,6 +34,10 @@ ROLECOP_DIR = PROJECT_ROOT / "rolecop"
 MEMB_MSG_PATH = ROLECOP_DIR / "messages" / "welc_msg_membs.json"
 BOT_MSG_PATH = ROLECOP_DIR / "messages" / "welc_msg_bots.json"
 
+APPROVAL_TTL_SECONDS = 3600
+
+logger = logging.getLogger("rolecop")
+
 
 def _load_messages(path: Path) -> list[str]:
     try:
@@ -53,8 +66,20 @@ class RoleCopCog(commands.Cog):
         self.member_msgs = _load_messages(MEMB_MSG_PATH)
         self.bot_msgs = _load_messages(BOT_MSG_PATH)
 
-        # pending approvals in memory: message_id -> ApprovalRequest
+        # pending approvals: message_id -> ApprovalRequest
+        # (saved as they're posted and decided, re-attached on the next on_ready)
         self.pending: dict[int, ApprovalRequest] = {}
+        self.pending_path = PENDING_APPROVALS_PATH
+        self._save_lock = asyncio.Lock()
+        self._restored = False
+
+        # Guild events arrive once, already applied to the registry
+        self.lifecycle = GuildLifecycle.for_bot(bot)
+        self.lifecycle.subscribe(GuildsReady, self._on_guilds_ready)
+        self.lifecycle.subscribe(GuildJoined, self._on_guild_joined)
+
+    def cog_unload(self) -> None:
+        self.lifecycle.unsubscribe(self)
 
     # ---------------- Config helpers ----------------
     def _is_personal(self, guild: discord.Guild | None) -> bool:
@@ -117,8 +142,7 @@ class RoleCopCog(commands.Cog):
         return bool(has_channel and has_roles)
 
     # ---------------- Auto-setup (personal guild) ----------------
-    @commands.Cog.listener()
-    async def on_ready(self) -> None:
+    async def _on_guilds_ready(self, event: GuildsReady) -> None:
         # Force-migrate safe_mode to True for ALL guilds
         changed = False
         for _gid, cfg in self.guild_settings.items():
@@ -128,13 +152,61 @@ class RoleCopCog(commands.Cog):
 
         if changed:
             save_guild_settings(self.cfg.guild_settings_path, self.guild_settings)
-            print("[RoleCop] Migrated safe_mode -> True for all guilds")
+            logger.info("migrated safe_mode -> True for all guilds")
 
         # Ensure personal guild is pre-configured so you don't have to run /rolecop_setup there.
         await self._ensure_personal_guild_config()
 
-    @commands.Cog.listener()
-    async def on_guild_join(self, guild: discord.Guild) -> None:
+        if not self._restored:
+            self._restored = True
+            self._restore_pending()
+
+    # ---------------- Pending approvals across restarts ----------------
+    def _restore_pending(self) -> None:
+        now = time.time()
+        restored = 0
+        for message_id, data in load_pending_approvals(self.pending_path).items():
+            try:
+                request = ApprovalRequest.from_dict(data)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if now - request.created_at > APPROVAL_TTL_SECONDS:
+                continue
+            guild = self.bot.get_guild(request.guild_id or 0)
+            if guild is None:
+                continue
+            view = self._approval_view(self._get_guild_cfg(guild), request, None)
+            self.bot.add_view(view, message_id=message_id)
+            self.pending[message_id] = request
+            restored += 1
+        if restored:
+            logger.info("restored %d pending approval(s)", restored)
+
+    def _live_pending(self) -> dict[int, dict]:
+        now = time.time()
+        return {
+            mid: req.to_dict()
+            for mid, req in self.pending.items()
+            if now - req.created_at <= APPROVAL_TTL_SECONDS
+        }
+
+    async def _persist_pending(self) -> None:
+        # A decided request must not come back after a crash, and a new one
+        # should survive it: keep the file in step with self.pending
+        async with self._save_lock:
+            try:
+                await asyncio.to_thread(
+                    save_pending_approvals, self.pending_path, self._live_pending()
+                )
+            except OSError as e:
+                logger.warning("could not save pending approvals: %r", e)
+
+    async def graceful_shutdown(self) -> None:
+        async with self._save_lock:
+            save_pending_approvals(self.pending_path, self._live_pending())
+
+    async def _on_guild_joined(self, event: GuildJoined) -> None:
+        guild = event.guild
         if self.cfg.personal_guild_id and guild.id == self.cfg.personal_guild_id:
             await self._ensure_personal_guild_config(guild=guild)
 
@@ -331,6 +403,9 @@ class RoleCopCog(commands.Cog):
                 "You don’t have permission to use this.", ephemeral=True
             )
 
+        # Chunks the guild on first use under a "lazy" cache policy
+        complete = await ensure_members(self.bot, ctx.guild)
+
         members = [m for m in ctx.guild.members if role in m.roles]
         total = len(members)
 
@@ -338,6 +413,8 @@ class RoleCopCog(commands.Cog):
         names = ", ".join(m.mention for m in shown) if shown else "None"
 
         msg = f"**{role.name}** has **{total}** member(s).\nShowing first {min(total, 25)}:\n{names}"
+        if not complete:
+            msg += "\n-# Only members the bot has cached are counted."
         return await ctx.respond(msg, ephemeral=True)
 
     @commands.slash_command(
@@ -390,6 +467,20 @@ class RoleCopCog(commands.Cog):
         if request.reason:
             embed.add_field(name="Reason", value=request.reason, inline=False)
 
+        request.guild_id = ctx.guild.id
+        request.channel_id = approvals_channel.id
+        request.created_at = time.time()
+        view = self._approval_view(gcfg, request, APPROVAL_TTL_SECONDS)
+
+        msg = await approvals_channel.send(embed=embed, view=view)
+        self.pending[msg.id] = request
+        await self._persist_pending()
+
+        await ctx.respond("✅ Request sent for approval.", ephemeral=True)
+
+    def _approval_view(
+        self, gcfg: dict, request: ApprovalRequest, timeout: float | None
+    ) -> ApprovalView:
         async def on_approve(interaction: discord.Interaction):
             await interaction.response.defer(ephemeral=True)
             await self._execute_request(interaction, request, approved=True)
@@ -398,18 +489,13 @@ class RoleCopCog(commands.Cog):
             await interaction.response.defer(ephemeral=True)
             await self._execute_request(interaction, request, approved=False)
 
-        view = ApprovalView(
+        return ApprovalView(
             approver_role_names=gcfg["approver_role_names"],
             on_approve=on_approve,
             on_deny=on_deny,
-            timeout=3600,
+            timeout=timeout,
         )
 
-        msg = await approvals_channel.send(embed=embed, view=view)
-        self.pending[msg.id] = request
-
-        await ctx.respond("✅ Request sent for approval.", ephemeral=True)
-
     async def _execute_request(
         self, interaction: discord.Interaction, request: ApprovalRequest, approved: bool
     ) -> None:
@@ -418,6 +504,19 @@ class RoleCopCog(commands.Cog):
             return
 
         message = interaction.message  # type: ignore[assignment]
+        if message is not None and self.pending.pop(message.id, None) is not None:
+            await self._persist_pending()
+
+        # Restored views have no timeout of their own
+        if time.time() - request.created_at > APPROVAL_TTL_SECONDS:
+            try:
+                await message.edit(view=None)
+                await interaction.followup.send(
+                    "This request has expired.", ephemeral=True
+                )
+            except Exception:
+                pass
+            return
         approver = interaction.user
         if not isinstance(approver, discord.Member):
             approver = guild.get_member(approver.id) or approver  # type: ignore[assignment]
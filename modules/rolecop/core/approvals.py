@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 import discord
 
@@ -15,16 +15,42 @@ class ApprovalRequest:
     action: str  # "promote" | "demote" | "kick"
     reason: str | None
     payload: dict  # action-specific data (role ids, etc.)
+    # Where the approval message lives, so it can be re-attached after restart
+    guild_id: int | None = None
+    channel_id: int | None = None
+    created_at: float = 0.0  # unix time
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ApprovalRequest:
+        return cls(
+            requester_id=int(data["requester_id"]),
+            target_id=int(data["target_id"]),
+            action=str(data["action"]),
+            reason=data.get("reason"),
+            payload=dict(data.get("payload") or {}),
+            guild_id=data.get("guild_id"),
+            channel_id=data.get("channel_id"),
+            created_at=float(data.get("created_at") or 0.0),
+        )
 
 
 class ApprovalView(discord.ui.View):
+    """
+    Approve/Deny buttons on an approval message. The buttons carry fixed
+    custom_ids so a view with timeout=None can be re-registered for an
+    existing message (bot.add_view(view, message_id=...)) after a restart.
+    """
+
     def __init__(
         self,
         *,
         approver_role_names: list[str],
         on_approve: Callable[[discord.Interaction], Awaitable[None]],
         on_deny: Callable[[discord.Interaction], Awaitable[None]],
-        timeout: float = 3600,
+        timeout: float | None = 3600,
     ) -> None:
         super().__init__(timeout=timeout)
         self.approver_role_names = approver_role_names
@@ -45,13 +71,17 @@ class ApprovalView(discord.ui.View):
             pass
         return False
 
-    @discord.ui.button(label="Approve", style=discord.ButtonStyle.success)
+    @discord.ui.button(
+        label="Approve", style=discord.ButtonStyle.success, custom_id="rolecop:approve"
+    )
     async def approve_btn(
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
         await self._on_approve(interaction)
 
-    @discord.ui.button(label="Deny", style=discord.ButtonStyle.danger)
+    @discord.ui.button(
+        label="Deny", style=discord.ButtonStyle.danger, custom_id="rolecop:deny"
+    )
     async def deny_btn(
         self, button: discord.ui.Button, interaction: discord.Interaction
     ):
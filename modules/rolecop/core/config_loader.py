@@ -15,6 +15,7 @@ STORAGE_DIR = ROLECOP_DIR / "storage"
 PUBLIC_CONFIG_PATH = CONFIG_DIR / "default.json"
 PERSONAL_CONFIG_PATH = CONFIG_DIR / "personal_config.json"
 GUILD_SETTINGS_PATH = STORAGE_DIR / "guild_settings.json"
+PENDING_APPROVALS_PATH = STORAGE_DIR / "pending_approvals.json"
 
 
 def _load_json(path: Path, fallback: Any) -> Any:
@@ -93,3 +94,32 @@ def save_guild_settings(path: Path, guilds: dict[str, dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = {"guilds": guilds}
     path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def load_pending_approvals(path: Path) -> dict[int, dict]:
+    """
+    Returns dict: approval message_id -> serialized ApprovalRequest
+    Stored as {"pending": { "<message_id>": { ... } }}
+    """
+    data = _load_json(path, {"pending": {}})
+    pending = data.get("pending") if isinstance(data, dict) else None
+    if not isinstance(pending, dict):
+        return {}
+    out: dict[int, dict] = {}
+    for mid, req in pending.items():
+        if isinstance(req, dict):
+            try:
+                out[int(mid)] = req
+            except ValueError:
+                continue
+    return out
+
+
+def save_pending_approvals(path: Path, pending: dict[int, dict]) -> None:
+    # Written after every new request and decision (and at shutdown); a temp
+    # file + replace so a kill mid-write never leaves a truncated file behind
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"pending": {str(mid): req for mid, req in pending.items()}}
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp.replace(path)
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 import logging
 
@@ -6,11 +7,13 @@ import validators
 from discord.ext import commands
 
 from .events import (
+    StatsCache,
+    UsernameIndex,
+    UsernameStore,
     generate_link,
     generate_val_link,
+    get_browser_pool,
     get_r6siege_player_data,
-    load_usernames,
-    save_usernames,
 )
 
 logger = logging.getLogger("statwrangler")
@@ -24,6 +27,54 @@ class StatWrangler(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
+        # Shared Chromium for every scraper; stops with the last cog using it
+        self.browser_pool = get_browser_pool()
+        self.browser_pool.attach(self)
+        self._pool_task: asyncio.Task | None = None
+
+        # Scrape results: in-memory LRU + sqlite tier, per-game TTLs
+        self.stats_cache = StatsCache()
+
+        # Known usernames per game; writes are debounced and done off-loop
+        self.usernames = UsernameStore()
+
+        # Autocomplete index, built once and kept current as names are added
+        self.username_index = UsernameIndex.from_usernames(self.usernames.as_dict())
+
+    def cog_load(self) -> None:
+        # Warm the browser in the background so the first lookup doesn't pay
+        # for the Chromium launch
+        if self._pool_task is None:
+            self._pool_task = self.bot.loop.create_task(self._start_pool())
+
+    async def _start_pool(self) -> None:
+        try:
+            await self.stats_cache.prune()
+        except Exception as e:
+            logger.warning("Stats cache prune failed: %r", e)
+        try:
+            await self.browser_pool.start()
+        except Exception as e:
+            # Scrapers retry the launch lazily on first use
+            logger.error("Browser pool failed to start: %r", e)
+
+    def cog_unload(self) -> None:
+        if self._pool_task is not None:
+            self._pool_task.cancel()
+            self._pool_task = None
+        self.bot.loop.create_task(self.browser_pool.detach(self))
+        self.bot.loop.create_task(self.stats_cache.close())
+        self.bot.loop.create_task(self.usernames.flush())
+
+    async def graceful_shutdown(self) -> None:
+        """Flush known usernames, close the cache and the browser pool."""
+        if self._pool_task is not None:
+            self._pool_task.cancel()
+            self._pool_task = None
+        await self.usernames.flush()
+        await self.stats_cache.close()
+        await self.browser_pool.detach(self)
+
     # ---------------- Bot lifecycle (moved into Cog) ----------------
     # @commands.Cog.listener()
     # async def on_ready(self):
@@ -54,14 +105,8 @@ class StatWrangler(commands.Cog):
         if not game_value:
             return []
 
-        usernames = load_usernames()
-        game_usernames = usernames.get(game_value, [])
-
-        if not current:
-            return game_usernames[:25]
-
-        matches = [name for name in game_usernames if current.lower() in name.lower()]
-        return matches[:25]
+        # Prefix matches first, then substrings; most-used names rank higher
+        return self.username_index.search(game_value, current, limit=25)
 
     # ---------------- Slash command (py-cord) ----------------
     @commands.slash_command(
@@ -97,17 +142,12 @@ class StatWrangler(commands.Cog):
         game = game.lower().strip()
         username = username.strip()
 
-        # Save username for that game if new
-        usernames = load_usernames()
-        game_usernames = usernames.get(game, [])
-
-        if username and username not in game_usernames:
-            game_usernames.append(username)
-            usernames[game] = game_usernames
-            save_usernames(usernames)
+        # Save username for that game if new (persisted in the background)
+        if username and self.usernames.add(game, username):
             logger.info("New username '%s' added to %s list.", username, game)
         else:
             logger.info("%s found in %s list", username, game)
+        self.username_index.touch(game, username)
 
         # Platform normalization (Siege needs it)
         if platform:
@@ -152,7 +192,15 @@ class StatWrangler(commands.Cog):
                 ranked_kd,
                 user_profile_img,
                 rank_img,
-            ) = await get_r6siege_player_data(username, platform)
+            ) = await self.stats_cache.get_or_fetch(
+                game,
+                platform,
+                username,
+                lambda: get_r6siege_player_data(username, platform),
+                # Never cache a failed scrape (all fields None)
+                cacheable=lambda result: bool(result) and any(result),
+            )
+            logger.info("Stats cache: %s", self.stats_cache.stats())
 
             kd = kd or "N/A"
             level = level or "N/A"
@@ -227,14 +275,9 @@ class StatWrangler(commands.Cog):
 
 
 def setup(bot: commands.Bot):
-    # Make sure logging is configured once in your main entrypoint (recommended),
-    # but leaving this safe here if you rely on it.
-    if not logging.getLogger().handlers:
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            datefmt="%I:%M:%S %p",
-        )
-
-    bot.add_cog(StatWrangler(bot))
+    # Logging is configured once by the entrypoint (configure_logging)
+    cog = StatWrangler(bot)
+    bot.add_cog(cog)
+    # py-cord 2.6 has no cog_load hook, so start background work here
+    cog.cog_load()
     # logger.info("StatWrangler Cog has been loaded.")
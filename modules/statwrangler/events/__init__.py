@@ -1,4 +1,8 @@
 # from .bot_init import on_ready_bot as on_ready_bot
+from .browser_pool import (
+    BrowserPool as BrowserPool,
+    get_browser_pool as get_browser_pool,
+)
 from .env_check import get_env_vars as get_env_vars
 from .fortnite.fort_scraper import get_fortnite_player_data as get_fortnite_player_data
 from .fortnite.link_gen import generate_link as generate_link
@@ -6,7 +10,11 @@ from .intents import botstuff as botstuff, intent as intent
 
 # from .key_hole import DISCORD_BOT_TOKEN
 from .r6.r6_scraper import get_r6siege_player_data as get_r6siege_player_data
+from .singleflight import SingleFlight as SingleFlight
+from .stats_cache import StatsCache as StatsCache
+from .username_index import UsernameIndex as UsernameIndex
 from .username_processor import (
+    UsernameStore as UsernameStore,
     file_path as file_path,
     load_usernames as load_usernames,
     save_usernames as save_usernames,
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page, Playwright
+
+logger = logging.getLogger("statwrangler.browser_pool")
+
+# Toggle this to True if you want to SEE the browser (helps diagnose bot protection)
+DEBUG_HEADFUL = False
+
+LAUNCH_ARGS = ["--no-sandbox"]
+
+
+def async_playwright():
+    # Imported on first use: Playwright is heavy and only scrapers need it
+    from playwright.async_api import async_playwright as _async_playwright
+
+    return _async_playwright()
+
+
+@dataclass
+class _BrowserSlot:
+    browser: Browser
+    pages_served: int = 0
+    active: int = 0
+    retired: bool = False
+
+
+def _descendant_rss_mb(root_pid: int | None = None) -> float:
+    """
+    Sum RSS (MB) of every process descended from root_pid (default: us).
+    Playwright's driver and the Chromium processes it launches are all
+    children of the bot, so this is the pool's memory footprint.
+    Linux-only (/proc); returns 0.0 elsewhere.
+    """
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return 0.0
+
+    root_pid = os.getpid() if root_pid is None else root_pid
+    children: dict[int, list[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            # ppid is the 2nd field after the ")" that closes the comm name
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            resident_pages = int((proc / str(pid) / "statm").read_text().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        total += resident_pages * page_size
+    return total / (1024 * 1024)
+
+
+class BrowserPool:
+    """
+    Bot-lifetime Chromium pool shared by the StatWrangler scrapers.
+
+    - One Playwright driver + one live browser instead of a launch per lookup.
+    - At most max_pages pages open at once; extra callers wait their turn.
+    - Each page gets a fresh context, so cookies/storage never leak between
+      lookups.
+    - The browser is recycled after recycle_after_pages pages or once the
+      browser process tree passes max_rss_mb. The old browser is closed once
+      its last in-flight page is released.
+    - Reference-counted: each owner (a StatWrangler cog, one per bot when
+      two bots share the process) attach()es and detach()es; the last detach
+      stops the pool, so one bot unloading never kills the other's pages.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_pages: int = 3,
+        recycle_after_pages: int = 50,
+        max_rss_mb: float = 1024,
+        headless: bool = not DEBUG_HEADFUL,
+    ) -> None:
+        self.max_pages = max(1, max_pages)
+        self.recycle_after_pages = recycle_after_pages
+        self.max_rss_mb = max_rss_mb
+        self.headless = headless
+
+        self._sem = asyncio.Semaphore(self.max_pages)
+        self._lock = asyncio.Lock()
+        self._playwright: Playwright | None = None
+        self._current: _BrowserSlot | None = None
+        self._slots: list[_BrowserSlot] = []
+        self._owners: set[object] = set()
+        self.launches = 0
+
+    @classmethod
+    def from_env(cls) -> BrowserPool:
+        return cls(
+            max_pages=int(os.getenv("STATWRANGLER_MAX_PAGES", "3")),
+            recycle_after_pages=int(
+                os.getenv("STATWRANGLER_BROWSER_RECYCLE_PAGES", "50")
+            ),
+            max_rss_mb=float(os.getenv("STATWRANGLER_BROWSER_MAX_RSS_MB", "1024")),
+        )
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+                await self._launch()
+                logger.info("browser pool started (max_pages=%d)", self.max_pages)
+
+    @property
+    def owners(self) -> int:
+        return len(self._owners)
+
+    def attach(self, owner: object) -> None:
+        """Count owner as a user of the pool (idempotent)."""
+        self._owners.add(owner)
+
+    async def detach(self, owner: object) -> None:
+        """Drop owner (idempotent); the last owner out stops the pool."""
+        if owner not in self._owners:
+            return
+        self._owners.discard(owner)
+        if not self._owners:
+            await self.stop()
+
+    async def stop(self) -> None:
+        async with self._lock:
+            for slot in self._slots:
+                await self._close_browser(slot)
+            self._slots.clear()
+            self._current = None
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception as e:
+                    logger.warning("playwright stop failed: %r", e)
+                self._playwright = None
+                logger.info("browser pool stopped")
+
+    @asynccontextmanager
+    async def page(self, **context_kwargs: Any) -> AsyncIterator[Page]:
+        """Yield a page in a fresh browser context; both are closed on exit."""
+        async with self._sem:
+            slot = await self._acquire()
+            try:
+                context = await slot.browser.new_context(**context_kwargs)
+                try:
+                    yield await context.new_page()
+                finally:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+            finally:
+                await self._release(slot)
+
+    async def _acquire(self) -> _BrowserSlot:
+        if not self.started:
+            await self.start()
+
+        async with self._lock:
+            slot = self._current
+            # Health check: a crashed/disconnected browser gets replaced
+            if slot is None or not slot.browser.is_connected():
+                if slot is not None:
+                    logger.warning("browser disconnected; relaunching")
+                    slot.retired = True
+                    await self._reap()
+                slot = await self._launch()
+            slot.active += 1
+            return slot
+
+    async def _release(self, slot: _BrowserSlot) -> None:
+        slot.active -= 1
+        slot.pages_served += 1
+
+        if not slot.retired:
+            reason = None
+            if self.recycle_after_pages and slot.pages_served >= (
+                self.recycle_after_pages
+            ):
+                reason = f"{slot.pages_served} pages served"
+            elif self.max_rss_mb:
+                rss = await asyncio.to_thread(_descendant_rss_mb)
+                if rss > self.max_rss_mb:
+                    reason = f"RSS {rss:.0f}MB > {self.max_rss_mb:.0f}MB"
+            if reason:
+                logger.info("recycling browser (%s)", reason)
+                slot.retired = True
+                async with self._lock:
+                    if self._current is slot:
+                        self._current = None
+
+        if slot.retired:
+            async with self._lock:
+                await self._reap()
+
+    async def _launch(self) -> _BrowserSlot:
+        assert self._playwright is not None
+        browser = await self._playwright.chromium.launch(
+            headless=self.headless, args=LAUNCH_ARGS
+        )
+        self.launches += 1
+        slot = _BrowserSlot(browser=browser)
+        self._slots.append(slot)
+        self._current = slot
+        return slot
+
+    async def _reap(self) -> None:
+        """Close retired browsers that no longer have pages in flight."""
+        for slot in [s for s in self._slots if s.retired and s.active <= 0]:
+            self._slots.remove(slot)
+            await self._close_browser(slot)
+
+    async def _close_browser(self, slot: _BrowserSlot) -> None:
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            logger.warning("browser close failed: %r", e)
+
+
+_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool shared by every scraper (configured from env)."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool.from_env()
+    return _pool
@@ -2,31 +2,21 @@ import asyncio
 import logging
 import random
 
-from playwright.async_api import async_playwright
+from ..browser_pool import get_browser_pool
+from ..scrape_metrics import timed_scrape
+
+logger = logging.getLogger("statwrangler.scraper.fortnite")
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%I:%M:%S %p",
-)
 
 CHROMIUM_PATH = "/usr/bin/chromium-browser"
 
 
+@timed_scrape("fortnite")
 async def get_fortnite_player_data(username: str):
-    browser = None
-
     try:
         url = f"https://fortnitetracker.com/profile/all/{username}"
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=["--no-sandbox"],
-            )
-            page = await browser.new_page()
-
+        async with get_browser_pool().page() as page:
             await page.goto(url, wait_until="domcontentloaded", timeout=60_000)
             # Rough equivalent to "waitForSelector('span')"
             await page.wait_for_selector("span", timeout=60_000)
@@ -71,7 +61,7 @@ async def get_fortnite_player_data(username: str):
                     playtime = playtime_text or "N/A"
 
             except Exception as e:
-                logging.warning(f"Failed to scrape player stats for {username}: {e!r}")
+                logger.warning("failed to scrape player stats for %s: %r", username, e)
 
             # --- Profile image ---
             try:
@@ -81,26 +71,21 @@ async def get_fortnite_player_data(username: str):
                     if src:
                         user_profile_img = src
             except Exception as e:
-                logging.warning(f"Failed to scrape profile image for {username}: {e!r}")
-
-            logging.info(f"{username} Fortnite Data Successfully Retrieved!")
-            logging.info(
-                f"    * KD: {kd}\n"
-                f"    * Level: {level}\n"
-                f"    * Playtime: {playtime}\n"
-                f"    * Profile Pic: {user_profile_img}"
+                logger.warning("failed to scrape profile image for %s: %r", username, e)
+
+            logger.info(
+                "extracted profile for %s",
+                username,
+                extra={
+                    "kd": kd,
+                    "level": level,
+                    "playtime": playtime,
+                    "profile_img": user_profile_img,
+                },
             )
 
             return kd, level, playtime, user_profile_img
 
     except Exception as e:
-        logging.error(f"Error in Playwright: {e!r}")
+        logger.error("error in Playwright: %r", e)
         return "N/A", "N/A", "N/A", "N/A"
-
-    finally:
-        # In case browser was created outside async-with due to future edits
-        if browser:
-            try:
-                await browser.close()
-            except Exception:
-                pass
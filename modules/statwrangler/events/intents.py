@@ -1,3 +1,5 @@
+from functools import cache
+
 import discord
 from discord.ext import commands
 
@@ -5,5 +7,9 @@ intent = discord.Intents.default()
 intent.message_content = True
 intent.members = True
 
-# Create an instance of Bot for slash commands
-botstuff = commands.Bot(command_prefix="!", intents=intent)
+
+@cache
+def botstuff() -> commands.Bot:
+    """Standalone Bot for slash commands, built on first use rather than at
+    import time (importing the extension shouldn't construct a second Bot)."""
+    return commands.Bot(command_prefix="!", intents=intent)
@@ -1,45 +1,33 @@
 import logging
 
-from playwright.async_api import (
-    TimeoutError as PlaywrightTimeoutError,
-    async_playwright,
-)
+from ..browser_pool import get_browser_pool
+from ..scrape_metrics import timed_scrape
+from ..singleflight import SingleFlight
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%I:%M:%S %p",
-)
+logger = logging.getLogger("statwrangler.scraper.siege")
 
-# Toggle this to True if you want to SEE the browser (helps diagnose bot protection)
-DEBUG_HEADFUL = False
+# Concurrent lookups of the same profile share one scrape
+_inflight = SingleFlight()
 
 
 async def get_r6siege_player_data(username: str, platform: str):
     url = f"https://r6.tracker.network/r6siege/profile/{platform}/{username}/overview"
+    return await _inflight.do(url.lower(), lambda: _scrape_profile(url))
 
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=(not DEBUG_HEADFUL),
-                args=["--no-sandbox"],
-            )
-
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                viewport={"width": 1280, "height": 720},
-                locale="en-US",
-            )
 
-            page = await context.new_page()
+@timed_scrape("siege")
+async def _scrape_profile(url: str):
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
+    try:
+        # Shared bot-lifetime browser; the context is closed when the block exits
+        async with get_browser_pool().page(
+            user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            viewport={"width": 1280, "height": 720},
+            locale="en-US",
+        ) as page:
             await page.goto(url, wait_until="domcontentloaded", timeout=60_000)
-            logging.info(f"[siege] title={await page.title()!r}")
-
-            # Always print what we actually loaded (helps a TON)
-            logging.info(
-                f"[siege] Loaded page title={await page.title()!r} url={page.url!r}"
-            )
+            logger.info("loaded page", extra={"url": page.url})
 
             # Don't use networkidle here; many modern sites never go idle.
             # Instead wait for "real content" indicators (text anchors).
@@ -49,18 +37,16 @@ async def get_r6siege_player_data(username: str, platform: str):
                     timeout=60_000,
                 )
             except PlaywrightTimeoutError:
-                html_head = (await page.content())[:2000]
-                logging.error(
-                    "[siege] Timed out waiting for page UI. Dumping HTML head:"
+                logger.error(
+                    "timed out waiting for page UI",
+                    extra={"url": page.url, "title": await page.title()},
                 )
-                print("\n--- PLAYWRIGHT DEBUG ---")
-                print("TITLE:", await page.title())
-                print("URL:", page.url)
-                print("HTML (first 2000 chars):\n", html_head)
-                print("--- END DEBUG ---\n")
-                await context.close()
-                await browser.close()
-                return None, None, None, None, None, None, None
+                # The HTML head is only fetched when someone asked for it
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "page HTML head", extra={"html": (await page.content())[:2000]}
+                    )
+                return None, None, None, None, None, None
 
             # ---- Extracts (keep your logic, but strip and guard) ----
             # kd = await page.evaluate(
@@ -121,10 +107,11 @@ async def get_r6siege_player_data(username: str, platform: str):
                     }"""
                 )
             except Exception:
-                logging.warning("[siege] Unable to retrieve ranked data")
+                logger.warning("unable to retrieve ranked data")
 
-            logging.info(
-                f"[siege] Extracted kd={kd!r} level={level!r} rank={rank!r} ranked_kd={ranked_kd!r}, ranked_img={rank_img}"
+            logger.info(
+                "extracted profile",
+                extra={"kd": kd, "level": level, "rank": rank, "ranked_kd": ranked_kd},
             )
 
             # use when playtime is a metric to be tracked again
@@ -132,13 +119,11 @@ async def get_r6siege_player_data(username: str, platform: str):
             #     f"[siege] Extracted kd={kd!r} level={level!r} playtime={playtime!r} rank={rank!r} ranked_kd={ranked_kd!r}"
             # )
 
-            await context.close()
-            await browser.close()
             return kd, level, rank, ranked_kd, user_profile_img, rank_img
 
             # add back when palytime can be used again
             # return kd, level, playtime, rank, ranked_kd, user_profile_img, rank_img
 
     except Exception as e:
-        logging.error(f"[siege] Error in Playwright: {e!r}")
-        return None, None, None, None, None, None, None
+        logger.error("error in Playwright: %r", e)
+        return None, None, None, None, None, None
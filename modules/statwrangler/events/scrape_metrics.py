@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from utils.metrics import REGISTRY
+
+T = TypeVar("T")
+
+SCRAPE_SECONDS = REGISTRY.histogram(
+    "statwrangler_scrape_seconds",
+    "Duration of one profile scrape, by game and outcome (ok/empty/error).",
+    ["game", "outcome"],
+)
+
+_EMPTY = (None, "", "N/A")
+
+
+def scrape_outcome(result: Any) -> str:
+    """'ok' if the scrape found anything, 'empty' if every field is blank."""
+    if isinstance(result, tuple | list):
+        return "ok" if any(v not in _EMPTY for v in result) else "empty"
+    return "empty" if result in _EMPTY else "ok"
+
+
+def timed_scrape(
+    game: str,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator: record a scraper coroutine's duration and outcome."""
+
+    def decorate(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            t0 = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await fn(*args, **kwargs)
+                outcome = scrape_outcome(result)
+                return result
+            finally:
+                SCRAPE_SECONDS.observe(
+                    time.perf_counter() - t0, game=game, outcome=outcome
+                )
+
+        return wrapper
+
+    return decorate
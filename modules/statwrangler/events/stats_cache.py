@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("statwrangler.cache")
+
+STORAGE_DIR = Path(__file__).resolve().parents[1] / "storage"
+CACHE_PATH = STORAGE_DIR / "stats_cache.sqlite3"
+
+# Seconds a result is considered fresh, per game
+DEFAULT_TTLS: dict[str, float] = {
+    "siege": 600,
+    "fortnite": 600,
+    "valorant": 600,
+}
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fetched_at: float
+
+
+class _DiskTier:
+    """Tiny sqlite key/value table. All methods are blocking; call off-loop."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fetched_at FROM stats_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return CacheEntry(value=json.loads(row[0]), fetched_at=row[1])
+        except ValueError:
+            return None
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stats_cache (key, value, fetched_at) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(entry.value), entry.fetched_at),
+            )
+
+    def prune(self, older_than: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM stats_cache WHERE fetched_at < ?", (older_than,)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StatsCache:
+    """
+    Two-tier TTL cache for game stat lookups.
+
+    - Keyed by (game, platform, normalized username).
+    - Memory tier: LRU of up to max_entries results.
+    - Disk tier: sqlite file, so warm results survive a restart.
+    - Within the game's TTL a hit is returned as-is. For stale_for seconds
+      past the TTL a stale hit is still returned instantly while a single
+      background refresh replaces it. Beyond that it's a miss.
+    - stats() exposes hit/miss counters for ops.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = CACHE_PATH,
+        *,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = 600,
+        stale_for: float = 3600,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stale_for = stale_for
+        self.max_entries = max_entries
+        self._clock = clock
+
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._disk = _DiskTier(path) if path is not None else None
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+        self.counters: dict[str, int] = {
+            "hits": 0,
+            "stale_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    @staticmethod
+    def make_key(game: str, platform: str | None, username: str) -> str:
+        return f"{game.strip().lower()}:{(platform or '-').lower()}:{username.strip().lower()}"
+
+    def ttl_for(self, game: str) -> float:
+        return self.ttls.get(game, self.default_ttl)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **self.counters,
+            "memory_entries": len(self._memory),
+            "refreshing": len(self._refreshing),
+        }
+
+    async def get_or_fetch(
+        self,
+        game: str,
+        platform: str | None,
+        username: str,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        cacheable: Callable[[Any], bool] = lambda v: v is not None,
+    ) -> Any:
+        """
+        Return the cached result for the key, calling fetch() on a miss.
+        Results failing cacheable() (e.g. a failed scrape) are returned but
+        never stored.
+        """
+        key = self.make_key(game, platform, username)
+        entry = await self._lookup(key)
+
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            ttl = self.ttl_for(game)
+            if age <= ttl:
+                self.counters["hits"] += 1
+                return entry.value
+            if age <= ttl + self.stale_for:
+                self.counters["stale_hits"] += 1
+                self._schedule_refresh(key, fetch, cacheable)
+                return entry.value
+
+        self.counters["misses"] += 1
+        value = await fetch()
+        if cacheable(value):
+            await self._store(key, value)
+        return value
+
+    async def close(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.close)
+            self._disk = None
+
+    async def prune(self) -> None:
+        """Drop disk entries too old to be served even as stale."""
+        if self._disk is None:
+            return
+        longest = max([self.default_ttl, *self.ttls.values()])
+        cutoff = self._clock() - (longest + self.stale_for)
+        await asyncio.to_thread(self._disk.prune, cutoff)
+
+    async def _lookup(self, key: str) -> CacheEntry | None:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        if self._disk is None:
+            return None
+        entry = await asyncio.to_thread(self._disk.get, key)
+        if entry is not None:
+            self.counters["disk_hits"] += 1
+            self._remember(key, entry)
+        return entry
+
+    async def _store(self, key: str, value: Any) -> None:
+        entry = CacheEntry(value=value, fetched_at=self._clock())
+        self._remember(key, entry)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.put, key, entry)
+            except Exception as e:
+                logger.warning("stats cache disk write failed: %r", e)
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                value = await fetch()
+                if cacheable(value):
+                    await self._store(key, value)
+                self.counters["refreshes"] += 1
+            except Exception as e:
+                self.counters["refresh_errors"] += 1
+                logger.warning("background refresh failed for %s: %r", key, e)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
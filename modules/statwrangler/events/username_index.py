@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from collections.abc import Callable, Collection, Iterable
+from dataclasses import dataclass, field
+
+NGRAM = 3
+
+# A lookup's weight halves every week, so recent names float to the top
+USAGE_HALF_LIFE_SECONDS = 7 * 24 * 3600
+
+
+@dataclass(slots=True)
+class _TrieNode:
+    children: dict[str, _TrieNode] = field(default_factory=dict)
+    # the name (lowercase) ending at this node, if any
+    name: str | None = None
+
+
+@dataclass
+class _NameStats:
+    display: str
+    seq: int  # insertion order, used as the final tie-break
+    uses: int = 0
+    last_used: float = 0.0
+
+
+class _GameIndex:
+    def __init__(self) -> None:
+        self.root = _TrieNode()
+        self.grams: dict[str, set[str]] = {}
+        # character -> the grams containing it, for 1-2 char queries
+        self.gram_chars: dict[str, set[str]] = {}
+        # in insertion (seq) order
+        self.stats: dict[str, _NameStats] = {}
+        # names looked up at least once; the only ones with a usage score
+        self.used: set[str] = set()
+
+    def add(self, name: str) -> bool:
+        key = name.lower()
+        if key in self.stats:
+            return False
+        self.stats[key] = _NameStats(display=name, seq=len(self.stats))
+
+        node = self.root
+        for ch in key:
+            node = node.children.setdefault(ch, _TrieNode())
+        node.name = key
+
+        # A name shorter than NGRAM is its own gram, so short queries find it
+        for i in range(max(1, len(key) - NGRAM + 1)):
+            gram = key[i : i + NGRAM]
+            keys = self.grams.get(gram)
+            if keys is None:
+                keys = self.grams[gram] = set()
+                for ch in gram:
+                    self.gram_chars.setdefault(ch, set()).add(gram)
+            keys.add(key)
+        return True
+
+    def prefix_matches(self, prefix: str) -> set[str]:
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        # Names live only at the node they end on: collect the subtree
+        out: set[str] = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.name is not None:
+                out.add(node.name)
+            stack.extend(node.children.values())
+        return out
+
+    def substring_matches(self, text: str) -> set[str]:
+        if len(text) < NGRAM:
+            # Every name containing text has a gram containing it; only the
+            # grams sharing text's first character need checking
+            out: set[str] = set()
+            for gram in self.gram_chars.get(text[0], ()):
+                if text in gram:
+                    out |= self.grams[gram]
+            return out
+
+        sets = [
+            self.grams.get(text[i : i + NGRAM], set())
+            for i in range(len(text) - NGRAM + 1)
+        ]
+        sets.sort(key=len)
+        candidates = set(sets[0]).intersection(*sets[1:])
+        # n-grams can match out of order; confirm the real substring
+        return {k for k in candidates if text in k}
+
+
+class UsernameIndex:
+    """
+    Per-game in-memory index for username autocomplete.
+
+    - Prefix lookups walk a lowercase trie whose nodes hold only the name
+      ending there.
+    - Substring lookups intersect 3-gram posting sets; 1-2 char queries
+      union the posting sets of the grams that contain them (found through
+      a character -> grams bucket) and take their prefix matches from
+      that union instead of walking the trie.
+    - Results rank prefix matches first, then by a usage score that rises
+      with each lookup of the name and decays over time.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.time) -> None:
+        self._games: dict[str, _GameIndex] = {}
+        self._clock = clock
+
+    @classmethod
+    def from_usernames(cls, usernames: dict[str, Iterable[str]]) -> UsernameIndex:
+        index = cls()
+        for game, names in usernames.items():
+            for name in names:
+                index.add(game, name)
+        return index
+
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        game, name = item
+        g = self._games.get(game)
+        return bool(g and name.lower() in g.stats)
+
+    def add(self, game: str, name: str) -> bool:
+        """Index a name; returns False if it was already present."""
+        name = name.strip()
+        if not name:
+            return False
+        return self._games.setdefault(game, _GameIndex()).add(name)
+
+    def touch(self, game: str, name: str) -> None:
+        """Record that name was looked up (adds it if new)."""
+        self.add(game, name)
+        g = self._games.get(game)
+        stats = g.stats.get(name.strip().lower()) if g else None
+        if stats is not None:
+            stats.uses += 1
+            stats.last_used = self._clock()
+            g.used.add(name.strip().lower())
+
+    def search(self, game: str, text: str, limit: int = 25) -> list[str]:
+        g = self._games.get(game)
+        if g is None:
+            return []
+
+        text = text.strip().lower()
+        if not text:
+            return self._top(g, g.stats.keys(), limit)
+
+        if len(text) < NGRAM:
+            # A short query's substring matches already hold its prefix
+            # matches, and filtering them beats collecting a large subtree
+            matches = g.substring_matches(text)
+            prefixed = {k for k in matches if k.startswith(text)}
+        else:
+            matches = None
+            prefixed = g.prefix_matches(text)
+        ranked = self._top(g, prefixed, limit)
+        if len(ranked) < limit:
+            if matches is None:
+                matches = g.substring_matches(text)
+            ranked += self._top(g, matches - prefixed, limit - len(ranked))
+        return ranked
+
+    def _score(self, stats: _NameStats, now: float) -> float:
+        if not stats.uses:
+            return 0.0
+        age = max(0.0, now - stats.last_used)
+        return stats.uses * 0.5 ** (age / USAGE_HALF_LIFE_SECONDS)
+
+    def _top(self, g: _GameIndex, keys: Collection[str], limit: int) -> list[str]:
+        now = self._clock()
+        used = [k for k in g.used if k in keys]
+        best = heapq.nsmallest(
+            limit,
+            (g.stats[k] for k in used),
+            key=lambda s: (-self._score(s, now), s.seq),
+        )
+        # The rest score 0 and rank by insertion order alone
+        n = limit - len(best)
+        if n > 0:
+            unused = len(keys) - len(used)
+            if unused * unused > n * len(g.stats):
+                # Dense matches: the first n met in insertion order win, long
+                # before the whole game is walked
+                fill = itertools.islice(
+                    (k for k in g.stats if k in keys and k not in g.used), n
+                )
+            else:
+                fill = heapq.nsmallest(
+                    n,
+                    (k for k in keys if k not in g.used),
+                    key=lambda k: g.stats[k].seq,
+                )
+            best += [g.stats[k] for k in fill]
+        return [s.display for s in best]
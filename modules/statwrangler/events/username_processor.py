@@ -1,16 +1,122 @@
+from __future__ import annotations
+
+import asyncio
 import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger("statwrangler.usernames")
 
 file_path = "/home/bot-vm/code/guildpilot/modules/statwrangler/json/usernames.json"
 
 
-def load_usernames():
+def load_usernames(path: str | Path = file_path):
     try:
-        with open(file_path) as file:
+        with open(path) as file:
             return json.load(file)
     except (FileNotFoundError, json.JSONDecodeError):
         return {}
 
 
-def save_usernames(usernames):
-    with open(file_path, "w") as file:
-        json.dump(usernames, file, indent=4)
+def save_usernames(usernames, path: str | Path = file_path):
+    """Write atomically (temp file + rename) so a crash never leaves half a file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(usernames, file, indent=4)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class UsernameStore:
+    """
+    In-memory username store backed by usernames.json.
+
+    - Each game maps to an insertion-ordered set (dict keys), so membership
+      checks are O(1) and the on-disk list order is preserved.
+    - add() never touches disk; it schedules a flush after `debounce` seconds,
+      coalescing a burst of new names into one write.
+    - Writes are atomic and run in a worker thread, off the event loop.
+    - flush() writes any pending changes now (call it on shutdown).
+    """
+
+    def __init__(self, path: str | Path = file_path, *, debounce: float = 5.0):
+        self.path = path
+        self.debounce = debounce
+
+        raw = load_usernames(path)
+        self._games: dict[str, dict[str, None]] = {}
+        if isinstance(raw, dict):
+            for game, names in raw.items():
+                if isinstance(names, list):
+                    self._games[game] = dict.fromkeys(str(n) for n in names)
+
+        self._dirty = False
+        self._flush_task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+        self.writes = 0
+
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        game, name = item
+        return name in self._games.get(game, {})
+
+    def get(self, game: str) -> list[str]:
+        return list(self._games.get(game, {}))
+
+    def as_dict(self) -> dict[str, list[str]]:
+        return {game: list(names) for game, names in self._games.items()}
+
+    def add(self, game: str, name: str) -> bool:
+        """Add name to game; returns False if it was already stored."""
+        names = self._games.setdefault(game, {})
+        if name in names:
+            return False
+        names[name] = None
+        self._dirty = True
+        self._schedule_flush()
+        return True
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    async def flush(self) -> None:
+        # A pending timer is only ever cancelled while sleeping; once it starts
+        # writing it clears _flush_task and we simply queue behind its lock.
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._write()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._debounced_flush()
+            )
+
+    async def _debounced_flush(self) -> None:
+        await asyncio.sleep(self.debounce)
+        self._flush_task = None
+        await self._write()
+
+    async def _write(self) -> None:
+        async with self._write_lock:
+            if not self._dirty:
+                return
+            snapshot = self.as_dict()
+            self._dirty = False
+            try:
+                await asyncio.to_thread(save_usernames, snapshot, self.path)
+                self.writes += 1
+            except Exception as e:
+                self._dirty = True
+                logger.error("Failed to save usernames to %s: %r", self.path, e)
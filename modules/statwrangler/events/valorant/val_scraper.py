@@ -3,20 +3,17 @@ import logging
 # import asyncio
 import re
 
-from playwright.async_api import async_playwright
+from ..browser_pool import get_browser_pool
+from ..scrape_metrics import timed_scrape
+
+logger = logging.getLogger("statwrangler.scraper.valorant")
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%I:%M:%S %p",
-)
 
 CHROMIUM_PATH = "/usr/bin/chromium-browser"
 
 
+@timed_scrape("valorant")
 async def get_val_player_data(username: str):
-    browser = None
     rank = ranked_kd = rank_img = None
 
     try:
@@ -28,13 +25,7 @@ async def get_val_player_data(username: str):
 
         url = f"https://tracker.gg/valorant/profile/riot/{riot_name}%23{playercode}/overview"
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=["--no-sandbox"],
-            )
-            page = await browser.new_page()
-
+        async with get_browser_pool().page() as page:
             await page.goto(url, wait_until="domcontentloaded", timeout=60_000)
             await page.wait_for_selector("span", timeout=60_000)
 
@@ -91,33 +82,23 @@ async def get_val_player_data(username: str):
                 )
 
             except Exception:
-                logging.warning("Unable to retrieve ranked data")
-
-            # Log extracted data
-            elements = {"KD": kd, "Level": level, "Rank": rank, "Ranked KD": ranked_kd}
-            img_elements = {
-                "Player Profile Pic": user_profile_img,
-                "Ranked Image": rank_img,
-            }
-
-            logging.info(f"{riot_name} Valorant Data Successfully Found!")
-            for key, value in elements.items():
-                if value:
-                    logging.info(f"    *    {key}: {value}")
-            for key, value in img_elements.items():
-                if value and len(value) > 10:
-                    logging.info(f"    *    {key}: URL has been grabbed")
+                logger.warning("unable to retrieve ranked data")
+
+            logger.info(
+                "extracted profile for %s",
+                riot_name,
+                extra={
+                    "kd": kd,
+                    "level": level,
+                    "rank": rank,
+                    "ranked_kd": ranked_kd,
+                    "has_profile_img": bool(user_profile_img),
+                    "has_rank_img": bool(rank_img),
+                },
+            )
 
             return kd, level, rank, ranked_kd, user_profile_img, rank_img
 
     except Exception as e:
-        logging.error(f"Error in Playwright: {e!r}")
+        logger.error("error in Playwright: %r", e)
         return None, None, None, None, None, None
-
-    finally:
-        # (async with closes it, but keep this as a safety net)
-        if browser:
-            try:
-                await browser.close()
-            except Exception:
-                pass
@@ -0,0 +1,84 @@
+"""
+Smoke tests for the offline cog benchmarks (benchmarks/cogs.py).
+
+Goal:
+- Keep every benchmark case runnable as the cogs change: each one drives
+  its handler through the fakes without errors.
+- Confirm baseline comparison flags real regressions but not sub-ms jitter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from benchmarks.cogs import CASES, BenchConfig, run_benchmarks
+from benchmarks.harness import BenchResult, compare, load_baseline, save_baseline
+
+_TINY = BenchConfig(
+    llm_first_token_ms=0.0,
+    llm_chunks=3,
+    scrape_ms=0.0,
+    guilds=20,
+    members=30,
+    usernames=50,
+)
+
+
+def _result(name: str, *, p99_ms: float, throughput: float) -> BenchResult:
+    return BenchResult(
+        name=name,
+        concurrency=4,
+        iterations=100,
+        seconds=1.0,
+        throughput=throughput,
+        p50_ms=p99_ms / 2,
+        p99_ms=p99_ms,
+    )
+
+
+def test_every_case_runs_cleanly() -> None:
+    results = asyncio.run(
+        run_benchmarks(
+            cases=list(CASES), concurrency=[1, 4], iterations=6, config=_TINY
+        )
+    )
+
+    assert len(results) == 2 * len(CASES)
+    for r in results:
+        assert r.errors == 0, r.key
+        assert r.throughput > 0, r.key
+
+
+def test_compare_flags_regressions(tmp_path: Path) -> None:
+    path = tmp_path / "baseline.json"
+    save_baseline(path, [_result("slow", p99_ms=10.0, throughput=100.0)])
+    baseline = load_baseline(path)
+
+    assert (
+        compare(
+            [_result("slow", p99_ms=11.0, throughput=95.0)], baseline, tolerance=0.25
+        )
+        == []
+    )
+    assert (
+        len(
+            compare(
+                [_result("slow", p99_ms=20.0, throughput=50.0)],
+                baseline,
+                tolerance=0.25,
+            )
+        )
+        == 2
+    )
+
+
+def test_compare_ignores_sub_millisecond_jitter() -> None:
+    baseline = {"fast@c4": {"p99_ms": 0.02, "throughput": 1000.0, "errors": 0}}
+
+    assert (
+        compare(
+            [_result("fast", p99_ms=0.05, throughput=1000.0)], baseline, tolerance=0.25
+        )
+        == []
+    )
@@ -0,0 +1,20 @@
+"""
+Smoke tests for the registry loading benchmark (benchmarks/registry.py).
+
+Goal:
+- Every loader runs on every registry shape and they all find the same ids.
+"""
+
+from __future__ import annotations
+
+from benchmarks.registry import METHODS, SHAPES, format_load_results, run
+
+
+def test_every_loader_and_shape_runs() -> None:
+    results = run(sizes=[50], shapes=list(SHAPES), rounds=1)
+
+    assert len(results) == len(SHAPES) * len(METHODS)
+    by_method = {r.method: r for r in results if r.shape == "servers"}
+    assert by_method["GuildIdArray"].kept_kb < by_method["sorted list"].kept_kb
+    assert by_method["stream"].lookup_ns is None
+    assert "GuildIdArray" in format_load_results(results)
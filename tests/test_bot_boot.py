@@ -0,0 +1,49 @@
+"""
+Boot-cost tests for modules/bot/main.py.
+
+Goal:
+- Building a bot must not import Playwright or the OpenAI SDK; those load
+  on first use (first scrape / first completion).
+- build_bot records an import/setup timeline for every extension.
+
+Runs in a subprocess so modules already imported by other tests don't
+hide a regression.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import json, sys
+from modules.bot.main import MODULES_PUBLIC, build_bot
+
+bot = build_bot(flavor="public")
+print(json.dumps({
+    "heavy": sorted(m for m in ("openai", "playwright") if m in sys.modules),
+    "timeline": [t.name for t in bot.boot_timeline],
+    "expected": [name for name, _ in MODULES_PUBLIC],
+    "ms_ok": all(t.import_ms >= 0 and t.setup_ms >= 0 for t in bot.boot_timeline),
+}))
+"""
+
+
+def test_build_bot_defers_heavy_imports_and_records_timeline() -> None:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert result["heavy"] == []
+    assert result["timeline"] == result["expected"]
+    assert result["ms_ok"]
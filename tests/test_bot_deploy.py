@@ -0,0 +1,80 @@
+"""
+Unit tests for modules/bot/deploy.py.
+
+Goal:
+- Startup deployment must not block the caller (on_ready returns at once).
+- Progress/status must be queryable while it runs, and it must be
+  cancellable on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from modules.bot.deploy import DeploymentJob
+
+
+def _fake_bot(guild_ids: list[int], sync_delay: float) -> MagicMock:
+    guilds = {gid: SimpleNamespace(id=gid, name=f"Guild {gid}") for gid in guild_ids}
+    bot = MagicMock()
+    bot.guilds = list(guilds.values())
+    bot.get_guild.side_effect = guilds.get
+    bot.pending_application_commands = []
+
+    async def sync_commands(guild_ids):
+        await asyncio.sleep(sync_delay)
+
+    bot.sync_commands = sync_commands
+    return bot
+
+
+def _job(tmp_path, bot, ids: list[int]) -> DeploymentJob:
+    registry = tmp_path / "public_guilds.json"
+    registry.write_text(json.dumps({"servers": [{"id": gid} for gid in ids]}))
+    return DeploymentJob(bot, registry_path=registry, tag="test", concurrency=2)
+
+
+def test_start_returns_immediately_and_reports_progress(tmp_path) -> None:
+    async def scenario() -> None:
+        bot = _fake_bot([1, 2, 3], sync_delay=0.02)
+        job = _job(tmp_path, bot, [1, 2, 3, 4])
+
+        job.start()
+        assert job.running
+        assert job.status()["state"] == "running"
+
+        await job.wait()
+        st = job.status()
+        assert st["state"] == "done"
+        assert (st["completed"], st["total"]) == (4, 4)
+        assert (st["ok"], st["skipped"], st["errors"]) == (3, 1, 0)
+        assert st["finished_at_utc"] is not None
+
+    asyncio.run(scenario())
+
+
+def test_start_is_idempotent(tmp_path) -> None:
+    async def scenario() -> None:
+        job = _job(tmp_path, _fake_bot([1], sync_delay=0), [1])
+        assert job.start() is job.start()
+        await job.wait()
+
+    asyncio.run(scenario())
+
+
+def test_cancel_stops_in_flight_deployment(tmp_path) -> None:
+    async def scenario() -> None:
+        bot = _fake_bot([1, 2], sync_delay=10)
+        job = _job(tmp_path, bot, [1, 2])
+
+        job.start()
+        await asyncio.sleep(0.01)
+        await job.cancel()
+
+        assert not job.running
+        assert job.status()["state"] == "cancelled"
+
+    asyncio.run(scenario())
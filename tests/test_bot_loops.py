@@ -0,0 +1,88 @@
+"""
+Unit tests for modules/bot/loops.py and the loop comparison benchmark.
+
+Goal:
+- --loop uvloop falls back to asyncio when uvloop isn't installed, and an
+  unknown loop name is rejected, including one given through EVENT_LOOP.
+- Shard workers inherit the supervisor's loop choice.
+- benchmarks/loops.py runs the cog cases once per loop and tabulates them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import sys
+
+import pytest
+
+from benchmarks.cogs import BenchConfig
+from benchmarks.loops import format_comparison, run_under_loops
+from modules.bot import loops, main
+from modules.bot.shards import ShardSupervisor
+
+
+def test_asyncio_loop_runs_coroutine() -> None:
+    async def scenario() -> str:
+        await asyncio.sleep(0)
+        return loops.current_loop_name()
+
+    assert loops.run(scenario(), loop="asyncio") == "asyncio"
+
+
+def test_uvloop_falls_back_when_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "uvloop", None)  # import raises ImportError
+
+    assert loops.loop_factory("uvloop") == ("asyncio", None)
+
+    async def scenario() -> str:
+        return loops.current_loop_name()
+
+    assert loops.run(scenario(), loop="uvloop") == "asyncio"
+
+
+def test_unknown_loop_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        loops.loop_factory("trio")
+
+
+def test_unknown_event_loop_env_is_rejected(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setenv("EVENT_LOOP", "trio")
+    monkeypatch.setattr(sys, "argv", ["main.py", "--flavor", "public"])
+
+    with pytest.raises(SystemExit) as exc:
+        main.main()
+
+    assert exc.value.code == 2
+    assert "EVENT_LOOP: invalid choice 'trio'" in capsys.readouterr().err
+
+
+def test_shard_workers_get_the_loop_choice() -> None:
+    sup = ShardSupervisor([0, 1], 2, loop="uvloop")
+    assert sup._spawn.keywords == {"loop": "uvloop"}
+
+
+def test_comparison_runs_each_loop() -> None:
+    config = BenchConfig(
+        llm_first_token_ms=0.0, scrape_ms=0.0, guilds=5, members=5, usernames=10
+    )
+    best = run_under_loops(
+        cases=["rolecop.user_roles"],
+        concurrency=[2],
+        iterations=10,
+        config=config,
+        loop_names=("asyncio",),
+        rounds=2,
+    )
+    result = best["asyncio"]["rolecop.user_roles@c2"]
+    assert result.iterations == 10 and result.errors == 0
+
+    faster = dataclasses.replace(
+        result, throughput=result.throughput * 2, p99_ms=result.p99_ms / 2
+    )
+    table = format_comparison({result.key: result}, {result.key: faster})
+    row = table.splitlines()[1]
+    assert row.startswith("rolecop.user_roles@c2")
+    assert "+100.0%" in row and "-50.0%" in row
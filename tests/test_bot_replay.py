@@ -0,0 +1,199 @@
+"""
+Unit tests for modules/bot/recorder.py and the replay harness
+(benchmarks/replay.py).
+
+Goal:
+- Recordings roundtrip: what the recorder tees off the parser table comes
+  back out of iter_recording, with message content redacted by default.
+- Redaction also covers interaction string options, embeds and attachment
+  URLs, and usernames/nicknames in member and GUILD_CREATE payloads, while
+  ids, types and lengths survive.
+- A synthetic recording replays into a build_bot bot with the network
+  stubbed, and every listener runs without errors.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.replay import replay_file
+from benchmarks.synthetic import synthesize_recording
+from modules.bot.recorder import GatewayRecorder, iter_recording, read_header
+
+_USER = {"id": "9", "username": "pilot", "global_name": "Ace", "avatar": None}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_recorder_tees_parsed_events_to_file(tmp_path: Path) -> None:
+    parsed: list[dict] = []
+    bot = SimpleNamespace(
+        _connection=SimpleNamespace(
+            parsers={
+                "MESSAGE_CREATE": parsed.append,
+                "TYPING_START": parsed.append,
+            }
+        )
+    )
+    clock = _Clock()
+    path = tmp_path / "rec.jsonl.gz"
+    recorder = GatewayRecorder(path, clock=clock)
+    recorder.install(bot, flavor="dev")
+
+    bot._connection.parsers["MESSAGE_CREATE"]({"id": "1", "content": "secret"})
+    clock.now += 0.25
+    bot._connection.parsers["MESSAGE_CREATE"]({"id": "2", "content": "hi"})
+    bot._connection.parsers["TYPING_START"]({"user_id": "3"})  # not recorded
+    recorder.close()
+
+    # The bot still parses the original, unredacted payloads
+    assert [d["content"] for d in parsed[:2]] == ["secret", "hi"]
+    assert read_header(path)["flavor"] == "dev"
+
+    events = list(iter_recording(path))
+    assert [(e.t, e.event, e.data["content"]) for e in events] == [
+        (0.0, "MESSAGE_CREATE", "xxxxxx"),
+        (0.25, "MESSAGE_CREATE", "xx"),
+    ]
+
+
+def _record(tmp_path: Path, event: str, data: dict) -> dict:
+    recorder = GatewayRecorder(tmp_path / "rec.jsonl.gz", clock=_Clock())
+    recorder.open()
+    recorder.record(event, data)
+    recorder.close()
+    (recorded,) = iter_recording(recorder.path)
+    return recorded.data
+
+
+def test_redacts_interaction_string_options(tmp_path: Path) -> None:
+    data = {
+        "id": "1",
+        "type": 2,
+        "member": {"nick": "Maverick", "user": _USER, "roles": []},
+        "data": {
+            "name": "ask-the-pilot",
+            "options": [
+                {"name": "question", "type": 3, "value": "my secret plan"},
+                {"name": "target", "type": 6, "value": "9"},
+                {
+                    "name": "sub",
+                    "type": 1,
+                    "options": [{"name": "q", "type": 3, "value": "nested"}],
+                },
+            ],
+            "resolved": {"users": {"9": _USER}},
+        },
+    }
+
+    out = _record(tmp_path, "INTERACTION_CREATE", data)
+
+    options = out["data"]["options"]
+    assert options[0] == {"name": "question", "type": 3, "value": "x" * 14}
+    assert options[1]["value"] == "9"  # a user id, not text
+    assert options[2]["options"][0]["value"] == "xxxxxx"
+    assert out["member"]["nick"] == "xxxxxxxx"
+    assert out["data"]["resolved"]["users"]["9"]["username"] == "xxxxx"
+    # The bot parsed the original
+    assert data["data"]["options"][0]["value"] == "my secret plan"
+
+
+def test_redacts_message_embeds_and_attachments(tmp_path: Path) -> None:
+    data = {
+        "id": "1",
+        "content": "see attached",
+        "author": _USER,
+        "embeds": [
+            {
+                "type": "rich",
+                "title": "Flight plan",
+                "fields": [{"name": "Route", "value": "KSEA-KPDX"}],
+                "color": 5,
+            }
+        ],
+        "attachments": [
+            {
+                "id": "2",
+                "filename": "plan.pdf",
+                "size": 10,
+                "url": "https://cdn.discordapp.com/attachments/1/2/plan.pdf",
+                "proxy_url": "https://media.discordapp.net/attachments/1/2/plan.pdf",
+            }
+        ],
+        "referenced_message": {"id": "0", "content": "original", "author": _USER},
+    }
+
+    out = _record(tmp_path, "MESSAGE_CREATE", data)
+
+    embed = out["embeds"][0]
+    assert embed["type"] == "rich" and embed["color"] == 5
+    assert embed["title"] == "x" * 11
+    assert embed["fields"] == [{"name": "xxxxx", "value": "x" * 9}]
+    attachment = out["attachments"][0]
+    assert "discordapp" not in attachment["url"] + attachment["proxy_url"]
+    assert attachment["filename"] == "xxxxxxxx"
+    assert (attachment["id"], attachment["size"]) == ("2", 10)
+    assert out["author"] == {**_USER, "username": "xxxxx", "global_name": "xxx"}
+    assert out["referenced_message"]["content"] == "xxxxxxxx"
+    # Nested payloads the bot still parses are left alone
+    assert data["referenced_message"]["content"] == "original"
+
+
+def test_redacts_member_identities(tmp_path: Path) -> None:
+    member = {"user": _USER, "nick": "Maverick", "roles": ["3"], "joined_at": "t"}
+    guild = {"id": "5", "name": "Hangar", "members": [member]}
+
+    created = _record(tmp_path, "GUILD_CREATE", guild)
+    updated = _record(tmp_path, "GUILD_MEMBER_UPDATE", {"guild_id": "5", **member})
+
+    (m,) = created["members"]
+    assert (m["nick"], m["user"]["username"], m["user"]["global_name"]) == (
+        "xxxxxxxx",
+        "xxxxx",
+        "xxx",
+    )
+    assert (m["user"]["id"], m["roles"], created["id"]) == ("9", ["3"], "5")
+    assert updated["nick"] == "xxxxxxxx"
+    assert updated["user"]["username"] == "xxxxx"
+
+
+def test_recorder_from_env_fills_in_flavor(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("GATEWAY_RECORD", raising=False)
+    assert GatewayRecorder.from_env("dev") is None
+
+    monkeypatch.setenv("GATEWAY_RECORD", str(tmp_path / "{flavor}.jsonl.gz"))
+    monkeypatch.setenv("GATEWAY_RECORD_EVENTS", "message_create")
+    recorder = GatewayRecorder.from_env("public")
+    assert recorder is not None
+    assert recorder.path == tmp_path / "public.jsonl.gz"
+    assert recorder.events == {"MESSAGE_CREATE"}
+
+
+def test_synthetic_recording_replays_without_listener_errors(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.jsonl.gz"
+    written = synthesize_recording(path, guilds=2, members=5, events=80)
+
+    report = asyncio.run(replay_file(path, speed=None, llm_ms=0.0, scrape_ms=0.0))
+
+    assert report.events == written
+    listeners = {s.name: s for s in report.listeners}
+    assert all(s.errors == 0 for s in report.listeners), [
+        (s.name, s.first_error) for s in report.listeners if s.errors
+    ]
+    messages = report.parse["MESSAGE_CREATE"][0]
+    assert listeners["PilotAI.on_message"].calls == messages
+    interactions = report.parse["INTERACTION_CREATE"][0]
+    assert listeners["ShutdownCoordinator.handle_interaction"].calls == interactions
+    # Every interaction was answered through the stubbed webhook adapter
+    callbacks = report.rest_calls[
+        "POST /interactions/{webhook_id}/{webhook_token}/callback"
+    ]
+    assert callbacks == interactions
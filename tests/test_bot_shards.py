@@ -0,0 +1,138 @@
+"""
+Unit tests for modules/bot/shards.py.
+
+Goal:
+- Shard planning: --shard-ids parsing and splitting shards over workers.
+- Each shard group gets its own registry file so processes don't collide.
+- The supervisor restarts only the worker that crashed, with backoff, and
+  leaves cleanly-exited workers alone.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from modules.bot.shards import (
+    ShardSupervisor,
+    parse_shard_ids,
+    plan_workers,
+    shard_for_guild,
+    shard_registry_path,
+)
+
+
+class _FakeProcess:
+    def __init__(self) -> None:
+        self.exitcode: int | None = None
+        self.alive = False
+        self.terminated = False
+
+    def start(self) -> None:
+        self.alive = True
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def exit(self, code: int) -> None:
+        self.alive = False
+        self.exitcode = code
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.exit(-15)
+
+    def kill(self) -> None:
+        self.exit(-9)
+
+    def join(self, timeout: float | None = None) -> None:
+        pass
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _supervisor(clock: _Clock, spawned: list, **kwargs) -> ShardSupervisor:
+    def spawn(index, shard_ids, shard_count, force_sync):
+        proc = _FakeProcess()
+        spawned.append((index, shard_ids, proc))
+        return proc
+
+    return ShardSupervisor(
+        [0, 1, 2, 3], 4, spawn=spawn, clock=clock, min_backoff=1.0, **kwargs
+    )
+
+
+def test_parse_shard_ids_ranges_and_bounds() -> None:
+    assert parse_shard_ids("0,2,4-6", 8) == [0, 2, 4, 5, 6]
+    with pytest.raises(ValueError):
+        parse_shard_ids("7-8", 8)
+
+
+def test_plan_workers_splits_evenly() -> None:
+    assert plan_workers([0, 1, 2, 3, 4], 2) == [[0, 1, 2], [3, 4]]
+    assert plan_workers([0, 1], 5) == [[0], [1]]
+
+
+def test_shard_registry_path_is_per_shard_group() -> None:
+    base = Path("/x/public_guilds.json")
+    assert shard_registry_path(base, [0, 1]).name == "public_guilds.shard-0-1.json"
+    assert shard_for_guild(175928847299117063, 4) == (175928847299117063 >> 22) % 4
+
+
+def test_supervisor_restarts_only_the_crashed_worker() -> None:
+    clock, spawned = _Clock(), []
+    sup = _supervisor(clock, spawned, workers=2)
+    sup.start()
+    assert [(i, ids) for i, ids, _ in spawned] == [(0, [0, 1]), (1, [2, 3])]
+
+    spawned[1][2].exit(1)
+    clock.now = 0.5
+    sup.poll()
+    assert len(spawned) == 2  # waiting out the backoff
+
+    clock.now = 2.0
+    sup.poll()
+    assert len(spawned) == 3
+    assert spawned[2][:2] == (1, [2, 3])
+    assert sup.workers[1].restarts == 1
+    assert sup.workers[0].restarts == 0
+    assert spawned[0][2].is_alive()
+
+
+def test_backoff_grows_for_crash_loops() -> None:
+    clock, spawned = _Clock(), []
+    sup = _supervisor(clock, spawned, workers=1, stable_after=60)
+    sup.start()
+
+    backoffs = []
+    for _ in range(3):
+        spawned[-1][2].exit(1)
+        sup.poll()
+        backoffs.append(sup.workers[0].backoff)
+        clock.now += sup.workers[0].backoff
+        sup.poll()
+
+    assert backoffs == [1.0, 2.0, 4.0]
+
+
+def test_clean_exit_is_not_restarted_and_stop_terminates() -> None:
+    clock, spawned = _Clock(), []
+    sup = _supervisor(clock, spawned, workers=2)
+    sup.start()
+
+    spawned[0][2].exit(0)
+    clock.now = 100
+    sup.poll()
+    assert sup.workers[0].finished
+    assert len(spawned) == 2
+    assert not sup.done
+
+    sup.stop()
+    assert spawned[1][2].terminated
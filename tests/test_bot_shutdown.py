@@ -0,0 +1,217 @@
+"""
+Unit tests for modules/bot/shutdown.py and RoleCop's pending-approval store.
+
+Goal:
+- Once shutdown starts, new interactions get a notice instead of running.
+- In-flight commands finish before cog hooks run and the bot closes.
+- A command that outlives the drain deadline doesn't block shutdown, and a
+  failing or hanging hook doesn't stop the others.
+- Pending approvals survive a save/load roundtrip, and a decided request
+  leaves the saved file straight away (not only at shutdown).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+from benchmarks.fakes import FakeBot, FakeMember, make_guild
+from modules.bot.shutdown import DRAINING_NOTICE, ShutdownCoordinator
+from modules.rolecop.cog import RoleCopCog
+from modules.rolecop.core.approvals import ApprovalRequest
+from modules.rolecop.core.config_loader import (
+    load_pending_approvals,
+    save_pending_approvals,
+)
+
+
+class _FakeBot:
+    def __init__(self, command_seconds: float = 0.0) -> None:
+        self.command_seconds = command_seconds
+        self.cogs: dict[str, object] = {}
+        self.events: list[str] = []
+        self.deploy_job = None
+        self._closed = False
+
+    async def process_application_commands(self, interaction) -> None:
+        self.events.append("command started")
+        await asyncio.sleep(self.command_seconds)
+        self.events.append("command finished")
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    async def close(self) -> None:
+        self.events.append("closed")
+        self._closed = True
+
+
+class _Cog:
+    def __init__(self, bot: _FakeBot, name: str, behavior: str = "ok") -> None:
+        self.bot = bot
+        self.name = name
+        self.behavior = behavior
+
+    async def graceful_shutdown(self) -> None:
+        self.bot.events.append(f"hook {self.name}")
+        if self.behavior == "fail":
+            raise RuntimeError("boom")
+        if self.behavior == "hang":
+            await asyncio.sleep(60)
+
+
+def _interaction() -> MagicMock:
+    interaction = MagicMock(spec=discord.Interaction)
+    interaction.type = discord.InteractionType.application_command
+    interaction.response = AsyncMock()
+    return interaction
+
+
+def test_install_routes_interactions_through_coordinator() -> None:
+    bot = _FakeBot()
+    coordinator = ShutdownCoordinator(bot)  # type: ignore[arg-type]
+    coordinator.install()
+    assert bot.on_interaction == coordinator.handle_interaction
+
+
+def test_in_flight_commands_drain_before_hooks_and_close() -> None:
+    async def scenario() -> None:
+        bot = _FakeBot(command_seconds=0.05)
+        bot.cogs = {"A": _Cog(bot, "A")}
+        coordinator = ShutdownCoordinator(bot, drain_timeout=1.0)  # type: ignore[arg-type]
+
+        running = asyncio.create_task(coordinator.handle_interaction(_interaction()))
+        await asyncio.sleep(0)
+        assert coordinator.in_flight == 1
+
+        await coordinator.shutdown("test")
+        await running
+
+        assert bot.events == ["command started", "command finished", "hook A", "closed"]
+        assert coordinator.done
+
+    asyncio.run(scenario())
+
+
+def test_new_interactions_are_rejected_while_closing() -> None:
+    async def scenario() -> None:
+        bot = _FakeBot()
+        coordinator = ShutdownCoordinator(bot)  # type: ignore[arg-type]
+        await coordinator.shutdown("test")
+
+        interaction = _interaction()
+        await coordinator.handle_interaction(interaction)
+
+        assert "command started" not in bot.events
+        assert coordinator.rejected == 1
+        interaction.response.send_message.assert_awaited_once_with(
+            DRAINING_NOTICE, ephemeral=True
+        )
+
+    asyncio.run(scenario())
+
+
+def test_drain_deadline_and_bad_hooks_do_not_block_shutdown() -> None:
+    async def scenario() -> None:
+        bot = _FakeBot(command_seconds=60)
+        bot.cogs = {
+            "Fails": _Cog(bot, "fails", "fail"),
+            "Hangs": _Cog(bot, "hangs", "hang"),
+            "Ok": _Cog(bot, "ok"),
+        }
+        coordinator = ShutdownCoordinator(
+            bot,  # type: ignore[arg-type]
+            drain_timeout=0.05,
+            hook_timeout=0.05,
+        )
+
+        running = asyncio.create_task(coordinator.handle_interaction(_interaction()))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(coordinator.shutdown("test"), timeout=2)
+        running.cancel()
+
+        assert bot.events[-4:] == ["hook fails", "hook hangs", "hook ok", "closed"]
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_runs_once_for_concurrent_callers() -> None:
+    async def scenario() -> None:
+        bot = _FakeBot()
+        bot.cogs = {"A": _Cog(bot, "A")}
+        coordinator = ShutdownCoordinator(bot)  # type: ignore[arg-type]
+
+        await asyncio.gather(
+            coordinator.shutdown("SIGTERM"), coordinator.shutdown("exit")
+        )
+        assert bot.events == ["hook A", "closed"]
+
+    asyncio.run(scenario())
+
+
+def test_pending_approvals_roundtrip(tmp_path: Path) -> None:
+    request = ApprovalRequest(
+        requester_id=1,
+        target_id=2,
+        action="promote",
+        reason="earned it",
+        payload={"role_id": 3},
+        guild_id=4,
+        channel_id=5,
+        created_at=1700000000.0,
+    )
+    path = tmp_path / "pending_approvals.json"
+    save_pending_approvals(path, {99: request.to_dict()})
+
+    loaded = load_pending_approvals(path)
+    assert list(loaded) == [99]
+    assert ApprovalRequest.from_dict(loaded[99]) == request
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_load_pending_approvals_tolerates_missing_or_bad_file(tmp_path: Path) -> None:
+    path = tmp_path / "pending_approvals.json"
+    assert load_pending_approvals(path) == {}
+    path.write_text("not json", encoding="utf-8")
+    assert load_pending_approvals(path) == {}
+
+
+def test_decided_request_is_dropped_from_saved_approvals(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        guild, _ = make_guild("Hangar", members=2)
+        approver = FakeMember("approver", administrator=True)
+        cog = RoleCopCog(FakeBot(guilds=[guild]))
+        cog.pending_path = tmp_path / "pending_approvals.json"
+        requests = {
+            mid: ApprovalRequest(
+                requester_id=1,
+                target_id=2,
+                action="kick",
+                reason=None,
+                payload={},
+                guild_id=guild.id,
+                created_at=time.time(),
+            )
+            for mid in (10, 11)
+        }
+        cog.pending.update(requests)
+        await cog._persist_pending()
+        assert sorted(load_pending_approvals(cog.pending_path)) == [10, 11]
+
+        interaction = SimpleNamespace(
+            guild=guild,
+            message=SimpleNamespace(id=10, embeds=[], edit=AsyncMock()),
+            user=approver,
+            followup=SimpleNamespace(send=AsyncMock()),
+        )
+        await cog._execute_request(interaction, requests[10], approved=False)
+
+        assert list(load_pending_approvals(cog.pending_path)) == [11]
+        interaction.message.edit.assert_awaited()
+
+    asyncio.run(scenario())
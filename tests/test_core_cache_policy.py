@@ -0,0 +1,109 @@
+"""
+Unit tests for modules/core/cache/policy.py.
+
+Goal:
+- Per-flavor defaults and PUBLIC_*/DEV_* env overrides.
+- The policy translates into valid py-cord Bot options (a Bot can be built
+  with them) and rejects combinations py-cord would refuse at connect time.
+- ensure_members only chunks under the "lazy" policy with the members intent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from modules.core.cache import CachePolicy, ensure_members, policy_for_flavor
+
+
+def _build_bot(intents: discord.Intents, options: dict) -> discord.Bot:
+    """py-cord wants an event loop when constructing a Bot."""
+
+    async def build() -> discord.Bot:
+        return discord.Bot(intents=intents, **options)
+
+    return asyncio.run(build())
+
+
+def test_public_defaults_are_lean(monkeypatch) -> None:
+    for var in ("MEMBER_CACHE", "CHUNKING", "MAX_MESSAGES", "MEMBERS_INTENT"):
+        monkeypatch.delenv(f"PUBLIC_{var}", raising=False)
+
+    policy = policy_for_flavor("public")
+    intents = discord.Intents.default()
+    options = policy.bot_options(intents)
+
+    assert options["member_cache_flags"].interaction
+    assert not options["member_cache_flags"].voice
+    assert options["chunk_guilds_at_startup"] is False
+    assert options["max_messages"] == 100
+
+    bot = _build_bot(intents, options)
+    assert bot._connection.max_messages == 100
+
+
+def test_env_overrides(monkeypatch) -> None:
+    monkeypatch.setenv("DEV_MAX_MESSAGES", "0")
+    monkeypatch.setenv("DEV_MEMBERS_INTENT", "1")
+    monkeypatch.setenv("DEV_CHUNKING", "startup")
+    monkeypatch.setenv("DEV_MEMBER_CACHE", "interaction,joined")
+
+    policy = policy_for_flavor("dev")
+    intents = discord.Intents.default()
+    options = policy.bot_options(intents)
+
+    assert intents.members
+    assert options["max_messages"] is None  # message cache disabled
+    assert options["chunk_guilds_at_startup"] is True
+    assert options["member_cache_flags"].joined
+    _build_bot(intents, options)
+
+
+def test_rejects_combinations_needing_members_intent() -> None:
+    with pytest.raises(ValueError):
+        CachePolicy(chunking="startup")
+    with pytest.raises(ValueError):
+        CachePolicy(member_cache="joined")
+    with pytest.raises(ValueError):
+        CachePolicy(member_cache="everyone")
+
+
+def _guild(chunked: bool) -> SimpleNamespace:
+    guild = SimpleNamespace(chunked=chunked, chunk_calls=0)
+
+    async def chunk(*, cache: bool = True) -> None:
+        guild.chunk_calls += 1
+        guild.chunked = True
+
+    guild.chunk = chunk
+    return guild
+
+
+def test_ensure_members_chunks_lazily_only_when_allowed() -> None:
+    async def scenario() -> None:
+        members_on = discord.Intents.default()
+        members_on.members = True
+        lazy = CachePolicy(chunking="lazy", members_intent=True)
+
+        bot = SimpleNamespace(intents=members_on, cache_policy=lazy)
+        guild = _guild(chunked=False)
+        assert await ensure_members(bot, guild)
+        assert await ensure_members(bot, guild)
+        assert guild.chunk_calls == 1
+
+        off = SimpleNamespace(
+            intents=members_on, cache_policy=CachePolicy("all", "off")
+        )
+        guild = _guild(chunked=False)
+        assert not await ensure_members(off, guild)
+        assert guild.chunk_calls == 0
+
+        no_intent = SimpleNamespace(
+            intents=discord.Intents.default(), cache_policy=CachePolicy()
+        )
+        assert not await ensure_members(no_intent, _guild(chunked=False))
+
+    asyncio.run(scenario())
@@ -0,0 +1,207 @@
+"""
+Unit tests for GuildLifecycle in modules/core/guilds/lifecycle.py.
+
+Goal:
+- A join updates the registry once and reaches every subscriber as one
+  typed event; a failing subscriber doesn't stop the others.
+- on_ready and the periodic reconcile publish what changed while the
+  gateway events were missed (offline joins/leaves, rejoins).
+- A legacy guild list shared by several bots only contributes the guilds
+  this bot is actually in, so they aren't reported as left.
+- With the real extensions loaded, only the lifecycle service listens to
+  guild join/remove; the cogs get their events from it.
+- A sharded (AutoShardedBot) build registers the service too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+import discord
+
+from benchmarks.fakes import FakeBot, FakeGuild
+from modules.core.guilds.lifecycle import (
+    GuildJoined,
+    GuildLeft,
+    GuildLifecycle,
+    GuildsReady,
+)
+from modules.core.guilds.store import GuildStore
+
+
+class _Recorder:
+    def __init__(self, lifecycle: GuildLifecycle) -> None:
+        self.events: list = []
+        for event in (GuildsReady, GuildJoined, GuildLeft):
+            lifecycle.subscribe(event, self.handle)
+
+    async def handle(self, event) -> None:
+        self.events.append(event)
+
+
+def _lifecycle(tmp_path, guilds: list[FakeGuild]) -> tuple[GuildLifecycle, FakeBot]:
+    bot = FakeBot(guilds=guilds)
+    bot.guild_store = GuildStore(tmp_path / "guilds.sqlite3")
+    return GuildLifecycle.for_bot(bot), bot
+
+
+def test_join_is_one_registry_update_fanned_out(tmp_path) -> None:
+    async def scenario() -> None:
+        lifecycle, bot = _lifecycle(tmp_path, [])
+        assert GuildLifecycle.for_bot(bot) is lifecycle
+        first, second = _Recorder(lifecycle), _Recorder(lifecycle)
+
+        async def broken(event) -> None:
+            raise RuntimeError("subscriber bug")
+
+        lifecycle.subscribe(GuildJoined, broken)
+
+        guild = FakeGuild("new")
+        bot.guilds.append(guild)
+        await lifecycle.on_guild_join(guild)
+
+        for rec in (first, second):
+            [event] = rec.events
+            assert isinstance(event, GuildJoined)
+            assert event.guild is guild and not event.rejoined
+            assert event.record["name"] == "new"
+        assert lifecycle.registry.active_ids() == [guild.id]
+
+        bot.guilds.remove(guild)
+        await lifecycle.on_guild_remove(guild)
+        assert first.events[-1] == GuildLeft(guild.id, "new", guild)
+
+        await lifecycle.graceful_shutdown()
+        assert lifecycle.registry.writes == 1  # join + leave coalesced
+        assert bot.guild_store.guild_ids("bench", status="left") == [guild.id]
+
+    asyncio.run(scenario())
+
+
+def test_ready_and_reconcile_publish_missed_changes(tmp_path) -> None:
+    async def scenario() -> None:
+        a, b, c = FakeGuild("a"), FakeGuild("b"), FakeGuild("c")
+        lifecycle, bot = _lifecycle(tmp_path, [a, b])
+        rec = _Recorder(lifecycle)
+
+        await lifecycle.on_ready()
+        [ready] = rec.events
+        assert ready.first and set(ready.joined) == {a, b} and ready.left == ()
+
+        # Removed from b and added to c without seeing the gateway events
+        bot.guilds[:] = [a, c]
+        joined, left = await lifecycle.reconcile()
+        assert [e.guild for e in joined] == [c]
+        assert [e.guild_id for e in left] == [b.id] and left[0].name == "b"
+
+        # b comes back while we're disconnected
+        bot.guilds.append(b)
+        await lifecycle.on_ready()
+        ready = rec.events[-1]
+        assert not ready.first and ready.joined == (b,)
+
+        rec.events.clear()
+        lifecycle.unsubscribe(rec)
+        await lifecycle.reconcile()
+        await lifecycle.on_guild_join(FakeGuild("d"))
+        assert rec.events == []
+
+    asyncio.run(scenario())
+
+
+def test_rejoin_is_flagged(tmp_path) -> None:
+    async def scenario() -> None:
+        guild = FakeGuild("back")
+        lifecycle, _ = _lifecycle(tmp_path, [])
+        lifecycle.registry.seen(guild)
+        lifecycle.registry.left(guild.id)
+        rec = _Recorder(lifecycle)
+
+        await lifecycle.on_guild_join(guild)
+        assert rec.events[0].rejoined
+
+    asyncio.run(scenario())
+
+
+def test_shared_legacy_list_imports_only_present_guilds(tmp_path) -> None:
+    async def scenario() -> None:
+        mine, theirs = FakeGuild("mine"), FakeGuild("other bot's")
+        shared = tmp_path / "guilds.json"
+        shared.write_text(
+            json.dumps(
+                [
+                    {"id": mine.id, "name": "mine", "joined_at_utc": "2025-01-01"},
+                    {"id": theirs.id, "name": "other bot's"},
+                ]
+            )
+        )
+        lifecycle, bot = _lifecycle(tmp_path, [mine])
+        assert lifecycle.migrate(shared, shared=True) == 0  # waits for ready
+        rec = _Recorder(lifecycle)
+
+        await lifecycle.on_ready()
+
+        [ready] = rec.events
+        assert ready.joined == () and ready.left == ()
+        assert theirs.id not in lifecycle.registry
+        assert lifecycle.registry.get(mine.id)["joined_at_utc"] == "2025-01-01"
+        assert bot.guild_store.guild_ids("bench") == [mine.id]
+
+    asyncio.run(scenario())
+
+
+def test_only_the_service_listens_to_guild_events(tmp_path) -> None:
+    async def scenario() -> None:
+        bot = discord.Bot()
+        bot.guild_store = GuildStore(tmp_path / "guilds.sqlite3")
+        bot.guild_registry_path = tmp_path / "guilds.json"
+        for ext in (
+            "modules.core.guilds.guilds_tracker",
+            "modules.core.diagnostics",
+            "modules.rolecop",
+        ):
+            bot.load_extension(ext)
+
+        listeners: dict[str, list[str]] = {}
+        for name, cog in bot.cogs.items():
+            for event, _ in cog.get_listeners():
+                listeners.setdefault(event, []).append(name)
+        assert listeners["on_guild_join"] == ["GuildLifecycle"]
+        assert listeners["on_guild_remove"] == ["GuildLifecycle"]
+
+        subscribers = bot.guild_lifecycle._subscribers
+        owners = {type(h.__self__).__name__ for h in subscribers[GuildJoined]}
+        assert owners == {"GuildTracker", "DiagnosticsCog", "RoleCopCog"}
+
+        bot.guild_lifecycle.cog_unload()
+        bot.guild_store.close()
+
+    asyncio.run(scenario())
+
+
+def test_sharded_bot_registers_the_service(tmp_path) -> None:
+    from modules.bot.main import build_bot
+
+    async def scenario() -> None:
+        store = GuildStore(tmp_path / "guilds.sqlite3")
+        with mock.patch("modules.bot.main.GuildStore", return_value=store):
+            bot = build_bot(flavor="public", shard_ids=[0, 1], shard_count=4)
+
+        assert isinstance(bot, discord.AutoShardedBot)
+        assert bot.cogs["GuildLifecycle"] is bot.guild_lifecycle
+        assert bot.guild_lifecycle._task is not None  # cog_load ran
+
+        for cog in list(bot.cogs.values()):
+            cog.cog_unload()
+        store.close()
+
+    asyncio.run(scenario())
+
+
+def test_events_are_plain_values() -> None:
+    guild = SimpleNamespace(id=1, name="x")
+    assert GuildLeft(1, "x") == GuildLeft(1, "x")
+    assert GuildJoined(guild, False, {"a": 1}) == GuildJoined(guild, False, {})
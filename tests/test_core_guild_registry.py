@@ -0,0 +1,107 @@
+"""
+Unit tests for GuildRegistry in modules/core/guilds/registry.py.
+
+Goal:
+- Joins and leaves update memory only; a burst is coalesced into one
+  debounced write of just the changed rows.
+- A reconcile that changes nothing does no I/O at all.
+- Records load from the store and a rejoin clears left_at_utc;
+  flush() on shutdown persists refreshed last_seen timestamps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+from modules.core.guilds.registry import GuildRegistry
+from modules.core.guilds.store import GuildStore
+
+
+def _guild(gid: int, name: str = "") -> SimpleNamespace:
+    return SimpleNamespace(id=gid, name=name or f"guild {gid}")
+
+
+def test_join_and_leave_are_one_debounced_write(tmp_path) -> None:
+    async def scenario() -> None:
+        store = GuildStore(tmp_path / "guilds.sqlite3")
+        reg = GuildRegistry(store, "dev", debounce=0.05)
+
+        assert reg.seen(_guild(1))
+        assert reg.seen(_guild(2))
+        assert reg.left(2)
+        assert not reg.left(2)  # already left
+        assert store.count("dev") == 0  # nothing written synchronously
+
+        await asyncio.sleep(0.2)
+
+        assert reg.writes == 1
+        assert store.guild_ids("dev", status="active") == [1]
+        assert store.guild_ids("dev", status="left") == [2]
+        assert reg.active_ids() == [1]
+
+    asyncio.run(scenario())
+
+
+def test_unchanged_reconcile_does_no_io(tmp_path) -> None:
+    async def scenario() -> None:
+        store = GuildStore(tmp_path / "guilds.sqlite3")
+        guilds = [_guild(i) for i in range(50)]
+        reg = GuildRegistry(store, "public", debounce=0.01)
+        assert reg.reconcile(guilds) == 50
+        await reg.flush()
+
+        with mock.patch.object(store, "upsert") as upsert:
+            for _ in range(3):
+                assert reg.reconcile(guilds) == 0
+            await asyncio.sleep(0.05)
+            upsert.assert_not_called()
+            assert not reg.dirty
+
+            # A rename or a guild gone missing is a real change, and only
+            # those two rows are written
+            guilds[0] = _guild(0, "renamed")
+            assert reg.reconcile(guilds[:-1]) == 2
+            await asyncio.sleep(0.05)
+            upsert.assert_called_once()
+            _, records = upsert.call_args.args
+            assert sorted(r["id"] for r in records) == [0, 49]
+
+    asyncio.run(scenario())
+
+
+def test_loads_store_records_and_rejoin_clears_left(tmp_path) -> None:
+    async def scenario() -> None:
+        store = GuildStore(tmp_path / "guilds.sqlite3")
+        store.upsert("dev", [{"id": 7, "name": "old", "left_at_utc": "2026-01-01"}])
+        reg = GuildRegistry(store, "dev", debounce=60)
+        assert len(reg) == 1 and 7 in reg and reg.active_ids() == []
+
+        assert reg.seen(_guild(7, "back again"))
+        await reg.flush()
+
+        rec = store.get("dev", 7)
+        assert rec["name"] == "back again" and "left_at_utc" not in rec
+
+    asyncio.run(scenario())
+
+
+def test_flush_persists_refreshed_last_seen(tmp_path) -> None:
+    async def scenario() -> None:
+        store = GuildStore(tmp_path / "guilds.sqlite3")
+        reg = GuildRegistry(store, "dev", debounce=60)
+        reg.reconcile([_guild(1)])
+        await reg.flush()
+        first = store.get("dev", 1)["last_seen_utc"]
+
+        await asyncio.sleep(0.01)
+        assert reg.reconcile([_guild(1)]) == 0
+        await reg.flush()  # shutdown: write the in-memory last_seen
+
+        assert store.get("dev", 1)["last_seen_utc"] > first
+        writes = reg.writes
+        await reg.flush()
+        assert reg.writes == writes  # nothing left to write
+
+    asyncio.run(scenario())
@@ -0,0 +1,163 @@
+"""
+Unit tests for GuildStore in modules/core/guilds/store.py.
+
+Goal:
+- The store runs in WAL mode and answers id/flavor/status queries from
+  its indexes.
+- Every JSON registry shape extract_guild_ids reads migrates once, with
+  names and timestamps kept, without overwriting rows already stored.
+- Migration streams the file in batches, and a file that turns out to be
+  malformed partway through imports nothing.
+- Deployment takes its active guilds from the store instead of the JSON file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from modules.bot.deploy import DeploymentJob
+from modules.core.guilds.store import GuildStore, registry_flavor
+
+
+def _store(tmp_path) -> GuildStore:
+    return GuildStore(tmp_path / "guilds.sqlite3")
+
+
+def test_wal_mode_and_indexed_queries(tmp_path) -> None:
+    store = _store(tmp_path)
+    store.upsert(
+        "public",
+        [
+            {"id": 3, "name": "c"},
+            {"id": 1, "name": "a"},
+            {"id": 2, "name": "b", "left_at_utc": "2026-01-02"},
+        ],
+    )
+    store.upsert("dev", [{"id": 1, "name": "a"}])
+
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert store.guild_ids("public") == [1, 2, 3]
+    assert store.guild_ids("public", status="active") == [1, 3]
+    assert store.guild_ids("public", status="left") == [2]
+    assert store.count("public", status="active") == 2
+    assert store.flavors_for(1) == ["dev", "public"]
+    with pytest.raises(ValueError):
+        store.guild_ids("public", status="gone")
+
+    plan = " ".join(
+        str(row)
+        for row in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT guild_id FROM guilds "
+            "WHERE flavor = ? AND active = ? ORDER BY guild_id",
+            ("public", 1),
+        )
+    )
+    assert "guilds_by_status" in plan
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        [10, {"id": "20", "name": "twenty"}],
+        {"servers": [{"id": 10}, {"id": 20, "name": "twenty"}]},
+        {"guilds": [{"id": 10}, {"id": "20", "name": "twenty"}]},
+        {"10": {}, "20": {"name": "twenty"}},
+    ],
+)
+def test_migrates_every_json_shape_once(tmp_path, raw) -> None:
+    path = tmp_path / "public_guilds.json"
+    path.write_text(json.dumps(raw))
+    store = _store(tmp_path)
+
+    assert store.migrate_json("public", path) == 2
+    assert store.guild_ids("public") == [10, 20]
+    assert store.get("public", 20)["name"] == "twenty"
+
+    # Only once per file and flavor, even if the file changes afterwards
+    path.write_text(json.dumps([10, 20, 30]))
+    assert store.migrate_json("public", path) == 0
+    assert store.guild_ids("public") == [10, 20]
+
+
+def test_migration_keeps_timestamps_and_existing_rows(tmp_path) -> None:
+    path = tmp_path / "dev_guilds.json"
+    path.write_text(
+        json.dumps(
+            {
+                "servers": [
+                    {"id": 1, "name": "from json", "joined_at_utc": "2025-01-01"},
+                    {"id": 2, "name": "gone", "left_at_utc": "2025-06-01"},
+                ]
+            }
+        )
+    )
+    store = _store(tmp_path)
+    store.upsert("dev", [{"id": 1, "name": "already stored"}])
+
+    assert store.migrate_json("dev", path) == 1
+    assert store.get("dev", 1)["name"] == "already stored"
+    assert store.get("dev", 2)["left_at_utc"] == "2025-06-01"
+    assert store.guild_ids("dev", status="left") == [2]
+
+
+def test_missing_or_bad_json_is_skipped(tmp_path) -> None:
+    store = _store(tmp_path)
+    assert store.migrate_json("dev", tmp_path / "missing.json") == 0
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    assert store.migrate_json("dev", bad) == 0
+    assert store.count("dev") == 0
+
+
+def test_migration_streams_in_batches_all_or_nothing(tmp_path) -> None:
+    records = [{"id": gid, "name": f"g{gid}"} for gid in range(1, 8)]
+    path = tmp_path / "guilds.json"
+    store = _store(tmp_path)
+
+    with mock.patch("modules.core.guilds.store._MIGRATE_BATCH", 2):
+        # Malformed after three batches: nothing is kept, and it isn't
+        # marked as migrated
+        path.write_text(json.dumps({"servers": records})[:-3])
+        assert store.migrate_json("dev", path) == 0
+        assert store.count("dev") == 0
+
+        path.write_text(json.dumps({"servers": records + [{"id": 1}]}))
+        assert store.migrate_json("dev", path, only_ids=range(2, 8)) == 6
+
+    assert store.guild_ids("dev") == list(range(2, 8))
+    assert store.get("dev", 7)["name"] == "g7"
+
+
+def test_registry_flavor_names_shard_groups() -> None:
+    assert registry_flavor("public") == "public"
+    assert registry_flavor("public", [0, 1]) == "public.shard-0-1"
+
+
+def test_deployment_targets_come_from_store(tmp_path) -> None:
+    async def scenario() -> None:
+        store = _store(tmp_path)
+        store.upsert(
+            "public", [{"id": 5}, {"id": 6}, {"id": 7, "left_at_utc": "2026-01-01"}]
+        )
+        bot = SimpleNamespace(guilds=[])
+        job = DeploymentJob(
+            bot,
+            registry_path=tmp_path / "not-read.json",
+            tag="test",
+            store=store,
+            registry_flavor="public",
+        )
+        with mock.patch(
+            "modules.bot.deploy.sync_commands_to_guilds_from_file",
+            mock.AsyncMock(return_value={}),
+        ) as sync:
+            job.start()
+            await job.wait()
+        assert sync.call_args.kwargs["guild_ids"] == [5, 6]
+
+    asyncio.run(scenario())
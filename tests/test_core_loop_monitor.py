@@ -0,0 +1,55 @@
+"""
+Unit tests for modules/core/diagnostics/loop_monitor.py.
+
+Goal:
+- Lag samples turn into sane percentiles.
+- A callback that blocks the loop is caught by the watchdog thread, with the
+  blocking task and the line of our code that was running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from modules.core.diagnostics.loop_monitor import LoopMonitor, percentile
+
+
+def test_percentile_nearest_rank() -> None:
+    values = sorted(float(i) for i in range(1, 101))
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)  # deliberately blocking
+
+
+def test_detects_blocking_callback_with_location() -> None:
+    async def scenario() -> LoopMonitor:
+        mon = LoopMonitor(interval=0.02, slow_threshold=0.05)
+        mon.start()
+        await asyncio.sleep(0.1)
+
+        async def on_message_listener() -> None:
+            _block_the_loop(0.3)
+
+        await asyncio.create_task(on_message_listener(), name="pycord: on_message")
+        await asyncio.sleep(0.1)
+        await mon.stop()
+        return mon
+
+    mon = asyncio.run(scenario())
+
+    assert len(mon.slow_callbacks) == 1
+    stall = mon.slow_callbacks[0]
+    assert stall.task.startswith("pycord: on_message")
+    assert "tests/test_core_loop_monitor.py" in stall.location
+    assert "_block_the_loop" in stall.location
+    assert stall.blocked_for is not None and stall.blocked_for >= 0.2
+
+    lag = mon.lag_percentiles()
+    assert lag["samples"] > 3
+    assert lag["max"] >= 200
+    assert lag["p50"] < lag["max"]
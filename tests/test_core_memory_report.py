@@ -0,0 +1,62 @@
+"""
+Unit tests for modules/core/diagnostics/memory.py.
+
+Goal:
+- deep_sizeof counts each object once and stops at objects billed to
+  another cache bucket.
+- The report scales sampled sizes by cache counts and explains the rest of
+  RSS as "other".
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from modules.core.cache import CachePolicy
+from modules.core.diagnostics.memory import (
+    build_memory_report,
+    deep_sizeof,
+    format_memory_report,
+)
+
+
+class _Owned:
+    pass
+
+
+def test_deep_sizeof_counts_shared_objects_once_and_respects_stop() -> None:
+    payload = "x" * 10_000
+    shared = [payload, payload]
+    assert deep_sizeof(shared) < 2 * len(payload)
+
+    owner = SimpleNamespace(blob="y" * 10_000)
+    holder = {"ref": _Owned()}
+    holder["ref"].big = "z" * 10_000
+    assert deep_sizeof(owner) > 10_000
+    assert deep_sizeof(holder, stop=(_Owned,)) < 10_000
+
+
+def test_report_breaks_down_caches() -> None:
+    members = [SimpleNamespace(nick=f"member{i}") for i in range(10)]
+    guilds = [SimpleNamespace(name="g1", members=members[:6])]
+    guilds.append(SimpleNamespace(name="g2", members=members[6:]))
+    messages = [SimpleNamespace(content="hello" * 50) for _ in range(3)]
+    bot = SimpleNamespace(
+        guilds=guilds,
+        users=[],
+        cached_messages=messages,
+        cache_policy=CachePolicy(member_cache="interaction", max_messages=100),
+    )
+
+    report = build_memory_report(bot, sample=2)
+    counts = {b.name: b.count for b in report.buckets}
+    assert counts == {"guilds": 2, "members": 10, "users": 0, "messages": 3}
+    sizes = {b.name: b.bytes for b in report.buckets}
+    assert sizes["messages"] > 3 * 250
+    assert sizes["users"] == 0
+    assert report.rss_mb > 0
+    assert report.other_mb <= report.rss_mb
+
+    text = format_memory_report(report)
+    assert "members: 10 cached" in text
+    assert "chunking `lazy`" in text
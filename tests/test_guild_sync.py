@@ -0,0 +1,185 @@
+"""
+Unit tests for utils/guild_sync.py.
+
+Goal:
+- Lock down registry parsing for every JSON shape we accept, and keep the
+  streaming parser in step with it wherever the file is split into chunks.
+- GuildIdArray holds the same sorted ids compactly and answers membership.
+- Make sure unchanged guilds are skipped on restart (command fingerprint
+  matches the last successful sync), and that --force-sync still syncs them.
+- utils/sync_strat.py falls back to a global sync when the bot is in none
+  of the registry guilds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from utils import guild_sync, sync_strat
+
+
+def _command(name: str, description: str = "desc") -> MagicMock:
+    cmd = MagicMock()
+    cmd.to_dict.return_value = {"name": name, "description": description}
+    return cmd
+
+
+def _fake_bot(guild_ids: list[int], commands: list[MagicMock]) -> MagicMock:
+    guilds = {gid: SimpleNamespace(id=gid, name=f"Guild {gid}") for gid in guild_ids}
+    bot = MagicMock()
+    bot.guilds = list(guilds.values())
+    bot.get_guild.side_effect = guilds.get
+    bot.pending_application_commands = commands
+    bot.sync_commands = AsyncMock(return_value=None)
+    return bot
+
+
+def _registry(tmp_path, ids: list[int]):
+    path = tmp_path / "public_guilds.json"
+    path.write_text(json.dumps({"servers": [{"id": gid} for gid in ids]}))
+    return path
+
+
+def _sync(bot, path, **kwargs) -> dict[int, str]:
+    return asyncio.run(
+        guild_sync.sync_commands_to_guilds_from_file(bot, path, **kwargs)
+    )
+
+
+def test_extract_guild_ids_supports_all_shapes() -> None:
+    assert guild_sync.extract_guild_ids([3, {"id": "1"}, {"id": "x"}]) == [1, 3]
+    assert guild_sync.extract_guild_ids({"servers": [{"id": 5}]}) == [5]
+    assert guild_sync.extract_guild_ids({"guilds": [{"id": "6"}]}) == [6]
+    assert guild_sync.extract_guild_ids({"7": {}, "8": {}}) == [7, 8]
+
+
+_SHAPES = [
+    [3, {"id": "1"}, {"id": "x"}, {"id": 123456789012345678}],
+    {"servers": [{"id": 5, "name": "a]b}"}, 9]},
+    {"guilds": [{"id": "6"}], "7": {"nested": [1, {"id": 2}]}, "meta": 1.5},
+    {"7": {}, "8": {}},
+    {},
+    [],
+]
+
+
+@pytest.mark.parametrize("raw", _SHAPES)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streaming_matches_extract_at_any_chunk_size(tmp_path, raw, indent) -> None:
+    path = tmp_path / "guilds.json"
+    path.write_text(json.dumps(raw, indent=indent))
+    expected = guild_sync.extract_guild_ids(raw)
+
+    for chunk_size in (1, 2, 3, 7, 4096):
+        ids = guild_sync.iter_guild_ids_from_json(path, chunk_size=chunk_size)
+        assert sorted(set(ids)) == expected, chunk_size
+    assert guild_sync.load_guild_ids_from_json(path) == expected
+    assert list(guild_sync.load_guild_id_array(path)) == expected
+
+
+@pytest.mark.parametrize("bad", ["", "[1, 2", "[1 2]", "[1,]", '{"1": {}}}', "{1: 2}"])
+def test_streaming_rejects_malformed_json(tmp_path, bad) -> None:
+    path = tmp_path / "guilds.json"
+    path.write_text(bad)
+    for chunk_size in (1, 4096):
+        with pytest.raises(json.JSONDecodeError):
+            list(guild_sync.iter_guild_ids_from_json(path, chunk_size=chunk_size))
+
+
+def test_guild_id_array_is_sorted_unique_and_compact() -> None:
+    rng = random.Random(0)
+    ids = [rng.randrange(10**17, 10**18) for _ in range(5000)]
+    arr = guild_sync.GuildIdArray.from_ids(ids + ids[:100], run=512)
+
+    assert list(arr) == sorted(set(ids))
+    assert len(arr) == 5000 and arr.nbytes == 8 * 5000
+    assert all(gid in arr for gid in ids[:200])
+    assert max(ids) + 1 not in arr
+    assert "1" not in arr and 0 not in guild_sync.GuildIdArray()
+
+
+def test_compact_registry_plans_the_same_sync(tmp_path) -> None:
+    path = _registry(tmp_path, [3, 1, 2])
+    bot = _fake_bot([1, 2], [_command("ping")])
+
+    assert _sync(bot, path, compact=True) == {1: "ok", 2: "ok", 3: "not_in_guild"}
+
+
+def test_fingerprint_is_order_independent_and_detects_changes() -> None:
+    a, b = _command("a"), _command("b")
+    bot1 = _fake_bot([], [a, b])
+    bot2 = _fake_bot([], [b, a])
+    assert guild_sync.command_fingerprint(bot1) == guild_sync.command_fingerprint(bot2)
+
+    bot3 = _fake_bot([], [a, _command("b", "new description")])
+    assert guild_sync.command_fingerprint(bot1) != guild_sync.command_fingerprint(bot3)
+
+
+def test_unchanged_guilds_are_skipped_on_next_run(tmp_path) -> None:
+    path = _registry(tmp_path, [1, 2, 3])
+    bot = _fake_bot([1, 2], [_command("ping")])
+
+    first = _sync(bot, path)
+    assert first == {1: "ok", 2: "ok", 3: "not_in_guild"}
+    assert bot.sync_commands.await_count == 2
+
+    second = _sync(bot, path)
+    assert second == {1: "unchanged", 2: "unchanged", 3: "not_in_guild"}
+    assert bot.sync_commands.await_count == 2  # no new API calls
+
+
+def test_changed_commands_trigger_resync(tmp_path) -> None:
+    path = _registry(tmp_path, [1])
+    bot = _fake_bot([1], [_command("ping")])
+    _sync(bot, path)
+
+    bot.pending_application_commands = [_command("ping"), _command("pong")]
+    assert _sync(bot, path) == {1: "ok"}
+    assert bot.sync_commands.await_count == 2
+
+
+def test_force_bypasses_fingerprint(tmp_path) -> None:
+    path = _registry(tmp_path, [1])
+    bot = _fake_bot([1], [_command("ping")])
+    _sync(bot, path)
+
+    assert _sync(bot, path, force=True) == {1: "ok"}
+    assert bot.sync_commands.await_count == 2
+
+
+def test_failed_sync_is_retried_next_run(tmp_path) -> None:
+    path = _registry(tmp_path, [1])
+    bot = _fake_bot([1], [_command("ping")])
+    bot.sync_commands = AsyncMock(side_effect=RuntimeError("boom"))
+
+    assert _sync(bot, path)[1].startswith("error:")
+
+    bot.sync_commands = AsyncMock(return_value=None)
+    assert _sync(bot, path) == {1: "ok"}
+
+
+def test_record_guild_sync_round_trip(tmp_path) -> None:
+    state_path = guild_sync.sync_state_path_for(tmp_path / "dev_guilds.json")
+    assert state_path.name == "dev_guilds.sync_state.json"
+
+    guild_sync.record_guild_sync(state_path, [42], "abc")
+
+    state = guild_sync.load_sync_state(state_path)
+    assert state["42"]["fingerprint"] == "abc"
+
+
+def test_sync_strategy_goes_global_without_registry_targets(tmp_path) -> None:
+    path = _registry(tmp_path, [1, 2])
+    bot = _fake_bot([1], [_command("ping")])
+    asyncio.run(sync_strat.sync_from_registry(bot, flavor="dev", guilds_json=path))
+    assert bot.sync_commands.await_count == 1  # guild 1 only
+
+    bot = _fake_bot([3], [_command("ping")])
+    asyncio.run(sync_strat.sync_from_registry(bot, flavor="dev", guilds_json=path))
+    bot.sync_commands.assert_awaited_once_with()  # global
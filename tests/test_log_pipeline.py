@@ -0,0 +1,106 @@
+"""
+Unit tests for utils/log_pipeline.py.
+
+Goal:
+- Records leave the caller through a bounded queue and are written by the
+  listener thread as JSON lines carrying extra= fields.
+- A full queue drops records instead of blocking.
+- Per-subsystem sampling thins INFO noise but never drops warnings.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from utils import log_pipeline
+from utils.log_pipeline import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    parse_sample_rates,
+)
+
+
+@pytest.fixture
+def pipeline():
+    stream = io.StringIO()
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    handler = log_pipeline.setup_logging(fmt="json", level="INFO", stream=stream)
+    try:
+        yield handler, stream
+    finally:
+        log_pipeline.shutdown_logging()
+        for h in saved_handlers:
+            root.addHandler(h)
+        root.setLevel(saved_level)
+
+
+def test_json_lines_with_structured_fields(pipeline) -> None:
+    handler, stream = pipeline
+    log = logging.getLogger("pilotai")
+    log.info("answered %s", "ask-the-pilot", extra={"guild_id": 42, "latency_ms": 12.5})
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        log.exception("failed")
+    log_pipeline.shutdown_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]["msg"] == "answered ask-the-pilot"
+    assert lines[0]["logger"] == "pilotai"
+    assert lines[0]["guild_id"] == 42
+    assert lines[0]["latency_ms"] == 12.5
+    assert lines[1]["level"] == "ERROR"
+    assert "ValueError: bad" in lines[1]["exc"]
+
+
+def test_setup_is_idempotent(pipeline) -> None:
+    handler, _ = pipeline
+    assert log_pipeline.setup_logging() is handler
+
+
+def test_full_queue_drops_instead_of_blocking() -> None:
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    log = logging.getLogger("test.flood")
+    log.propagate = False
+    log.addHandler(handler)
+    try:
+        for i in range(5):
+            log.warning("flood %d", i)
+    finally:
+        log.removeHandler(handler)
+        log.propagate = True
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    # Message args were merged before queueing
+    assert handler.queue.get_nowait().msg == "flood 0"
+
+
+def test_sampling_per_subsystem() -> None:
+    rates = parse_sample_rates("pilotai=0, guildpilot.sync=0.5")
+    assert rates == {"pilotai": 0.0, "guildpilot.sync": 0.5}
+
+    f = SamplingFilter({**rates, "pilotai.storage": 1.0}, rng=lambda: 0.25)
+
+    def rec(name: str, level: int = logging.INFO) -> logging.LogRecord:
+        return logging.LogRecord(name, level, __file__, 1, "m", None, None)
+
+    assert not f.filter(rec("pilotai"))
+    assert f.filter(rec("pilotai.storage"))  # longest prefix wins
+    assert f.filter(rec("pilotai", logging.WARNING))  # never drop warnings
+    assert f.filter(rec("guildpilot.sync"))  # 0.25 < 0.5
+    assert f.filter(rec("guildpilot.synchronous"))  # not a child of the prefix
+    assert f.dropped == 1
+
+
+def test_json_formatter_handles_unserialisable_extras() -> None:
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None)
+    record.obj = object()
+    assert json.loads(JsonFormatter().format(record))["obj"].startswith("<object")
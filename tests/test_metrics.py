@@ -0,0 +1,99 @@
+"""
+Unit tests for utils/metrics.py (and the scraper timing decorator).
+
+Goal:
+- Counters, gauges and histograms render valid Prometheus text.
+- The HTTP endpoint binds to localhost by default and serves /metrics.
+- Scraper outcomes are classified as ok/empty/error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from modules.statwrangler.events.scrape_metrics import scrape_outcome, timed_scrape
+from utils.metrics import REGISTRY, MetricsServer, Registry
+
+
+def test_render_prometheus_text() -> None:
+    reg = Registry()
+    hits = reg.counter("app_hits", "Hits.", ["route"])
+    hits.inc(route="/a")
+    hits.inc(2, route='/b"x')
+    reg.gauge("app_up", "Up.", function=lambda: 1)
+    lat = reg.histogram("app_seconds", "Latency.", buckets=(0.1, 1))
+    for v in (0.05, 0.5, 5):
+        lat.observe(v)
+
+    text = reg.render()
+    assert "# TYPE app_hits counter" in text
+    assert 'app_hits_total{route="/a"} 1' in text
+    assert 'app_hits_total{route="/b\\"x"} 2' in text
+    assert "app_up 1" in text
+    assert 'app_seconds_bucket{le="0.1"} 1' in text
+    assert 'app_seconds_bucket{le="1"} 2' in text
+    assert 'app_seconds_bucket{le="+Inf"} 3' in text
+    assert "app_seconds_count 3" in text
+    assert "app_seconds_sum 5.55" in text
+
+
+def test_registering_twice_returns_same_metric_and_checks_labels() -> None:
+    reg = Registry()
+    a = reg.counter("x", "X.", ["k"])
+    assert reg.counter("x", "X.", ["k"]) is a
+    with pytest.raises(ValueError):
+        a.inc(other="1")
+    with pytest.raises(ValueError):
+        reg.gauge("x", "X.")
+
+
+def test_server_serves_metrics_on_localhost() -> None:
+    async def scenario() -> str:
+        reg = Registry()
+        reg.counter("served", "Served.").inc()
+        server = MetricsServer(reg, port=0)
+        assert server.host == "127.0.0.1"
+        await server.start()
+        try:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as resp:
+                    assert resp.status == 200
+                    assert resp.headers["Content-Type"].startswith("text/plain")
+                    return await resp.text()
+        finally:
+            await server.stop()
+
+    assert "served_total 1" in asyncio.run(scenario())
+
+
+def test_from_env_can_disable(monkeypatch) -> None:
+    monkeypatch.setenv("METRICS_PORT", "0")
+    assert MetricsServer.from_env() is None
+    monkeypatch.setenv("METRICS_PORT", "9200")
+    assert MetricsServer.from_env(port_offset=3).port == 9203
+
+
+def test_timed_scrape_records_outcomes() -> None:
+    assert scrape_outcome((None, None)) == "empty"
+    assert scrape_outcome(("N/A", "N/A")) == "empty"
+    assert scrape_outcome(("1.2", None)) == "ok"
+
+    @timed_scrape("testgame")
+    async def scrape(fail: bool):
+        if fail:
+            raise RuntimeError("boom")
+        return ("1.0", None)
+
+    async def scenario() -> None:
+        await scrape(False)
+        with pytest.raises(RuntimeError):
+            await scrape(True)
+
+    asyncio.run(scenario())
+    hist = REGISTRY.get("statwrangler_scrape_seconds")
+    assert hist.count(game="testgame", outcome="ok") == 1
+    assert hist.count(game="testgame", outcome="error") == 1
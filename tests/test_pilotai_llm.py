@@ -0,0 +1,122 @@
+"""
+Unit tests for PilotAI's LLM call path (modules/pilotai/commands.py).
+
+Goal:
+- Prove a slow OpenAI completion no longer freezes the event loop: other
+  coroutines (heartbeats, other cogs) must keep running while it's in flight.
+- Confirm OPENAI_MAX_CONCURRENCY actually caps in-flight completions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from modules.pilotai import commands as pilot_commands
+
+
+class _SlowCompletions:
+    """Stand-in for client.chat.completions with a deliberately slow create()."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs) -> SimpleNamespace:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content="pong")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _make_cog(monkeypatch, completions: _SlowCompletions, *, concurrency: int = 4):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-placeholder")
+    monkeypatch.setenv("OPENAI_MAX_CONCURRENCY", str(concurrency))
+    monkeypatch.setattr(pilot_commands, "load_state", lambda: ({}, {}))
+
+    cog = pilot_commands.PilotAI(MagicMock())
+    cog.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return cog
+
+
+def _history() -> list[dict[str, str]]:
+    return [{"role": "user", "content": "ping"}]
+
+
+def test_llm_reply_does_not_block_event_loop(monkeypatch) -> None:
+    async def scenario() -> None:
+        cog = _make_cog(monkeypatch, _SlowCompletions(delay=0.3))
+        ticks = 0
+
+        async def heartbeat() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        try:
+            reply = await cog.llm_reply(_history())
+        finally:
+            beat.cancel()
+
+        assert reply == "pong"
+        # A blocking call would leave the heartbeat stuck at its first tick.
+        assert ticks >= 10
+
+    asyncio.run(scenario())
+
+
+def test_llm_reply_respects_max_concurrency(monkeypatch) -> None:
+    async def scenario() -> None:
+        completions = _SlowCompletions(delay=0.05)
+        cog = _make_cog(monkeypatch, completions, concurrency=2)
+
+        replies = await asyncio.gather(*(cog.llm_reply(_history()) for _ in range(6)))
+
+        assert replies == ["pong"] * 6
+        assert completions.max_in_flight == 2
+
+    asyncio.run(scenario())
+
+
+class _StreamingCompletions:
+    """Stand-in for client.chat.completions that streams fixed deltas."""
+
+    def __init__(self, deltas: list[str]) -> None:
+        self.deltas = deltas
+
+    async def create(self, **kwargs):
+        assert kwargs.get("stream") is True
+
+        async def chunks():
+            for text in self.deltas:
+                delta = SimpleNamespace(content=text)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+        return chunks()
+
+
+def test_deliver_reply_streams_into_placeholder(monkeypatch) -> None:
+    async def scenario() -> None:
+        cog = _make_cog(monkeypatch, _StreamingCompletions(["Hel", "lo", "!"]))
+        cog.stream_replies = True
+
+        posted = MagicMock()
+        posted.edit = AsyncMock()
+        send_first = AsyncMock(return_value=posted)
+
+        reply, sent = await cog.deliver_reply(_history(), send_first, MagicMock())
+
+        assert reply == "Hello!"
+        assert sent == [posted]
+        send_first.assert_awaited_once()  # placeholder, before any tokens
+        posted.edit.assert_awaited_with(content="Hello!")
+
+    asyncio.run(scenario())
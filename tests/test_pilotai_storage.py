@@ -0,0 +1,174 @@
+"""
+Unit tests for PilotAI's conversation journal (modules/pilotai/storage.py).
+
+Goal:
+- A reply appends one line for its conversation: the write doesn't grow
+  with the number of active conversations and never rewrites the snapshot.
+- load_state replays the journal on top of the snapshot, skipping a line
+  torn by a crash, and an interrupted compaction loses nothing.
+- The cog compacts in the background once the journal outgrows the
+  snapshot, and leaves one snapshot behind on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+from modules.pilotai import commands as pilot_commands
+from modules.pilotai.storage import (
+    ConversationJournal,
+    journal_paths,
+    load_state,
+    save_state,
+)
+
+_NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _meta(text: str = "hi") -> dict:
+    return {
+        "history": [{"role": "user", "content": text}],
+        "last_active": _NOW,
+        "channel_id": 7,
+    }
+
+
+def test_put_appends_one_line_per_reply(tmp_path) -> None:
+    path = tmp_path / "convos.json"
+    many = {root: _meta() for root in range(1000)}
+    save_state(many, {root: root for root in many}, path)
+    snapshot = path.read_bytes()
+
+    journal = ConversationJournal(path)
+    journal.put(5, _meta("again"), [50, 51])
+    journal.put(2000, _meta("new"), [2001])
+    journal.delete([3], [3])
+    journal.close()
+
+    assert path.read_bytes() == snapshot
+    [segment] = journal_paths(path).values()
+    lines = segment.read_text().splitlines()
+    assert len(lines) == 3 and len(lines[0]) < 200
+
+    convos, msg_to_root = load_state(path)
+    assert convos[5]["history"][0]["content"] == "again"
+    assert convos[2000]["last_active"] == _NOW
+    assert 3 not in convos and 3 not in msg_to_root
+    assert msg_to_root[51] == 5 and msg_to_root[2001] == 2000
+    assert len(convos) == 1000
+
+
+def test_replay_skips_torn_and_damaged_lines(tmp_path) -> None:
+    path = tmp_path / "convos.json"
+    journal = ConversationJournal(path)
+    journal.put(1, _meta("kept"), [1])
+    journal.close()
+
+    [segment] = journal_paths(path).values()
+    with segment.open("a") as f:
+        f.write("not json\n")
+        f.write('{"op": "put", "root": 2, "hist')  # crash mid-write
+
+    convos, msg_to_root = load_state(path)
+    assert list(convos) == [1] and msg_to_root == {1: 1}
+
+    # The next process appends to a new segment, not after the torn line
+    journal = ConversationJournal(path)
+    journal.put(3, _meta(), [3])
+    journal.close()
+    assert len(journal_paths(path)) == 2
+    assert sorted(load_state(path)[0]) == [1, 3]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "convos.json"
+        journal = ConversationJournal(path, compact_bytes=1)
+        convos, msg_to_root = {1: _meta("one")}, {1: 1}
+        journal.put(1, convos[1], [1])
+        assert journal.needs_compaction
+
+        compaction = asyncio.create_task(journal.compact(convos, msg_to_root))
+        await asyncio.sleep(0)  # rolled over; snapshot writing in a thread
+        convos[2] = _meta("during")
+        msg_to_root[2] = 2
+        journal.put(2, convos[2], [2])
+        await compaction
+
+        assert json.loads(path.read_text())["journal_seq"] == 2
+        assert list(journal_paths(path)) == [2]  # segment 1 removed
+        assert journal.compactions == 1
+        assert sorted(load_state(path)[0]) == [1, 2]
+        journal.close()
+
+    asyncio.run(scenario())
+
+
+def test_interrupted_compaction_replays_cleanly(tmp_path) -> None:
+    path = tmp_path / "convos.json"
+    journal = ConversationJournal(path)
+    journal.put(1, _meta("old"), [1])
+    journal.delete([1], [1])
+    journal.put(2, _meta(), [2])
+    journal.close()
+
+    # Snapshot landed but the covered segment wasn't removed yet
+    save_state({2: _meta()}, {2: 2}, path, journal_seq=2)
+    journal = ConversationJournal(path)
+    journal.put(3, _meta(), [3])
+    journal.close()
+
+    convos, msg_to_root = load_state(path)
+    assert sorted(convos) == [2, 3] and msg_to_root == {2: 2, 3: 3}
+
+
+def test_put_after_compaction_and_restart_survives_crash(tmp_path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "convos.json"
+        convos = {root: _meta() for root in range(3)}
+        journal = ConversationJournal(path)
+        for root, meta in convos.items():
+            journal.put(root, meta, [root])
+        await journal.compact(convos, {root: root for root in convos})
+        journal.close()
+        assert journal_paths(path) == {}
+
+        # Restart, one reply, then crash without compacting
+        journal = ConversationJournal(path)
+        journal.put(99, _meta("after restart"), [99])
+
+        convos, msg_to_root = load_state(path)
+        assert sorted(convos) == [0, 1, 2, 99] and msg_to_root[99] == 99
+        journal.close()
+
+    asyncio.run(scenario())
+
+
+def test_cog_compacts_in_background_and_on_shutdown(tmp_path, monkeypatch) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "convos.json"
+        monkeypatch.setenv("OPENAI_API_KEY", "test-placeholder")
+        monkeypatch.setattr(pilot_commands, "load_state", lambda: load_state(path))
+        monkeypatch.setattr(
+            pilot_commands,
+            "ConversationJournal",
+            lambda: ConversationJournal(path, compact_bytes=2000),
+        )
+        cog = pilot_commands.PilotAI(MagicMock())
+
+        for root in range(40):
+            cog.convos[root] = _meta("x" * 50)
+            cog.msg_to_root[root] = root
+            cog._record(root, [root])
+        await asyncio.sleep(0.1)
+        assert cog.journal.compactions >= 1
+
+        await cog.graceful_shutdown()
+        assert journal_paths(path) == {}
+        convos, msg_to_root = load_state(path)
+        assert sorted(convos) == list(range(40)) and len(msg_to_root) == 40
+
+    asyncio.run(scenario())
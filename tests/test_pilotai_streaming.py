@@ -0,0 +1,128 @@
+"""
+Unit tests for modules/pilotai/streaming.py.
+
+Goal:
+- Lock down the progressive-edit behavior of streamed replies: placeholder
+  first, the first text shown at once, later edits throttled, and rollover
+  at Discord's 2000-char limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from modules.pilotai.streaming import MESSAGE_LIMIT, PLACEHOLDER, StreamingReply
+
+
+class _FakeMessage:
+    def __init__(self, content: str) -> None:
+        self.id = id(self)
+        self.content = content
+        self.edits: list[str] = []
+
+    async def edit(self, *, content: str) -> None:
+        self.content = content
+        self.edits.append(content)
+
+
+class _FakeChannel:
+    def __init__(self) -> None:
+        self.sent: list[_FakeMessage] = []
+
+    async def send(self, content: str) -> _FakeMessage:
+        msg = _FakeMessage(content)
+        self.sent.append(msg)
+        return msg
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_reply(channel: _FakeChannel, clock: _Clock) -> StreamingReply:
+    return StreamingReply(channel.send, channel, min_edit_interval=1.0, clock=clock)
+
+
+def test_placeholder_posted_before_any_tokens() -> None:
+    async def scenario() -> None:
+        channel = _FakeChannel()
+        out = _make_reply(channel, _Clock())
+
+        await out.start()
+
+        assert [m.content for m in channel.sent] == [PLACEHOLDER]
+
+    asyncio.run(scenario())
+
+
+def test_edits_are_throttled() -> None:
+    async def scenario() -> None:
+        channel, clock = _FakeChannel(), _Clock()
+        out = _make_reply(channel, clock)
+        await out.start()
+
+        clock.now += 0.2
+        await out.feed("a")
+        assert channel.sent[0].edits == ["a"]  # the first text shows at once
+
+        for token in ["b", "c"]:
+            clock.now += 0.2
+            await out.feed(token)
+        assert channel.sent[0].edits == ["a"]  # still inside the 1s window
+
+        clock.now += 1.0
+        await out.feed("d")
+        assert channel.sent[0].edits == ["a", "abcd"]
+
+        assert await out.finish() == "abcd"
+        assert channel.sent[0].edits == ["a", "abcd"]  # nothing new to render
+
+    asyncio.run(scenario())
+
+
+def test_rolls_over_at_message_limit() -> None:
+    async def scenario() -> None:
+        channel, clock = _FakeChannel(), _Clock()
+        out = _make_reply(channel, clock)
+        await out.start()
+
+        text = "x" * (MESSAGE_LIMIT * 2) + "tail"
+        for i in range(0, len(text), 300):
+            await out.feed(text[i : i + 300])
+        reply = await out.finish()
+
+        assert reply == text
+        assert len(out.messages) == 3
+        assert "".join(m.content for m in out.messages) == text
+        assert all(len(m.content) <= MESSAGE_LIMIT for m in out.messages)
+
+    asyncio.run(scenario())
+
+
+def test_finish_without_tokens_uses_fallback() -> None:
+    async def scenario() -> None:
+        channel = _FakeChannel()
+        out = _make_reply(channel, _Clock())
+        await out.start()
+
+        assert await out.finish(fallback="nothing") == "nothing"
+        assert channel.sent[0].content == "nothing"
+
+    asyncio.run(scenario())
+
+
+def test_fail_replaces_placeholder_with_notice() -> None:
+    async def scenario() -> None:
+        channel = _FakeChannel()
+        out = _make_reply(channel, _Clock())
+        await out.start()
+
+        await out.fail("boom")
+
+        assert channel.sent[0].content == "boom"
+
+    asyncio.run(scenario())
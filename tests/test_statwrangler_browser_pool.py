@@ -0,0 +1,161 @@
+"""
+Unit tests for modules/statwrangler/events/browser_pool.py.
+
+Goal:
+- Make sure scrapers share one browser instead of launching per lookup.
+- Lock down the page cap, recycle-after-N, and crashed-browser health check
+  without needing a real Chromium (Playwright is faked out).
+- With two owners (two bots' cogs), the browser stops only once both have
+  detached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from modules.statwrangler.events import browser_pool as pool_mod
+
+
+class _FakeContext:
+    def __init__(self, browser: _FakeBrowser) -> None:
+        self.browser = browser
+
+    async def new_page(self) -> str:
+        return f"page-from-browser-{self.browser.n}"
+
+    async def close(self) -> None:
+        self.browser.open_contexts -= 1
+
+
+class _FakeBrowser:
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.connected = True
+        self.closed = False
+        self.open_contexts = 0
+
+    def is_connected(self) -> bool:
+        return self.connected and not self.closed
+
+    async def new_context(self, **kwargs) -> _FakeContext:
+        self.open_contexts += 1
+        return _FakeContext(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakePlaywright:
+    def __init__(self) -> None:
+        self.browsers: list[_FakeBrowser] = []
+        self.stopped = False
+        self.chromium = self
+
+    async def launch(self, **kwargs) -> _FakeBrowser:
+        browser = _FakeBrowser(len(self.browsers))
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+def _install_fake(monkeypatch) -> _FakePlaywright:
+    fake = _FakePlaywright()
+
+    class _Starter:
+        async def start(self) -> _FakePlaywright:
+            return fake
+
+    monkeypatch.setattr(pool_mod, "async_playwright", lambda: _Starter())
+    return fake
+
+
+def test_pages_share_one_browser(monkeypatch) -> None:
+    async def scenario() -> None:
+        fake = _install_fake(monkeypatch)
+        pool = pool_mod.BrowserPool(recycle_after_pages=0, max_rss_mb=0)
+
+        for _ in range(5):
+            async with pool.page(locale="en-US") as page:
+                assert page == "page-from-browser-0"
+
+        assert len(fake.browsers) == 1
+        assert fake.browsers[0].open_contexts == 0  # every context was closed
+
+        await pool.stop()
+        assert fake.browsers[0].closed and fake.stopped
+
+    asyncio.run(scenario())
+
+
+def test_pool_stops_with_its_last_owner(monkeypatch) -> None:
+    async def scenario() -> None:
+        fake = _install_fake(monkeypatch)
+        pool = pool_mod.BrowserPool(recycle_after_pages=0, max_rss_mb=0)
+        public, dev = object(), object()
+        pool.attach(public)
+        pool.attach(dev)
+        await pool.start()
+
+        # cog_unload and graceful_shutdown both detach: counted once
+        await pool.detach(public)
+        await pool.detach(public)
+        assert pool.owners == 1 and pool.started
+        async with pool.page() as page:
+            assert page == "page-from-browser-0"
+
+        await pool.detach(dev)
+        assert not pool.started
+        assert fake.browsers[0].closed and fake.stopped
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_pages_are_capped(monkeypatch) -> None:
+    async def scenario() -> None:
+        _install_fake(monkeypatch)
+        pool = pool_mod.BrowserPool(max_pages=2, recycle_after_pages=0, max_rss_mb=0)
+        in_flight = peak = 0
+
+        async def lookup() -> None:
+            nonlocal in_flight, peak
+            async with pool.page():
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(lookup() for _ in range(6)))
+        assert peak == 2
+
+    asyncio.run(scenario())
+
+
+def test_browser_recycled_after_n_pages(monkeypatch) -> None:
+    async def scenario() -> None:
+        fake = _install_fake(monkeypatch)
+        pool = pool_mod.BrowserPool(recycle_after_pages=2, max_rss_mb=0)
+
+        for _ in range(3):
+            async with pool.page():
+                pass
+
+        assert len(fake.browsers) == 2
+        assert fake.browsers[0].closed
+        assert not fake.browsers[1].closed
+
+    asyncio.run(scenario())
+
+
+def test_disconnected_browser_is_replaced(monkeypatch) -> None:
+    async def scenario() -> None:
+        fake = _install_fake(monkeypatch)
+        pool = pool_mod.BrowserPool(recycle_after_pages=0, max_rss_mb=0)
+        await pool.start()
+
+        fake.browsers[0].connected = False  # simulate a Chromium crash
+        async with pool.page() as page:
+            assert page == "page-from-browser-1"
+
+    asyncio.run(scenario())
@@ -0,0 +1,98 @@
+"""
+Unit tests for modules/statwrangler/events/singleflight.py.
+
+Goal:
+- A burst of identical /game_stats lookups must cost one scrape, not one
+  per caller.
+- Cancelling one waiting caller must not kill the shared scrape.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from modules.statwrangler.events.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight()
+        calls = 0
+
+        async def scrape() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return "stats"
+
+        results = await asyncio.gather(
+            *(flight.do("siege:ubi:player", scrape) for _ in range(10))
+        )
+
+        assert results == ["stats"] * 10
+        assert calls == 1
+        assert flight.coalesced == 9
+        assert not flight.in_flight("siege:ubi:player")
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_shared_job() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def scrape() -> str:
+            await release.wait()
+            return "stats"
+
+        impatient = asyncio.create_task(flight.do("key", scrape))
+        patient = asyncio.create_task(flight.do("key", scrape))
+        await asyncio.sleep(0)
+
+        impatient.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await patient == "stats"
+        assert impatient.cancelled()
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_caller_and_free_the_key() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight()
+
+        async def broken() -> str:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("tracker down")
+
+        results = await asyncio.gather(
+            flight.do("key", broken), flight.do("key", broken), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def ok() -> str:
+            return "recovered"
+
+        assert await flight.do("key", ok) == "recovered"
+
+    asyncio.run(scenario())
+
+
+def test_distinct_keys_run_independently() -> None:
+    async def scenario() -> None:
+        flight = SingleFlight()
+
+        async def value(v: str) -> str:
+            await asyncio.sleep(0.01)
+            return v
+
+        a, b = await asyncio.gather(
+            flight.do("a", lambda: value("a")), flight.do("b", lambda: value("b"))
+        )
+        assert (a, b) == ("a", "b")
+        assert flight.started == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,144 @@
+"""
+Unit tests for modules/statwrangler/events/stats_cache.py.
+
+Goal:
+- Confirm repeat lookups are served from cache instead of re-scraping.
+- Lock down TTL / stale-while-revalidate behavior and the disk tier that
+  keeps results warm across restarts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from modules.statwrangler.events.stats_cache import StatsCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Scraper:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self) -> list[str]:
+        self.calls += 1
+        return [f"kd-{self.calls}"]
+
+
+def _cache(tmp_path, clock: _Clock, **kwargs) -> StatsCache:
+    return StatsCache(
+        tmp_path / "cache.sqlite3",
+        ttls={"siege": 60},
+        stale_for=300,
+        clock=clock,
+        **kwargs,
+    )
+
+
+def test_fresh_hit_skips_fetch_and_key_is_normalized(tmp_path) -> None:
+    async def scenario() -> None:
+        clock, scrape = _Clock(), _Scraper()
+        cache = _cache(tmp_path, clock)
+
+        first = await cache.get_or_fetch("siege", "ubi", "Player", scrape)
+        second = await cache.get_or_fetch("siege", "UBI", " player ", scrape)
+
+        assert first == second == ["kd-1"]
+        assert scrape.calls == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        await cache.close()
+
+    asyncio.run(scenario())
+
+
+def test_stale_hit_returns_old_value_and_refreshes_in_background(tmp_path) -> None:
+    async def scenario() -> None:
+        clock, scrape = _Clock(), _Scraper()
+        cache = _cache(tmp_path, clock)
+        await cache.get_or_fetch("siege", "ubi", "player", scrape)
+
+        clock.now += 120  # past TTL, inside the stale window
+        stale = await cache.get_or_fetch("siege", "ubi", "player", scrape)
+        assert stale == ["kd-1"]
+
+        while cache.stats()["refreshing"]:  # let the background refresh land
+            await asyncio.sleep(0.01)
+        fresh = await cache.get_or_fetch("siege", "ubi", "player", scrape)
+
+        assert fresh == ["kd-2"]
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.stats()["refreshes"] == 1
+        await cache.close()
+
+    asyncio.run(scenario())
+
+
+def test_expired_entry_is_a_miss(tmp_path) -> None:
+    async def scenario() -> None:
+        clock, scrape = _Clock(), _Scraper()
+        cache = _cache(tmp_path, clock)
+        await cache.get_or_fetch("siege", "ubi", "player", scrape)
+
+        clock.now += 60 + 300 + 1
+        assert await cache.get_or_fetch("siege", "ubi", "player", scrape) == ["kd-2"]
+        assert cache.stats()["misses"] == 2
+        await cache.close()
+
+    asyncio.run(scenario())
+
+
+def test_disk_tier_survives_restart(tmp_path) -> None:
+    async def scenario() -> None:
+        clock, scrape = _Clock(), _Scraper()
+        cache = _cache(tmp_path, clock)
+        await cache.get_or_fetch("siege", "ubi", "player", scrape)
+        await cache.close()
+
+        restarted = _cache(tmp_path, clock)
+        value = await restarted.get_or_fetch("siege", "ubi", "player", scrape)
+
+        assert value == ["kd-1"]
+        assert scrape.calls == 1
+        assert restarted.stats()["disk_hits"] == 1
+        await restarted.close()
+
+    asyncio.run(scenario())
+
+
+def test_uncacheable_results_are_not_stored(tmp_path) -> None:
+    async def scenario() -> None:
+        calls = 0
+
+        async def failed_scrape() -> list[None]:
+            nonlocal calls
+            calls += 1
+            return [None, None]
+
+        cache = _cache(tmp_path, _Clock())
+        for _ in range(2):
+            await cache.get_or_fetch(
+                "siege", "ubi", "ghost", failed_scrape, cacheable=any
+            )
+
+        assert calls == 2
+        await cache.close()
+
+    asyncio.run(scenario())
+
+
+def test_memory_tier_is_lru_bounded() -> None:
+    async def scenario() -> None:
+        cache = StatsCache(None, max_entries=2, clock=_Clock())
+        for name in ["a", "b", "c"]:
+            await cache.get_or_fetch("siege", "ubi", name, _Scraper())
+
+        assert cache.stats()["memory_entries"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,128 @@
+"""
+Unit tests for modules/statwrangler/events/username_index.py.
+
+Goal:
+- Lock down autocomplete matching (prefix + substring, case-insensitive)
+  and ranking by lookup frequency/recency.
+- Keep lookups fast as the username list grows; the trie keeps each name
+  only at the node it ends on, and 1-2 char queries only look at the grams
+  sharing their first character.
+- Ranking shortcuts (unused names filled in insertion order) give the same
+  results as scoring every match.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from modules.statwrangler.events.username_index import (
+    USAGE_HALF_LIFE_SECONDS,
+    UsernameIndex,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_empty_query_keeps_insertion_order() -> None:
+    index = UsernameIndex.from_usernames({"siege": ["Beaulo", "Shaiiko", "Pengu"]})
+    assert index.search("siege", "") == ["Beaulo", "Shaiiko", "Pengu"]
+
+
+def test_prefix_matches_rank_before_substring_matches() -> None:
+    index = UsernameIndex.from_usernames(
+        {"siege": ["xPengu", "Pengu", "PenguFan", "Shaiiko"]}
+    )
+    assert index.search("siege", "peng") == ["Pengu", "PenguFan", "xPengu"]
+
+
+def test_short_substring_queries_still_match() -> None:
+    index = UsernameIndex.from_usernames({"siege": ["Beaulo", "Shaiiko"]})
+    assert index.search("siege", "ii") == ["Shaiiko"]
+
+
+def test_short_queries_and_names_go_through_the_indexes() -> None:
+    index = UsernameIndex.from_usernames({"siege": ["Jo", "Bjorn", "Beaulo"]})
+    assert index.search("siege", "o") == ["Jo", "Bjorn", "Beaulo"]
+    assert index.search("siege", "jo") == ["Jo", "Bjorn"]
+    assert index.search("siege", "lo") == ["Beaulo"]
+
+    g = index._games["siege"]
+    b = g.root.children["b"]
+    assert b.name is None and b.children["j"].name is None
+    assert g.prefix_matches("b") == {"bjorn", "beaulo"}
+    assert g.gram_chars["j"] == {"jo", "bjo", "jor"}
+
+
+def test_substring_requires_real_contiguous_match() -> None:
+    index = UsernameIndex.from_usernames({"siege": ["abcXbcd"]})
+    # both 3-grams of "abcd" ("abc", "bcd") are present, just not adjacent
+    assert index.search("siege", "abcd") == []
+    assert index.search("siege", "xbc") == ["abcXbcd"]
+
+
+def test_games_are_isolated_and_duplicates_ignored() -> None:
+    index = UsernameIndex()
+    assert index.add("siege", "Pengu")
+    assert not index.add("siege", "pengu")
+    assert index.search("valorant", "pen") == []
+    assert ("siege", "PENGU") in index
+
+
+def test_frequently_and_recently_used_names_rank_first() -> None:
+    clock = _Clock()
+    index = UsernameIndex(clock=clock)
+    for name in ["alpha", "alpine", "alps"]:
+        index.add("siege", name)
+
+    index.touch("siege", "alpine")
+    index.touch("siege", "alpine")
+    assert index.search("siege", "al")[0] == "alpine"
+
+    # Old heavy usage decays below a fresh lookup
+    clock.now += 4 * USAGE_HALF_LIFE_SECONDS
+    index.touch("siege", "alps")
+    assert index.search("siege", "al")[:2] == ["alps", "alpine"]
+
+
+def test_search_matches_scoring_every_name() -> None:
+    rng = random.Random(7)
+    clock = _Clock()
+    index = UsernameIndex(clock=clock)
+    names = ["".join(rng.choices("abc12", k=rng.randint(1, 7))) for _ in range(800)]
+    for name in names:
+        index.add("siege", name)
+    for name in rng.sample(names, 40):
+        clock.now += rng.randint(0, USAGE_HALF_LIFE_SECONDS)
+        index.touch("siege", name)
+
+    g = index._games["siege"]
+
+    def expected(text: str, limit: int) -> list[str]:
+        def order(k: str) -> tuple:
+            return (not k.startswith(text), -index._score(g.stats[k], clock.now))
+
+        keys = sorted((k for k in g.stats if text in k), key=lambda k: g.stats[k].seq)
+        return [g.stats[k].display for k in sorted(keys, key=order)[:limit]]
+
+    for text in ["", "a", "2", "b1", "c2a", "ab1c", "zz"]:
+        for limit in (1, 5, 25, 500):
+            assert index.search("siege", text, limit) == expected(text, limit)
+
+
+def test_search_scales_to_large_lists() -> None:
+    names = [f"player{i:05d}" for i in range(30_000)]
+    index = UsernameIndex.from_usernames({"siege": names})
+
+    start = time.perf_counter()
+    for query in ["player1", "99", "r2999", "layer0001"]:
+        assert index.search("siege", query)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
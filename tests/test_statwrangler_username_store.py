@@ -0,0 +1,74 @@
+"""
+Unit tests for UsernameStore in modules/statwrangler/events/username_processor.py.
+
+Goal:
+- Membership checks and adds never hit the disk on the hot path.
+- A burst of new names is coalesced into one atomic write.
+- flush() (used on shutdown) persists anything still pending.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from modules.statwrangler.events.username_processor import UsernameStore
+
+
+def _seed(path, data: dict) -> None:
+    path.write_text(json.dumps(data))
+
+
+def test_loads_existing_file_in_order(tmp_path) -> None:
+    path = tmp_path / "usernames.json"
+    _seed(path, {"siege": ["b", "a", "c"]})
+
+    store = UsernameStore(path)
+
+    assert store.get("siege") == ["b", "a", "c"]
+    assert ("siege", "a") in store
+    assert ("fortnite", "a") not in store
+
+
+def test_burst_of_adds_is_one_debounced_write(tmp_path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "usernames.json"
+        store = UsernameStore(path, debounce=0.05)
+
+        assert store.add("siege", "one")
+        assert store.add("siege", "two")
+        assert not store.add("siege", "one")
+        assert not path.exists()  # nothing written synchronously
+
+        await asyncio.sleep(0.2)
+
+        assert store.writes == 1
+        assert json.loads(path.read_text()) == {"siege": ["one", "two"]}
+        # atomic write leaves no temp files behind
+        assert [p.name for p in tmp_path.iterdir()] == ["usernames.json"]
+
+    asyncio.run(scenario())
+
+
+def test_flush_writes_pending_changes_immediately(tmp_path) -> None:
+    async def scenario() -> None:
+        path = tmp_path / "usernames.json"
+        store = UsernameStore(path, debounce=60)
+
+        store.add("valorant", "player#1234")
+        await store.flush()
+
+        assert json.loads(path.read_text()) == {"valorant": ["player#1234"]}
+        assert not store.dirty
+
+        await store.flush()  # nothing pending -> no extra write
+        assert store.writes == 1
+
+    asyncio.run(scenario())
+
+
+def test_corrupt_file_starts_empty(tmp_path) -> None:
+    path = tmp_path / "usernames.json"
+    path.write_text("{not json")
+
+    assert UsernameStore(path).as_dict() == {}
@@ -0,0 +1,231 @@
+"""
+Unit tests for utils/sync_scheduler.py.
+
+Goal:
+- Drive the AIMD sync scheduler against a fake Discord HTTP layer that
+  answers 429 when too many syncs are in flight, and check it backs off,
+  retries, and still finishes every guild.
+- Lock down which failures are retried (429, 5xx) and which are not (403).
+- Against py-cord's real HTTPClient and a local server answering real 429
+  responses (which py-cord retries itself), the scheduler still sees each
+  429 and backs off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+import aiohttp
+import discord
+from aiohttp import web
+from discord.http import HTTPClient, Route
+
+from utils.sync_scheduler import AdaptiveSyncScheduler, retry_after_seconds
+
+
+def _http_error(status: int, *, retry_after: float | None = None):
+    headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+    response = SimpleNamespace(status=status, reason="fake", headers=headers)
+    if status == 403:
+        return discord.Forbidden(response, "Missing Access")
+    return discord.HTTPException(response, "fake error")
+
+
+class _FakeDiscordHTTP:
+    """Accepts up to `capacity` concurrent syncs; beyond that it answers 429."""
+
+    def __init__(self, capacity: int, *, retry_after: float = 0.01) -> None:
+        self.capacity = capacity
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+        self.synced: list[int] = []
+
+    async def sync(self, guild_id: int) -> None:
+        self.calls += 1
+        self.in_flight += 1
+        try:
+            if self.in_flight > self.capacity:
+                self.throttled += 1
+                raise _http_error(429, retry_after=self.retry_after)
+            await asyncio.sleep(0.005)
+            self.synced.append(guild_id)
+        finally:
+            self.in_flight -= 1
+
+
+def _scheduler(**kwargs) -> AdaptiveSyncScheduler:
+    kwargs.setdefault("base_backoff", 0.01)
+    return AdaptiveSyncScheduler(**kwargs)
+
+
+def test_backs_off_on_429_and_completes_every_guild() -> None:
+    async def scenario() -> None:
+        http = _FakeDiscordHTTP(capacity=2)
+        scheduler = _scheduler(initial=6, max_concurrency=8, max_retries=10)
+
+        report = await scheduler.run(list(range(30)), http.sync)
+
+        assert report.results == {gid: "ok" for gid in range(30)}
+        assert sorted(http.synced) == list(range(30))
+        assert http.throttled > 0
+        assert report.rate_limited == http.throttled
+        assert scheduler.limit < 6  # multiplicative decrease kicked in
+        assert report.throughput > 0
+        assert report.timings[0].attempts >= 1
+
+    asyncio.run(scenario())
+
+
+def test_additive_increase_without_rate_limits() -> None:
+    async def scenario() -> None:
+        http = _FakeDiscordHTTP(capacity=100)
+        scheduler = _scheduler(initial=1, max_concurrency=5)
+
+        report = await scheduler.run(list(range(40)), http.sync)
+
+        assert http.throttled == 0
+        assert report.peak_concurrency > 1
+        assert report.final_concurrency == 5
+
+    asyncio.run(scenario())
+
+
+def test_transient_errors_are_retried() -> None:
+    async def scenario() -> None:
+        attempts = 0
+
+        async def flaky(gid: int) -> None:
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise _http_error(503)
+
+        report = await _scheduler().run([1], flaky)
+
+        assert report.results == {1: "ok"}
+        assert report.timings[1].attempts == 3
+        assert report.retries == 2
+
+    asyncio.run(scenario())
+
+
+def test_permanent_errors_fail_fast() -> None:
+    async def scenario() -> None:
+        calls = 0
+
+        async def forbidden(gid: int) -> None:
+            nonlocal calls
+            calls += 1
+            raise _http_error(403)
+
+        report = await _scheduler().run([1], forbidden)
+
+        assert report.results[1].startswith("error: Forbidden")
+        assert calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_gives_up_after_max_retries() -> None:
+    async def scenario() -> None:
+        async def always_throttled(gid: int) -> None:
+            raise _http_error(429, retry_after=0)
+
+        report = await _scheduler(max_retries=2).run([1], always_throttled)
+
+        assert report.results[1].startswith("error: HTTPException")
+        assert report.timings[1].attempts == 3
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_parsing() -> None:
+    assert retry_after_seconds(_http_error(429, retry_after=1.5)) == 1.5
+    assert retry_after_seconds(_http_error(429)) is None
+
+
+class _RateLimitingServer:
+    """Discord-ish REST server: 429 with Retry-After above `capacity` in flight."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.in_flight = 0
+        self.throttled = 0
+        self.synced: list[int] = []
+
+    async def bulk_upsert(self, request: web.Request) -> web.Response:
+        self.in_flight += 1
+        try:
+            if self.in_flight > self.capacity:
+                self.throttled += 1
+                body = {"message": "You are being rate limited.", "retry_after": 0.02}
+                return web.Response(
+                    status=429,
+                    body=json.dumps(body).encode(),
+                    headers={
+                        # Exactly what py-cord checks for before parsing
+                        "Content-Type": "application/json",
+                        "Retry-After": "0.02",
+                        "X-RateLimit-Scope": "user",
+                        "Via": "1.1 google",
+                    },
+                )
+            await asyncio.sleep(0.01)
+            self.synced.append(int(request.match_info["guild_id"]))
+            return web.json_response([])
+        finally:
+            self.in_flight -= 1
+
+
+@contextlib.asynccontextmanager
+async def _discord_http(server: _RateLimitingServer):
+    app = web.Application()
+    app.router.add_put(
+        "/applications/{app_id}/guilds/{guild_id}/commands", server.bulk_upsert
+    )
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    http = HTTPClient()
+    http._HTTPClient__session = aiohttp.ClientSession()
+    base = property(lambda self: f"http://127.0.0.1:{port}")
+    try:
+        with mock.patch.object(Route, "base", base):
+            yield http
+    finally:
+        await http._HTTPClient__session.close()
+        await runner.cleanup()
+
+
+def test_sees_429s_that_pycord_retries_internally() -> None:
+    async def scenario() -> None:
+        server = _RateLimitingServer(capacity=2)
+        async with _discord_http(server) as http:
+
+            async def sync(gid: int) -> None:
+                await http.bulk_upsert_guild_commands(1, gid, [])
+
+            scheduler = _scheduler(initial=8, max_concurrency=8)
+            report = await scheduler.run(list(range(20)), sync)
+
+        assert report.results == {gid: "ok" for gid in range(20)}
+        assert sorted(server.synced) == list(range(20))
+        # Most 429s were retried inside py-cord and never raised
+        timings = report.timings.values()
+        assert sum(t.rate_limited for t in timings) > sum(
+            t.attempts - 1 for t in timings
+        )
+        assert server.throttled > 0
+        assert report.rate_limited == server.throttled
+        assert scheduler.limit < 8
+
+    asyncio.run(scenario())
@@ -1,12 +1,54 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import hashlib
+import heapq
+import itertools
 import json
+import logging
+import os
+import re
+import tempfile
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import discord
 
+from .metrics import REGISTRY
+from .sync_scheduler import AdaptiveSyncScheduler, GuildSyncTiming, SyncReport
+
+logger = logging.getLogger("guildpilot.sync")
+
+GUILD_SYNCS = REGISTRY.counter(
+    "guildpilot_guild_syncs",
+    "Per-guild command sync results (ok/unchanged/not_in_guild/error).",
+    ["outcome"],
+)
+GUILD_SYNC_SECONDS = REGISTRY.histogram(
+    "guildpilot_guild_sync_seconds",
+    "Time to sync commands to one guild, including retries.",
+)
+SYNC_RATE_LIMITED = REGISTRY.counter(
+    "guildpilot_guild_sync_rate_limited",
+    "Discord 429 responses seen while syncing commands.",
+)
+
+
+def _item_id(item: Any, *, bare_ints: bool) -> int | None:
+    """The guild id of one registry list entry, or None if it has none."""
+    if bare_ints and isinstance(item, int):
+        return item
+    if isinstance(item, dict) and "id" in item:
+        try:
+            return int(item["id"])
+        except (TypeError, ValueError):
+            pass
+    return None
+
 
 def extract_guild_ids(data: Any) -> list[int]:
     guild_ids: set[int] = set()
@@ -14,24 +56,18 @@ def extract_guild_ids(data: Any) -> list[int]:
     # Case A: [123, 456] or [{"id":123}, ...]
     if isinstance(data, list):
         for item in data:
-            if isinstance(item, int):
-                guild_ids.add(item)
-            elif isinstance(item, dict) and "id" in item:
-                try:
-                    guild_ids.add(int(item["id"]))
-                except (TypeError, ValueError):
-                    pass
+            gid = _item_id(item, bare_ints=True)
+            if gid is not None:
+                guild_ids.add(gid)
 
     # Case B: {"servers": [{"id":...}, ...]}  ✅ YOUR FILE
     elif isinstance(data, dict):
         for key in ("servers", "guilds"):
             if isinstance(data.get(key), list):
                 for item in data[key]:
-                    if isinstance(item, dict) and "id" in item:
-                        try:
-                            guild_ids.add(int(item["id"]))
-                        except (TypeError, ValueError):
-                            pass
+                    gid = _item_id(item, bare_ints=False)
+                    if gid is not None:
+                        guild_ids.add(gid)
 
         # Case C: {"123": {...}, "456": {...}}
         for k in data.keys():
@@ -43,12 +79,275 @@ def extract_guild_ids(data: Any) -> list[int]:
     return sorted(guild_ids)
 
 
+class _JsonStream:
+    """
+    Just enough of an incremental JSON reader to walk a registry file's top
+    level: whole values are decoded one at a time with raw_decode, so only
+    the current entry (plus one read chunk) is ever in memory.
+    """
+
+    _WS = re.compile(r"[ \t\n\r]*")
+    _NUMBER = "0123456789.eE+-"
+
+    def __init__(self, f: IO[str], chunk_size: int) -> None:
+        self._f = f
+        self._chunk = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        if self._eof:
+            return False
+        data = self._f.read(size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of file), not consumed."""
+        while True:
+            self._pos = self._WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(self._chunk):
+                return ""
+
+    def take(self, expected: str) -> str:
+        c = self.peek()
+        if not c or c not in expected:
+            raise self.error(f"Expecting one of {expected!r}")
+        self._pos += 1
+        return c
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Most likely cut off at the end of the buffer: read more
+                # (doubling, so a huge entry isn't re-parsed chunk by chunk)
+                if self._fill(max(self._chunk, len(self._buf))):
+                    continue
+                raise
+            # A number cut off by the end of the buffer decodes as a shorter
+            # one (123|45, 2|.5): make sure we've seen where it ends
+            if (end == len(self._buf) or self._buf[end] in self._NUMBER) and self._fill(
+                self._chunk
+            ):
+                continue
+            self._pos = end
+            return obj
+
+    def array(self) -> Iterator[Any]:
+        """Yield the items of the array starting here, one at a time."""
+        self.take("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.take(",]") == "]":
+                return
+
+
+def iter_guild_entries_from_json(
+    path: Path, *, chunk_size: int = 64 * 1024
+) -> Iterator[tuple[int, dict]]:
+    """
+    Stream (guild id, entry) pairs out of a registry file in constant memory.
+
+    Reads every shape extract_guild_ids does, in file order, without
+    loading the file: memory is bounded by one entry, not the registry.
+    entry is the guild's record ({} for a bare id or a non-object value).
+    Ids are not de-duplicated (a set would grow with the file); use
+    load_guild_ids_from_json or load_guild_id_array for a sorted set.
+    Raises json.JSONDecodeError on malformed JSON, like json.loads.
+    """
+    with path.open(encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        first = stream.peek()
+
+        # Case A: [123, 456] or [{"id":123}, ...]
+        if first == "[":
+            for item in stream.array():
+                gid = _item_id(item, bare_ints=True)
+                if gid is not None:
+                    yield gid, item if isinstance(item, dict) else {}
+
+        # Case B/C: {"servers": [...]} / {"guilds": [...]} / {"123": {...}}
+        elif first == "{":
+            stream.take("{")
+            closed = stream.peek() == "}"
+            if closed:
+                stream.take("}")
+            while not closed:
+                key = stream.value()
+                if not isinstance(key, str):
+                    raise stream.error("Expecting property name")
+                stream.take(":")
+                value: Any = None
+                if key in ("servers", "guilds") and stream.peek() == "[":
+                    for item in stream.array():
+                        gid = _item_id(item, bare_ints=False)
+                        if gid is not None:
+                            yield gid, item
+                else:
+                    value = stream.value()  # a Case C record (or anything else)
+                try:
+                    gid = int(key)
+                except ValueError:
+                    pass
+                else:
+                    yield gid, value if isinstance(value, dict) else {}
+                closed = stream.take(",}") == "}"
+
+        else:
+            stream.value()  # a scalar: no ids, but invalid JSON still raises
+
+        if stream.peek():
+            raise stream.error("Extra data")
+
+
+def iter_guild_ids_from_json(
+    path: Path, *, chunk_size: int = 64 * 1024
+) -> Iterator[int]:
+    """iter_guild_entries_from_json, ids only."""
+    for gid, _ in iter_guild_entries_from_json(path, chunk_size=chunk_size):
+        yield gid
+
+
 def load_guild_ids_from_json(path: Path) -> list[int]:
     if not path.exists():
         return []
 
-    raw = json.loads(path.read_text(encoding="utf-8"))
-    return extract_guild_ids(raw)
+    return sorted(set(iter_guild_ids_from_json(path)))
+
+
+class GuildIdArray(Sequence[int]):
+    """
+    Sorted, de-duplicated guild ids packed in an array('q') (8 bytes per id
+    instead of ~60 for an int in a list or set) with O(log n) membership,
+    for holding a very large registry during sync planning.
+    """
+
+    __slots__ = ("ids",)
+
+    def __init__(self, ids: array | None = None) -> None:
+        self.ids = ids if ids is not None else array("q")
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int], *, run: int = 64 * 1024) -> GuildIdArray:
+        """
+        Build from unsorted ids (e.g. iter_guild_ids_from_json). Sorts in
+        runs of `run` ids and merges them, so the only Python ints alive at
+        once are one run's worth.
+        """
+        runs: list[array] = []
+        it = iter(ids)
+        while chunk := list(itertools.islice(it, run)):
+            runs.append(array("q", sorted(chunk)))
+
+        out = array("q")
+        last = None
+        for gid in heapq.merge(*runs):
+            if gid != last:
+                out.append(gid)
+                last = gid
+        return cls(out)
+
+    def __contains__(self, guild_id: object) -> bool:
+        if not isinstance(guild_id, int):
+            return False
+        i = bisect.bisect_left(self.ids, guild_id)
+        return i < len(self.ids) and self.ids[i] == guild_id
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.ids[index]
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.itemsize * len(self.ids)
+
+
+def load_guild_id_array(path: Path) -> GuildIdArray:
+    """load_guild_ids_from_json, streamed into a compact GuildIdArray."""
+    if not path.exists():
+        return GuildIdArray()
+    return GuildIdArray.from_ids(iter_guild_ids_from_json(path))
+
+
+# ---------------- Command fingerprints ----------------
+def command_fingerprint(bot: discord.Bot) -> str:
+    """
+    Stable hash of the local application-command payloads. If it matches what
+    we last synced to a guild, that guild's commands are already up to date.
+    """
+    payloads = [cmd.to_dict() for cmd in bot.pending_application_commands]
+    canonical = sorted(
+        json.dumps(p, sort_keys=True, separators=(",", ":"), default=str)
+        for p in payloads
+    )
+    return hashlib.sha256("\n".join(canonical).encode("utf-8")).hexdigest()
+
+
+def sync_state_path_for(guilds_json_path: Path) -> Path:
+    """public_guilds.json -> public_guilds.sync_state.json (same folder)."""
+    return guilds_json_path.with_name(f"{guilds_json_path.stem}.sync_state.json")
+
+
+def load_sync_state(path: Path) -> dict[str, dict]:
+    """
+    Returns dict: guild_id_str -> {"fingerprint": str, "synced_at_utc": str}
+    Stored as {"guilds": { "<id>": { ... } }}
+    """
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    guilds = data.get("guilds") if isinstance(data, dict) else None
+    return guilds if isinstance(guilds, dict) else {}
+
+
+def save_sync_state(path: Path, guilds: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"guilds": guilds}, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def record_guild_sync(path: Path, guild_ids: list[int], fingerprint: str) -> None:
+    """Remember a successful sync (e.g. from the manual /sync command)."""
+    state = load_sync_state(path)
+    now = datetime.now(UTC).isoformat()
+    for gid in guild_ids:
+        state[str(gid)] = {"fingerprint": fingerprint, "synced_at_utc": now}
+    save_sync_state(path, state)
 
 
 async def sync_commands_to_guilds_from_file(
@@ -57,32 +356,83 @@ async def sync_commands_to_guilds_from_file(
     *,
     tag: str = "guilds",
     concurrency: int = 3,
+    max_concurrency: int = 10,
+    force: bool = False,
+    state_path: Path | None = None,
+    scheduler: AdaptiveSyncScheduler | None = None,
+    on_progress: Callable[[int, str, int], Any] | None = None,
+    guild_ids: Sequence[int] | None = None,
+    compact: bool = False,
 ) -> dict[int, str]:
     """
     Reads guild IDs from guilds_json_path and syncs slash commands to each guild.
-    Logs per-guild results with guild name + id.
-    Returns {guild_id: "ok" | "not_in_guild" | "error: ..."}.
+    Guilds whose last successful sync used the same command fingerprint are
+    skipped unless force=True. Syncs run through an AdaptiveSyncScheduler that
+    starts at `concurrency` in flight and adapts to Discord 429s (AIMD).
+    Logs per-guild results with guild name + id, timings and throughput.
+    on_progress(guild_id, outcome, total) is called as each guild resolves.
+    guild_ids (e.g. from the GuildStore) replaces reading the JSON file; the
+    sync state still lives next to guilds_json_path.
+    The JSON file is streamed in a worker thread; compact=True keeps its ids
+    in a GuildIdArray (8 bytes per guild) for very large registries.
+    Returns {guild_id: "ok" | "unchanged" | "not_in_guild" | "error: ..."}.
     """
-    guild_ids = load_guild_ids_from_json(guilds_json_path)
+    if guild_ids is None:
+        loader = load_guild_id_array if compact else load_guild_ids_from_json
+        guild_ids = await asyncio.to_thread(loader, guilds_json_path)
 
     if not guild_ids:
-        print(f"[SYNC:{tag}] No guild IDs found in {guilds_json_path}")
+        logger.info(
+            "no guild ids in registry",
+            extra={"tag": tag, "path": str(guilds_json_path)},
+        )
         return {}
 
     present_ids = {g.id for g in bot.guilds}
     target_ids = [gid for gid in guild_ids if gid in present_ids]
     missing_ids = [gid for gid in guild_ids if gid not in present_ids]
 
-    print(
-        f"[SYNC:{tag}] registry: {len(guild_ids)} ids | "
-        f"connected: {len(present_ids)} guilds | "
-        f"targets: {len(target_ids)} | "
-        f"skipping: {len(missing_ids)}"
+    logger.info(
+        "registry: %d ids | connected: %d guilds | targets: %d | skipping: %d",
+        len(guild_ids),
+        len(present_ids),
+        len(target_ids),
+        len(missing_ids),
+        extra={"tag": tag},
     )
 
     results: dict[int, str] = {gid: "not_in_guild" for gid in missing_ids}
 
-    sem = asyncio.Semaphore(concurrency)
+    def _progress(gid: int, outcome: str) -> None:
+        GUILD_SYNCS.inc(outcome="error" if outcome.startswith("error") else outcome)
+        if on_progress is not None:
+            on_progress(gid, outcome, len(guild_ids))
+
+    for gid in missing_ids:
+        _progress(gid, "not_in_guild")
+
+    state_path = state_path or sync_state_path_for(guilds_json_path)
+    state = load_sync_state(state_path)
+    fingerprint = command_fingerprint(bot)
+
+    if not force:
+        unchanged = [
+            gid
+            for gid in target_ids
+            if state.get(str(gid), {}).get("fingerprint") == fingerprint
+        ]
+        for gid in unchanged:
+            results[gid] = "unchanged"
+            _progress(gid, "unchanged")
+        target_ids = [gid for gid in target_ids if gid not in results]
+        if unchanged:
+            logger.info(
+                "%d guild(s) unchanged since last sync (fingerprint %s); "
+                "use --force-sync to override",
+                len(unchanged),
+                fingerprint[:12],
+                extra={"tag": tag},
+            )
 
     def _guild_label(gid: int) -> str:
         g = bot.get_guild(gid)
@@ -91,37 +441,75 @@ async def sync_commands_to_guilds_from_file(
         return f"{g.name} ({g.id})"
 
     async def _sync_one(gid: int) -> None:
-        async with sem:
-            label = _guild_label(gid)
-            try:
-                print(f"[SYNC:{tag}] → syncing to {label}")
-                synced = await bot.sync_commands(guild_ids=[gid])
+        logger.debug("syncing", extra={"tag": tag, "guild_id": gid})
+        await bot.sync_commands(guild_ids=[gid])
 
-                # py-cord may return None even on success
-                if synced is None:
-                    results[gid] = "ok"
-                    print(f"[SYNC:{tag}] ✅ synced {label}")
-                else:
-                    results[gid] = "ok"
-                    print(f"[SYNC:{tag}] ✅ synced {label} ({len(synced)} commands)")
+    def _on_result(gid: int, outcome: str, timing: GuildSyncTiming) -> None:
+        results[gid] = outcome
+        _progress(gid, outcome)
+        GUILD_SYNC_SECONDS.observe(timing.seconds)
+        fields = {
+            "tag": tag,
+            "guild_id": gid,
+            "guild": _guild_label(gid),
+            "latency_ms": round(timing.seconds * 1000),
+            "attempts": timing.attempts,
+        }
+        if outcome == "ok":
+            logger.info("synced guild", extra=fields)
+        else:
+            logger.error(
+                "guild sync failed: %s", outcome[len("error: ") :], extra=fields
+            )
 
-            except Exception as e:
-                results[gid] = f"error: {type(e).__name__}: {e}"
-                print(f"[SYNC:{tag}] ❌ failed {label}: {type(e).__name__}: {e}")
+    if scheduler is None:
+        scheduler = AdaptiveSyncScheduler(
+            initial=concurrency, max_concurrency=max_concurrency
+        )
+    report: SyncReport = await scheduler.run(
+        target_ids, _sync_one, on_result=_on_result
+    )
+    SYNC_RATE_LIMITED.inc(report.rate_limited)
+    if target_ids:
+        logger.info(
+            "throughput: %.2f guilds/s over %.1fs | peak concurrency %d | "
+            "%d rate-limited | %d retries",
+            report.throughput,
+            report.elapsed,
+            report.peak_concurrency,
+            report.rate_limited,
+            report.retries,
+            extra={"tag": tag},
+        )
 
-    await asyncio.gather(*(_sync_one(gid) for gid in target_ids))
+    synced_ids = [gid for gid in target_ids if results.get(gid) == "ok"]
+    if synced_ids:
+        now = datetime.now(UTC).isoformat()
+        for gid in synced_ids:
+            state[str(gid)] = {"fingerprint": fingerprint, "synced_at_utc": now}
+        try:
+            await asyncio.to_thread(save_sync_state, state_path, state)
+        except Exception as e:
+            logger.warning("could not save sync state: %r", e, extra={"tag": tag})
 
     ok = sum(1 for v in results.values() if v == "ok")
+    unchanged_count = sum(1 for v in results.values() if v == "unchanged")
     err = sum(
         1 for v in results.values() if isinstance(v, str) and v.startswith("error:")
     )
     skipped = sum(1 for v in results.values() if v == "not_in_guild")
 
-    print(f"[SYNC:{tag}] done: {ok} ok | {err} errors | {skipped} skipped")
+    logger.info(
+        "done: %d ok | %d unchanged | %d errors | %d skipped",
+        ok,
+        unchanged_count,
+        err,
+        skipped,
+        extra={"tag": tag},
+    )
 
-    # Optional: print skipped guilds by name/id for clarity
-    if skipped:
-        for gid in missing_ids:
-            print(f"[SYNC:{tag}] ⏭️  skipped (bot not in guild): {_guild_label(gid)}")
+    # Skipped guilds by id, for clarity
+    for gid in missing_ids:
+        logger.debug("skipped (bot not in guild)", extra={"tag": tag, "guild_id": gid})
 
     return results
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+# Attributes every LogRecord has; anything else came in via extra={...}
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("x", logging.INFO, "x", 0, "x", None, None))
+) | {"message", "asctime", "taskName"}
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+TEXT_DATEFMT = "%I:%M:%S %p"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, msg, plus every field passed
+    through extra= (guild_id, command, latency_ms, ...), and exc on errors.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                out[key] = value
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            out["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(out, default=str, ensure_ascii=False)
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """'pilotai=0.1,guildpilot.sync=0.5' -> {'pilotai': 0.1, ...}"""
+    rates: dict[str, float] = {}
+    for part in spec.split(","):
+        name, sep, value = part.partition("=")
+        if sep and name.strip():
+            rates[name.strip()] = min(1.0, max(0.0, float(value)))
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of sub-WARNING records per subsystem (logger-name
+    prefix; the longest matching prefix wins). Warnings and errors always
+    pass, so sampling never hides a failure.
+    """
+
+    def __init__(
+        self, rates: dict[str, float], *, rng: Callable[[], float] = random.random
+    ) -> None:
+        super().__init__()
+        # Longest prefix first so "pilotai.storage" beats "pilotai"
+        self.rates = sorted(rates.items(), key=lambda kv: -len(kv[0]))
+        self._rng = rng
+        self.dropped = 0
+
+    def rate_for(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        if rate >= 1.0 or self._rng() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue: when the writer thread falls behind
+    (a busy guild flooding the log), records are dropped and counted rather
+    than blocking the event loop.
+
+    prepare() only merges msg % args (so later mutation of args can't change
+    the message); JSON encoding, traceback formatting and the write itself
+    happen on the listener thread.
+    """
+
+    def __init__(self, q: queue.Queue) -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: NonBlockingQueueHandler | None = None
+
+
+def setup_logging(
+    *,
+    fmt: str | None = None,
+    level: str | int | None = None,
+    sample: str | None = None,
+    max_queue: int = 10_000,
+    stream=None,
+) -> NonBlockingQueueHandler:
+    """
+    Route all logging through a bounded queue to a background writer thread.
+
+    fmt: "json" (default) or "text"; env LOG_FORMAT.
+    level: root level; env LOG_LEVEL (default INFO).
+    sample: per-subsystem sampling, e.g. "pilotai=0.1"; env LOG_SAMPLE.
+
+    Idempotent: calling again (e.g. run_two_bots) reuses the pipeline.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+
+    fmt = (fmt or os.getenv("LOG_FORMAT", "json")).lower()
+    level = level or os.getenv("LOG_LEVEL", "INFO").upper()
+    sample = sample if sample is not None else os.getenv("LOG_SAMPLE", "")
+
+    out = logging.StreamHandler(stream or sys.stdout)
+    if fmt == "text":
+        out.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT))
+    else:
+        out.setFormatter(JsonFormatter())
+
+    q: queue.Queue = queue.Queue(maxsize=max_queue)
+    handler = NonBlockingQueueHandler(q)
+    if sample:
+        handler.addFilter(SamplingFilter(parse_sample_rates(sample)))
+
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(q, out, respect_handler_level=True)
+    _listener.start()
+    _queue_handler = handler
+    atexit.register(shutdown_logging)
+    return handler
+
+
+def shutdown_logging() -> None:
+    """Flush whatever is queued and stop the writer thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
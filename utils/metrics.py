@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+
+logger = logging.getLogger("guildpilot.metrics")
+
+# Seconds; covers a fast slash command up to a slow scrape/completion
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]: ...
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.doc}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. requests served or errors seen."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._children.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._children.items())
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_total{labels} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """
+    Value that goes up and down. Either set() it, or pass `function` to
+    read the current value at scrape time (unlabelled gauges only).
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str] = (),
+        *,
+        function: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(name, doc, labelnames)
+        self._function = function
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: object) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._children.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        if self._function is not None:
+            try:
+                yield f"{self.name} {_format_value(float(self._function()))}"
+            except Exception as e:
+                logger.warning("gauge %s callback failed: %r", self.name, e)
+            return
+        with self._lock:
+            items = sorted(self._children.items())
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * n_buckets
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Distribution of observations (latencies) in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, doc, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = _HistogramChild(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    child.counts[i] += 1
+                    break
+            child.sum += value
+            child.count += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def count(self, **labels: object) -> int:
+        child = self._children.get(self._key(labels))
+        return child.count if child else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = [
+                (key, list(c.counts), c.sum, c.count)
+                for key, c in sorted(self._children.items())
+            ]
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts, strict=True):
+                cumulative += n
+                le = _format_labels(
+                    self.labelnames, key, f'le="{_format_value(bound)}"'
+                )
+                yield f"{self.name}_bucket{le} {cumulative}"
+            inf = _format_labels(self.labelnames, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{inf} {count}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class Registry:
+    """Named metrics for this process, rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Re-importing a cog (reload_extension) must not duplicate
+                if type(existing) is not type(metric):
+                    raise ValueError(f"metric {metric.name} already registered")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, doc, labelnames))  # type: ignore[return-value]
+
+    def gauge(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str] = (),
+        *,
+        function: Callable[[], float] | None = None,
+    ) -> Gauge:
+        gauge = self._register(Gauge(name, doc, labelnames, function=function))
+        if function is not None:
+            gauge._function = function  # latest bot wins after a reload
+        return gauge  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        doc: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, doc, labelnames, buckets=buckets))  # type: ignore[return-value]
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return "".join(m.render() for m in metrics)
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    Serves GET /metrics for a registry over HTTP (aiohttp, already a py-cord
+    dependency). Binds to 127.0.0.1 unless told otherwise: the endpoint has
+    no auth, so exposing it is a deliberate METRICS_HOST choice.
+    """
+
+    def __init__(
+        self,
+        registry: Registry = REGISTRY,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 9108,
+    ) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    @classmethod
+    def from_env(cls, *, port_offset: int = 0) -> MetricsServer | None:
+        """None when METRICS_PORT=0 (disabled)."""
+        port = int(os.getenv("METRICS_PORT", "9108"))
+        if port == 0:
+            return None
+        return cls(host=os.getenv("METRICS_HOST", "127.0.0.1"), port=port + port_offset)
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    async def start(self) -> None:
+        from aiohttp import web
+
+        if self._runner is not None:
+            return
+
+        async def metrics(request: web.Request) -> web.Response:
+            body = self.registry.render()
+            return web.Response(
+                body=body.encode("utf-8"), headers={"Content-Type": CONTENT_TYPE}
+            )
+
+        app = web.Application()
+        app.router.add_get("/metrics", metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port)
+        try:
+            await site.start()
+        except OSError:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        if self.port == 0:
+            # Ephemeral port (tests): report what the OS picked
+            self.port = runner.addresses[0][1]
+        logger.info("metrics on http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
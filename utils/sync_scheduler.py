@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+import discord
+
+# Server-side hiccups worth retrying (429 is handled separately)
+TRANSIENT_STATUSES = {500, 502, 503, 504}
+
+
+@dataclass
+class GuildSyncTiming:
+    guild_id: int
+    attempts: int = 0
+    seconds: float = 0.0
+    rate_limited: int = 0
+    outcome: str = "pending"
+
+
+@dataclass
+class SyncReport:
+    results: dict[int, str]
+    timings: dict[int, GuildSyncTiming]
+    elapsed: float
+    peak_concurrency: int
+    final_concurrency: float
+    rate_limited: int = 0
+    retries: int = 0
+    notes: list[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Completed guild syncs per second over the whole run."""
+        done = sum(1 for v in self.results.values() if v == "ok")
+        return done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Best-effort Retry-After from a Discord 429, in seconds."""
+    value = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        value = headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    return isinstance(exc, discord.HTTPException) and exc.status == 429
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, discord.HTTPException):
+        return exc.status in TRANSIENT_STATUSES
+    return isinstance(exc, aiohttp.ClientError | asyncio.TimeoutError | OSError)
+
+
+# The scheduler and guild of the sync running in the current task
+_current_sync: contextvars.ContextVar[
+    tuple[AdaptiveSyncScheduler, GuildSyncTiming] | None
+] = contextvars.ContextVar("sync_scheduler_current", default=None)
+
+
+class _RateLimitLogHook(logging.Handler):
+    """
+    py-cord's HTTPClient.request handles 429s itself: it sleeps for
+    retry_after and retries (up to 5 tries), so bot.sync_commands only raises
+    once those run out. The "We are being rate limited" warning it logs on
+    discord.http is the one place each 429 is visible. It's emitted in the
+    task that made the request, so _current_sync says whose sync it was.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        current = _current_sync.get()
+        if current is None or not str(record.msg).startswith(
+            "We are being rate limited"
+        ):
+            return
+        args = record.args if isinstance(record.args, tuple) else ()
+        try:
+            retry_after: float | None = max(0.0, float(args[0]))
+        except (TypeError, ValueError, IndexError):
+            retry_after = None
+        scheduler, timing = current
+        timing.rate_limited += 1
+        scheduler._retries += 1  # py-cord retries it
+        scheduler._on_rate_limited(retry_after)
+
+
+_RATE_LIMIT_HOOK = _RateLimitLogHook()
+
+
+def _install_rate_limit_hook() -> None:
+    log = logging.getLogger("discord.http")
+    if _RATE_LIMIT_HOOK not in log.handlers:
+        log.addHandler(_RATE_LIMIT_HOOK)
+
+
+class AdaptiveSyncScheduler:
+    """
+    Runs per-guild command syncs with AIMD concurrency control.
+
+    - Starts at `initial` concurrent syncs.
+    - Additive increase: each success adds increase/limit, i.e. roughly +1
+      slot per "round" of successes, up to max_concurrency.
+    - Multiplicative decrease: a 429 multiplies the limit by `decrease`
+      (floor min_concurrency) and pauses every worker until Retry-After.
+      429s that py-cord retries internally are seen through its discord.http
+      rate-limit warning; ones it gives up on arrive as HTTPException.
+    - 429s and transient errors (5xx, network) that reach us are retried
+      with jittered backoff up to max_retries; anything else fails the guild
+      immediately.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 3,
+        min_concurrency: int = 1,
+        max_concurrency: int = 10,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        max_retries: int = 4,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(
+            min(max(initial, self.min_concurrency), self.max_concurrency)
+        )
+        self.increase = increase
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._clock = clock
+        self._jitter = jitter
+
+        self._in_flight = 0
+        self._peak = 0
+        self._resume_at = 0.0
+        self._cond: asyncio.Condition | None = None
+        self._rate_limited = 0
+        self._retries = 0
+
+    async def run(
+        self,
+        guild_ids: list[int],
+        sync_one: Callable[[int], Awaitable[Any]],
+        *,
+        on_result: Callable[[int, str, GuildSyncTiming], Any] | None = None,
+    ) -> SyncReport:
+        """
+        Call sync_one(guild_id) for every id. Returns a SyncReport whose
+        results map guild_id -> "ok" | "error: ...".
+        """
+        self._cond = asyncio.Condition()
+        _install_rate_limit_hook()
+        results: dict[int, str] = {}
+        timings: dict[int, GuildSyncTiming] = {}
+        started = self._clock()
+
+        async def worker(gid: int) -> None:
+            timing = timings[gid] = GuildSyncTiming(guild_id=gid)
+            t0 = self._clock()
+            outcome = await self._run_one(gid, sync_one, timing)
+            timing.seconds = self._clock() - t0
+            timing.outcome = outcome
+            results[gid] = outcome
+            if on_result is not None:
+                on_result(gid, outcome, timing)
+
+        await asyncio.gather(*(worker(gid) for gid in guild_ids))
+
+        return SyncReport(
+            results=results,
+            timings=timings,
+            elapsed=self._clock() - started,
+            peak_concurrency=self._peak,
+            final_concurrency=self.limit,
+            rate_limited=self._rate_limited,
+            retries=self._retries,
+        )
+
+    async def _run_one(
+        self,
+        gid: int,
+        sync_one: Callable[[int], Awaitable[Any]],
+        timing: GuildSyncTiming,
+    ) -> str:
+        while True:
+            await self._acquire()
+            timing.attempts += 1
+            seen = timing.rate_limited
+            token = _current_sync.set((self, timing))
+            try:
+                await sync_one(gid)
+            except Exception as e:
+                await self._release()
+                if timing.attempts > self.max_retries:
+                    return f"error: {type(e).__name__}: {e}"
+
+                if is_rate_limited(e):
+                    # py-cord logs (and the hook counts) a 429 before giving
+                    # up on it; only count ones it raised straight away
+                    if timing.rate_limited == seen:
+                        timing.rate_limited += 1
+                        self._on_rate_limited(retry_after_seconds(e))
+                        self._retries += 1
+                    continue
+
+                if is_transient(e):
+                    self._retries += 1
+                    await self._sleep(self._backoff(timing.attempts))
+                    continue
+
+                return f"error: {type(e).__name__}: {e}"
+            else:
+                await self._release(success=True)
+                return "ok"
+            finally:
+                _current_sync.reset(token)
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": uniform in [0, min(cap, base * 2^attempt)]
+        ceiling = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+        return ceiling * self._jitter()
+
+    async def _acquire(self) -> None:
+        assert self._cond is not None
+        while True:
+            wait = self._resume_at - self._clock()
+            if wait > 0:
+                await self._sleep(wait)
+                continue
+            async with self._cond:
+                if self._in_flight < int(self.limit):
+                    self._in_flight += 1
+                    self._peak = max(self._peak, self._in_flight)
+                    return
+                await self._cond.wait()
+
+    async def _release(self, *, success: bool = False) -> None:
+        assert self._cond is not None
+        async with self._cond:
+            self._in_flight -= 1
+            if success:
+                self.limit = min(
+                    float(self.max_concurrency),
+                    self.limit + self.increase / max(self.limit, 1.0),
+                )
+            self._cond.notify_all()
+
+    def _on_rate_limited(self, retry_after: float | None) -> None:
+        self._rate_limited += 1
+        self.limit = max(float(self.min_concurrency), self.limit * self.decrease)
+        pause = retry_after if retry_after is not None else self.base_backoff
+        # Small jitter so paused workers don't all retry in the same instant
+        pause += self.base_backoff * 0.25 * self._jitter()
+        self._resume_at = max(self._resume_at, self._clock() + pause)
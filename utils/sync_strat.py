@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
 from discord.ext import commands
-from modules.utils.guild_sync import sync_commands_to_guilds_from_file
+
+from utils.guild_sync import sync_commands_to_guilds_from_file
+
+logger = logging.getLogger("guildpilot.sync")
 
 
 async def sync_from_registry(
@@ -24,13 +28,15 @@ async def sync_from_registry(
     - Optionally also run a global sync for public after guild sync.
     """
     # 1) Fast path: guild sync to registry targets
-    results = await sync_commands_to_guilds_from_file(bot, guilds_json, concurrency=3)
+    results = await sync_commands_to_guilds_from_file(
+        bot, guilds_json, concurrency=3, compact=True
+    )
 
     ok = sum(1 for v in results.values() if isinstance(v, str) and v.startswith("ok"))
     total = len(results)
 
     # total includes "not_in_guild" + ok + errors
-    print(f"[SYNC:{flavor}] Registry guild sync: {ok}/{total} ok")
+    logger.info("registry guild sync: %d/%d ok", ok, total, extra={"flavor": flavor})
 
     # Determine if we actually had any guilds to sync to (present in bot.guilds)
     had_targets = any(v != "not_in_guild" for v in results.values())
@@ -39,11 +45,19 @@ async def sync_from_registry(
     if not had_targets and do_global_if_empty:
         synced = await bot.sync_commands()  # global
         count = len(synced) if synced is not None else "?"
-        print(f"[SYNC:{flavor}] No registry guild targets; global sync: {count} cmds")
+        logger.info(
+            "no registry guild targets; global sync: %s command(s)",
+            count,
+            extra={"flavor": flavor},
+        )
         return
 
     # 3) Optional: also global-sync public bot after guild sync
     if flavor == "public" and also_global_for_public:
         synced = await bot.sync_commands()
         count = len(synced) if synced is not None else "?"
-        print(f"[SYNC:{flavor}] Global sync after registry: {count} cmds")
+        logger.info(
+            "global sync after registry: %s command(s)",
+            count,
+            extra={"flavor": flavor},
+        )